@@ -0,0 +1,26 @@
+"""Case-insensitive employee name indexes.
+
+Revision ID: 0002_employee_name_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-16
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002_employee_name_indexes"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Functional indexes back lower(first_name) / lower(last_name) equality in employee_names.
+    op.create_index("ix_employees_lower_first_name", "employees", [sa.text("lower(first_name)")])
+    op.create_index("ix_employees_lower_last_name", "employees", [sa.text("lower(last_name)")])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_employees_lower_last_name", table_name="employees")
+    op.drop_index("ix_employees_lower_first_name", table_name="employees")
@@ -0,0 +1,55 @@
+"""Per-employee workload counters.
+
+Revision ID: 0003_employee_workload
+Revises: 0002_employee_name_indexes
+Create Date: 2026-10-16
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0003_employee_workload"
+down_revision = "0002_employee_name_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    workload_period = postgresql.ENUM("week", "month", name="workload_period", create_type=False)
+    workload_period.create(op.get_bind(), checkfirst=True)
+    op.create_table(
+        "employee_workload",
+        sa.Column(
+            "employee_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("employees.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("period", workload_period, primary_key=True, nullable=False),
+        sa.Column("period_start", sa.Date(), primary_key=True, nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("morning", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("night", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Backfill from existing assignments; services/workload.py keeps it current from here on.
+    for period in ("week", "month"):
+        op.execute(
+            f"""
+            INSERT INTO employee_workload (employee_id, period, period_start, total, morning, night)
+            SELECT assigned_employee_id, '{period}', date_trunc('{period}', date)::date,
+                   count(*),
+                   count(*) FILTER (WHERE type = 'morning'),
+                   count(*) FILTER (WHERE type = 'night')
+            FROM shifts
+            WHERE assigned_employee_id IS NOT NULL
+            GROUP BY assigned_employee_id, date_trunc('{period}', date)::date
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("employee_workload")
+    postgresql.ENUM(name="workload_period").drop(op.get_bind(), checkfirst=True)
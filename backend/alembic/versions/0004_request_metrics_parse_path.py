@@ -0,0 +1,23 @@
+"""Record which parse path served each request.
+
+Revision ID: 0004_request_metrics_parse_path
+Revises: 0003_employee_workload
+Create Date: 2026-10-16
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004_request_metrics_parse_path"
+down_revision = "0003_employee_workload"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("request_metrics", sa.Column("parse_path", sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("request_metrics", "parse_path")
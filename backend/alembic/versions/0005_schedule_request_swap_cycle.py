@@ -0,0 +1,26 @@
+"""Link the members of a proposed multi-way swap rotation.
+
+Revision ID: 0005_schedule_request_swap_cycle
+Revises: 0004_request_metrics_parse_path
+Create Date: 2026-10-16
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0005_schedule_request_swap_cycle"
+down_revision = "0004_request_metrics_parse_path"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("schedule_requests", sa.Column("swap_cycle_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_index("ix_schedule_requests_swap_cycle_id", "schedule_requests", ["swap_cycle_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_schedule_requests_swap_cycle_id", table_name="schedule_requests")
+    op.drop_column("schedule_requests", "swap_cycle_id")
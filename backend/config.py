@@ -31,11 +31,52 @@ class Settings(BaseSettings):
     anthropic_version: str = Field(default="2023-06-01", alias="ANTHROPIC_VERSION")
 
     ollama_model: str = Field(default="llama3:8b", alias="OLLAMA_MODEL")
+    ollama_keep_alive: str = Field(default="30m", alias="OLLAMA_KEEP_ALIVE")
+    ollama_structured_output: bool = Field(default=True, alias="OLLAMA_STRUCTURED_OUTPUT")
+    ollama_num_predict: int = Field(default=256, alias="OLLAMA_NUM_PREDICT")
     llm_parse_timeout_seconds: float = Field(default=60.0, alias="LLM_PARSE_TIMEOUT_SECONDS")
     llm_hosted_timeout_seconds: float = Field(default=10.0, alias="LLM_HOSTED_TIMEOUT_SECONDS")
     llm_max_retries: int = Field(default=2, alias="LLM_MAX_RETRIES")
+    llm_repair_reask: bool = Field(default=True, alias="LLM_REPAIR_REASK")
+    llm_backoff_base_seconds: float = Field(default=0.25, alias="LLM_BACKOFF_BASE_SECONDS")
+    llm_backoff_cap_seconds: float = Field(default=4.0, alias="LLM_BACKOFF_CAP_SECONDS")
+    request_deadline_seconds: float = Field(default=90.0, alias="REQUEST_DEADLINE_SECONDS")
+    llm_http_max_connections: int = Field(default=20, alias="LLM_HTTP_MAX_CONNECTIONS")
+    llm_http_max_keepalive_connections: int = Field(default=10, alias="LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    llm_http_keepalive_expiry_seconds: float = Field(default=60.0, alias="LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS")
+    llm_http2: bool = Field(default=True, alias="LLM_HTTP2")
+    llm_batch_max_items: int = Field(default=20, alias="LLM_BATCH_MAX_ITEMS")
+    llm_batch_context_tokens: int = Field(default=8192, alias="LLM_BATCH_CONTEXT_TOKENS")
+    llm_batch_max_output_tokens: int = Field(default=4096, alias="LLM_BATCH_MAX_OUTPUT_TOKENS")
+    llm_failover_chain: str = Field(default="", alias="LLM_FAILOVER_CHAIN")
+    llm_breaker_window: int = Field(default=20, alias="LLM_BREAKER_WINDOW")
+    llm_breaker_min_calls: int = Field(default=5, alias="LLM_BREAKER_MIN_CALLS")
+    llm_breaker_error_rate: float = Field(default=0.5, alias="LLM_BREAKER_ERROR_RATE")
+    llm_breaker_slow_call_seconds: float = Field(default=20.0, alias="LLM_BREAKER_SLOW_CALL_SECONDS")
+    llm_breaker_open_seconds: float = Field(default=30.0, alias="LLM_BREAKER_OPEN_SECONDS")
+    llm_hedge_enabled: bool = Field(default=True, alias="LLM_HEDGE_ENABLED")
+    llm_hedge_min_delay_seconds: float = Field(default=0.5, alias="LLM_HEDGE_MIN_DELAY_SECONDS")
+    llm_admission_local_limit: int = Field(default=4, alias="LLM_ADMISSION_LOCAL_LIMIT")
+    llm_admission_cluster_limit: int = Field(default=8, alias="LLM_ADMISSION_CLUSTER_LIMIT")
+    llm_admission_max_queue: int = Field(default=32, alias="LLM_ADMISSION_MAX_QUEUE")
+    llm_admission_max_wait_seconds: float = Field(default=15.0, alias="LLM_ADMISSION_MAX_WAIT_SECONDS")
+    llm_admission_priority_reserve: int = Field(default=1, alias="LLM_ADMISSION_PRIORITY_RESERVE")
     dev_mode: bool = Field(default=True, alias="DEV_MODE")
     org_timezone: str = Field(default="America/Toronto", alias="ORG_TIMEZONE")
+    suggestion_top_k: int = Field(default=3, alias="SUGGESTION_TOP_K")
+    swap_cycle_max_length: int = Field(default=4, alias="SWAP_CYCLE_MAX_LENGTH")
+    roster_max_shifts_per_week: int = Field(default=5, alias="ROSTER_MAX_SHIFTS_PER_WEEK")
+    roster_optimizer_time_budget_seconds: float = Field(default=5.0, alias="ROSTER_OPTIMIZER_TIME_BUDGET_SECONDS")
+    extraction_cache_ttl_seconds: int = Field(default=86400, alias="EXTRACTION_CACHE_TTL_SECONDS")
+    extraction_cache_max_entries: int = Field(default=10000, alias="EXTRACTION_CACHE_MAX_ENTRIES")
+    fast_path_parser_enabled: bool = Field(default=True, alias="FAST_PATH_PARSER_ENABLED")
+    job_worker_concurrency: int = Field(default=2, alias="JOB_WORKER_CONCURRENCY")
+    job_claim_idle_seconds: int = Field(default=300, alias="JOB_CLAIM_IDLE_SECONDS")
+    job_max_attempts: int = Field(default=3, alias="JOB_MAX_ATTEMPTS")
+    job_result_ttl_seconds: int = Field(default=86400, alias="JOB_RESULT_TTL_SECONDS")
+    single_flight_wait_seconds: float = Field(default=200.0, alias="SINGLE_FLIGHT_WAIT_SECONDS")
+    near_duplicate_threshold: float = Field(default=0.8, alias="NEAR_DUPLICATE_THRESHOLD")
+    near_duplicate_max_entries: int = Field(default=5000, alias="NEAR_DUPLICATE_MAX_ENTRIES")
 
 
 @lru_cache
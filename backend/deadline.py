@@ -0,0 +1,75 @@
+"""
+End-to-end request deadline, carried in a ContextVar from the HTTP layer (or a job worker) down to
+provider calls, plus the jittered backoff providers sleep between attempts.
+
+Tasks copy the context they are created in, so hedged, coalesced and streaming calls share the
+deadline of the request that started them.
+"""
+import asyncio
+import random
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from backend.config import get_settings
+from backend.errors import AppError
+from backend.schemas import ErrorCode
+
+# An attempt is not started with less time than this left; it could not finish.
+MIN_ATTEMPT_SECONDS = 0.5
+
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[None]:
+    """Bound everything inside to `seconds` from now (never extends an enclosing deadline)."""
+    new = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(new if current is None else min(current, new))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the deadline, or None when no deadline is set."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def deadline_exceeded(developer_message: str) -> AppError:
+    return AppError(
+        ErrorCode.llm_timeout,
+        "The request took too long to process. Please retry.",
+        developer_message,
+        504,
+    )
+
+
+def attempt_timeout(default: float) -> float:
+    """The per-attempt timeout: the provider's own timeout, shortened to what is left of the deadline."""
+    left = remaining()
+    if left is None:
+        return default
+    if left < MIN_ATTEMPT_SECONDS:
+        raise deadline_exceeded(f"Request deadline reached ({left:.2f}s left) before a provider attempt.")
+    return min(default, left)
+
+
+async def backoff(previous: float) -> float:
+    """
+    Sleep a decorrelated-jitter delay, min(cap, uniform(base, previous * 3)), before a retry and
+    return it for the next call (start from LLM_BACKOFF_BASE_SECONDS). Raises instead of sleeping
+    when the delay would leave no time for the attempt it precedes.
+    """
+    settings = get_settings()
+    base = settings.llm_backoff_base_seconds
+    delay = min(settings.llm_backoff_cap_seconds, random.uniform(base, max(base, previous * 3)))
+    left = remaining()
+    if left is not None and left - delay < MIN_ATTEMPT_SECONDS:
+        raise deadline_exceeded(f"Request deadline reached ({left:.2f}s left) before a provider retry.")
+    await asyncio.sleep(delay)
+    return delay
@@ -8,10 +8,12 @@ class AppError(Exception):
         user_message: str,
         developer_message: str,
         status_code: int = 400,
+        headers: dict[str, str] | None = None,
     ) -> None:
         super().__init__(developer_message)
         self.error_code = error_code
         self.user_message = user_message
         self.developer_message = developer_message
         self.status_code = status_code
+        self.headers = headers
 
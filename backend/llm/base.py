@@ -1,13 +1,138 @@
+import importlib.util
+import json
+import logging
 from abc import ABC, abstractmethod
+from collections import Counter
 from datetime import date
+from typing import Any
 
-from backend.schemas import HealthStatus, ParsedExtraction
+import httpx
+
+from backend.config import get_settings
+from backend.errors import AppError
+from backend.llm.batching import (
+    OUTPUT_TOKENS_PER_ITEM,
+    build_batch_prompt,
+    plan_batches,
+    split_batch_response,
+)
+from backend.llm.streaming import FieldsCallback
+from backend.schemas import ErrorCode, HealthStatus, ParsedExtraction
+
+logger = logging.getLogger("shift-scheduler")
 
 
 class LLMProvider(ABC):
     provider_name: str
     model_name: str
     extraction_version: str
+    timeout: float
+    # Hosted vendors multiplex concurrent parses over one HTTP/2 connection when h2 is installed.
+    use_http2: bool = False
+    _client: httpx.AsyncClient | None = None
+    _requests_sent = 0
+    _usage: Counter | None = None
+
+    @property
+    def is_hosted(self) -> bool:
+        """True when request text leaves the organisation, so prompts carry as little identity as possible."""
+        return self.provider_name == "hosted"
+
+    def warm(self) -> None:
+        """Open the pooled client ahead of the first parse (called from the app lifespan)."""
+        self.http_client()
+
+    def http_client(self) -> httpx.AsyncClient:
+        """
+        The provider's long-lived pooled client, created on first use. Keep-alive connections are
+        reused across parses and health checks; limits come from LLM_HTTP_* settings.
+        """
+        if self._client is None or self._client.is_closed:
+            settings = get_settings()
+            http2 = self.use_http2 and settings.llm_http2 and importlib.util.find_spec("h2") is not None
+            if self.use_http2 and settings.llm_http2 and not http2:
+                logger.warning("h2 is not installed; %s provider falls back to HTTP/1.1", self.provider_name)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=settings.llm_http_max_connections,
+                    max_keepalive_connections=settings.llm_http_max_keepalive_connections,
+                    keepalive_expiry=settings.llm_http_keepalive_expiry_seconds,
+                ),
+                event_hooks={"request": [self._count_request]},
+            )
+        return self._client
+
+    def record_usage(
+        self,
+        prompt_tokens: int | None,
+        cached_prompt_tokens: int | None,
+        output_tokens: int | None,
+        ttft_seconds: float | None,
+    ) -> None:
+        """
+        Account one completed call: prompt tokens the model processed, how many of those were
+        served from its prompt cache, tokens generated, and time to first token when observable.
+        Each call is also logged as `llm_call` so savings can be checked per request mix.
+        """
+        if self._usage is None:
+            self._usage = Counter()
+        self._usage.update(
+            calls=1,
+            prompt_tokens=prompt_tokens or 0,
+            cached_prompt_tokens=cached_prompt_tokens or 0,
+            output_tokens=output_tokens or 0,
+        )
+        if ttft_seconds is not None:
+            self._usage.update(ttft_calls=1, ttft_seconds=ttft_seconds)
+        logger.info(
+            "llm_call",
+            extra={
+                "provider": self.provider_name,
+                "model": self.model_name,
+                "prompt_tokens": prompt_tokens,
+                "cached_prompt_tokens": cached_prompt_tokens,
+                "output_tokens": output_tokens,
+                "ttft_ms": round(ttft_seconds * 1000, 1) if ttft_seconds is not None else None,
+            },
+        )
+
+    def usage_stats(self) -> dict[str, Any]:
+        usage = self._usage or Counter()
+        calls = usage["calls"]
+        return {
+            "calls": calls,
+            "prompt_tokens_avg": round(usage["prompt_tokens"] / calls, 1) if calls else 0.0,
+            "cached_prompt_tokens_avg": round(usage["cached_prompt_tokens"] / calls, 1) if calls else 0.0,
+            "output_tokens_avg": round(usage["output_tokens"] / calls, 1) if calls else 0.0,
+            "ttft_ms_avg": round(usage["ttft_seconds"] * 1000 / usage["ttft_calls"], 1) if usage["ttft_calls"] else None,
+        }
+
+    async def _count_request(self, _: httpx.Request) -> None:
+        self._requests_sent += 1
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Connection pool snapshot. Connection counts read httpcore's pool and are omitted if it changes shape."""
+        settings = get_settings()
+        stats: dict[str, Any] = {
+            "open": self._client is not None and not self._client.is_closed,
+            "requests_sent": self._requests_sent,
+            "max_connections": settings.llm_http_max_connections,
+            "max_keepalive_connections": settings.llm_http_max_keepalive_connections,
+        }
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            stats["connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+            stats["http2_connections"] = sum(1 for c in connections if "HTTP/2" in c.info())
+        return stats
 
     @abstractmethod
     async def parse(
@@ -18,6 +143,78 @@ class LLMProvider(ABC):
     ) -> ParsedExtraction:
         raise NotImplementedError
 
+    async def parse_streaming(
+        self,
+        text: str,
+        requester_context: str | None = None,
+        reference_date: date | None = None,
+        on_fields: FieldsCallback | None = None,
+    ) -> ParsedExtraction:
+        """Parse while reporting fields as they are generated; providers without streaming just parse."""
+        return await self.parse(text, requester_context=requester_context, reference_date=reference_date)
+
+    async def _complete_batch(self, prompt: str, max_tokens: int) -> str:
+        """One non-streaming completion of a batch prompt. Providers that cannot batch leave this unimplemented."""
+        raise NotImplementedError
+
+    async def parse_many(
+        self,
+        texts: list[str],
+        requester_context: str | None = None,
+        reference_date: date | None = None,
+    ) -> list[ParsedExtraction | AppError]:
+        """
+        Parse several texts in as few provider calls as the model's limits allow.
+
+        Texts are packed into JSON-array prompts sized by llm/batching.plan_batches. Elements that
+        come back missing or invalid are retried sequentially with parse, so one bad item never
+        costs the whole batch and the retries stay within the caller's one admission slot. Each result is that text's extraction or the AppError it failed with.
+        """
+        settings = get_settings()
+        results: list[ParsedExtraction | AppError | None] = [None] * len(texts)
+        retry: list[int] = []
+        can_batch = type(self)._complete_batch is not LLMProvider._complete_batch
+        batches = (
+            plan_batches(
+                texts,
+                settings.llm_batch_context_tokens,
+                settings.llm_batch_max_output_tokens,
+                settings.llm_batch_max_items,
+            )
+            if can_batch
+            else [[i] for i in range(len(texts))]
+        )
+        for batch in batches:
+            if len(batch) == 1:
+                retry.extend(batch)
+                continue
+            prompt = build_batch_prompt([texts[i] for i in batch], requester_context, reference_date)
+            try:
+                content = await self._complete_batch(prompt, len(batch) * OUTPUT_TOKENS_PER_ITEM + 256)
+                parsed = split_batch_response(content, len(batch))
+            except json.JSONDecodeError:
+                parsed = [None] * len(batch)
+            except AppError as exc:
+                if exc.error_code != ErrorCode.extraction_invalid_schema:
+                    # Timeouts and provider failures would only repeat per item.
+                    for i in batch:
+                        results[i] = exc
+                    continue
+                parsed = [None] * len(batch)
+            for i, item in zip(batch, parsed):
+                if item is None:
+                    retry.append(i)
+                else:
+                    results[i] = item
+
+        # One at a time: callers hold a single admission slot for the whole parse_many.
+        for i in retry:
+            try:
+                results[i] = await self.parse(texts[i], requester_context=requester_context, reference_date=reference_date)
+            except AppError as exc:
+                results[i] = exc
+        return results
+
     @abstractmethod
     async def health_check(self) -> HealthStatus:
         raise NotImplementedError
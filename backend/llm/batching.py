@@ -0,0 +1,98 @@
+import json
+from datetime import date
+from typing import Any
+
+from pydantic import ValidationError
+
+from backend.schemas import ParsedExtraction
+
+BATCH_PROMPT_TEMPLATE = """Extract schedule request fields from each numbered request below and return ONLY a JSON array, nothing else.
+The array has exactly one object per request, in the same order, each with an "index" matching the request number and this schema (use null when unknown):
+{{"index":0,"employee_first_name":"string","employee_last_name":"string or null","current_shift_date":"YYYY-MM-DD or null","current_shift_type":"morning or night or null","target_date":"YYYY-MM-DD or null","target_shift_type":"morning or night or null","requested_action":"swap or move or cover or null","reason":"string or null","partner_employee_first_name":"string or null","partner_employee_last_name":"string or null","partner_shift_date":"YYYY-MM-DD or null","partner_shift_type":"morning or night or null"}}
+For swap requests: set employee_* to the requester, partner_* to the swap partner, current_shift_* to requester's shift, target_* and partner_shift_* to partner's shift.
+For cover requests: current_shift_date is the date of the shift to be covered (the requester's shift). If the user says "tomorrow" or "my shift tomorrow", set both current_shift_date and target_date to tomorrow (today + 1 day).
+Requests are independent: never carry names or dates from one request into another.
+{date_context}{context_line}
+Requests:
+{requests}
+
+JSON array:"""
+
+# Rough sizing: ~4 characters per token, and one filled-in extraction object is ~150 tokens.
+CHARS_PER_TOKEN = 4
+OUTPUT_TOKENS_PER_ITEM = 150
+PROMPT_OVERHEAD_TOKENS = len(BATCH_PROMPT_TEMPLATE) // CHARS_PER_TOKEN + 100
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def plan_batches(texts: list[str], context_tokens: int, max_output_tokens: int, max_items: int) -> list[list[int]]:
+    """
+    Greedily group text indices into batches that fit the model's limits: prompt plus expected
+    output within context_tokens, expected output within max_output_tokens, at most max_items.
+    A text too long to share a batch gets one of its own.
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    used = PROMPT_OVERHEAD_TOKENS
+    for index, text in enumerate(texts):
+        cost = estimate_tokens(text) + OUTPUT_TOKENS_PER_ITEM
+        fits = (
+            len(current) < max_items
+            and used + cost <= context_tokens
+            and (len(current) + 1) * OUTPUT_TOKENS_PER_ITEM <= max_output_tokens
+        )
+        if current and not fits:
+            batches.append(current)
+            current, used = [], PROMPT_OVERHEAD_TOKENS
+        current.append(index)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(texts: list[str], requester_context: str | None, reference_date: date | None) -> str:
+    date_context = ""
+    if reference_date is not None:
+        date_context = (
+            f"Today's date is {reference_date.isoformat()}. "
+            "Valid scheduling window is today through 30 days from today. "
+            "For relative dates like 'tomorrow' use today + 1 day. Prefer null if uncertain."
+        )
+    context_line = f"\nRequester context: {requester_context}" if requester_context else ""
+    requests = "\n".join(f"[{i}] {' '.join(text.split())}" for i, text in enumerate(texts))
+    return BATCH_PROMPT_TEMPLATE.format(date_context=date_context, context_line=context_line, requests=requests)
+
+
+def split_batch_response(content: str, count: int) -> list[ParsedExtraction | None]:
+    """
+    Map the model's JSON array back onto the batch, by each object's "index" when present and by
+    position otherwise. Missing or invalid elements come back as None for a retry; a repeated index
+    keeps its first element.
+    Raises json.JSONDecodeError when there is no array at all.
+    """
+    start = content.find("[")
+    end = content.rfind("]")
+    if start == -1 or end < start:
+        raise json.JSONDecodeError("No JSON array in batch response", content, 0)
+    elements = json.loads(content[start : end + 1])
+    if not isinstance(elements, list):
+        raise json.JSONDecodeError("Batch response is not a JSON array", content, start)
+
+    results: list[ParsedExtraction | None] = [None] * count
+    claimed: set[int] = set()
+    for position, element in enumerate(elements):
+        if not isinstance(element, dict):
+            continue
+        index: Any = element.get("index", position)
+        if not isinstance(index, int) or not 0 <= index < count or index in claimed:
+            continue
+        claimed.add(index)
+        try:
+            results[index] = ParsedExtraction.model_validate(element)
+        except ValidationError:
+            continue
+    return results
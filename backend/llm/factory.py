@@ -1,12 +1,45 @@
+from functools import lru_cache
+
 from backend.config import get_settings
+from backend.errors import AppError
 from backend.llm.base import LLMProvider
+from backend.llm.failover import FailoverProvider
 from backend.llm.hosted_provider import HostedProvider
 from backend.llm.ollama_provider import OllamaProvider
+from backend.schemas import ErrorCode
+
+
+def _build(name: str, setting: str) -> LLMProvider:
+    """Construct one provider; setting names the variable name came from, for the error message."""
+    if name == "hosted":
+        return HostedProvider()
+    if name == "local":
+        return OllamaProvider()
+    raise AppError(
+        ErrorCode.llm_provider_error,
+        "LLM provider is not configured correctly.",
+        f"Unknown provider '{name}' in {setting} (expected local or hosted).",
+        500,
+    )
 
 
+@lru_cache
 def get_llm_provider() -> LLMProvider:
+    """
+    The process-wide provider; its pooled HTTP client is closed by close_llm_provider on shutdown.
+    LLM_FAILOVER_CHAIN, when set, overrides LLM_PROVIDER: two or more entries ("local,hosted") are
+    wrapped in a FailoverProvider, a single entry is used on its own.
+    """
     settings = get_settings()
-    if settings.llm_provider == "hosted":
-        return HostedProvider()
-    return OllamaProvider()
+    chain = [name.strip() for name in settings.llm_failover_chain.split(",") if name.strip()]
+    if len(chain) > 1:
+        return FailoverProvider([_build(name, "LLM_FAILOVER_CHAIN") for name in chain])
+    if chain:
+        return _build(chain[0], "LLM_FAILOVER_CHAIN")
+    return _build(settings.llm_provider, "LLM_PROVIDER")
+
 
+async def close_llm_provider() -> None:
+    if get_llm_provider.cache_info().currsize:
+        await get_llm_provider().aclose()
+        get_llm_provider.cache_clear()
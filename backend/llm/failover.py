@@ -0,0 +1,287 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from datetime import date
+from enum import Enum
+from typing import Any
+
+from backend.config import get_settings
+from backend.errors import AppError
+from backend.llm.base import LLMProvider
+from backend.llm.streaming import FieldsCallback
+from backend.schemas import ErrorCode, HealthStatus, ParsedExtraction
+
+logger = logging.getLogger("shift-scheduler")
+
+# Errors that say the member is unavailable; anything else (e.g. an unparseable answer) means it responded.
+AVAILABILITY_ERRORS = frozenset({ErrorCode.llm_timeout, ErrorCode.llm_provider_error, ErrorCode.llm_overloaded})
+
+
+class BreakerState(str, Enum):
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Rolling-window breaker for one provider. The last LLM_BREAKER_WINDOW calls are kept; a call
+    fails if it raised an availability error or took longer than LLM_BREAKER_SLOW_CALL_SECONDS.
+    Once LLM_BREAKER_MIN_CALLS are recorded and the failure rate reaches LLM_BREAKER_ERROR_RATE
+    the breaker opens for LLM_BREAKER_OPEN_SECONDS, then lets one trial call through (half open).
+    """
+
+    def __init__(self) -> None:
+        settings = get_settings()
+        self.window = settings.llm_breaker_window
+        self.min_calls = settings.llm_breaker_min_calls
+        self.error_rate_threshold = settings.llm_breaker_error_rate
+        self.slow_call_seconds = settings.llm_breaker_slow_call_seconds
+        self.open_seconds = settings.llm_breaker_open_seconds
+        self.outcomes: deque[bool] = deque(maxlen=self.window)
+        self.latencies: deque[float] = deque(maxlen=self.window)
+        self.state = BreakerState.closed
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state is BreakerState.open and time.monotonic() - self.opened_at >= self.open_seconds:
+            self.state = BreakerState.half_open
+            self._trial_in_flight = False
+        if self.state is BreakerState.half_open:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+        return self.state is BreakerState.closed
+
+    def record(self, ok: bool, latency: float) -> None:
+        failed = not ok or latency > self.slow_call_seconds
+        if ok:
+            self.latencies.append(latency)
+        if self.state is BreakerState.half_open:
+            self._trial_in_flight = False
+            if failed:
+                self._open()
+            else:
+                self.state = BreakerState.closed
+                self.outcomes.clear()
+            return
+        self.outcomes.append(not failed)
+        if len(self.outcomes) >= self.min_calls and self.error_rate >= self.error_rate_threshold:
+            self._open()
+
+    def release_trial(self) -> None:
+        """A half-open trial was cancelled (lost a hedge race) without an outcome."""
+        self._trial_in_flight = False
+
+    def _open(self) -> None:
+        self.state = BreakerState.open
+        self.opened_at = time.monotonic()
+        self.outcomes.clear()
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def p95(self) -> float | None:
+        if len(self.latencies) < self.min_calls:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+class FailoverProvider(LLMProvider):
+    """
+    An ordered chain of providers (LLM_FAILOVER_CHAIN, e.g. "local,hosted").
+
+    Each call goes to the first member whose breaker allows it. If that member has not answered
+    after its p95 latency (LLM_HEDGE_MIN_DELAY_SECONDS floor; a quarter of its timeout until
+    enough calls are seen), the next allowed member is started as a hedge and the first valid
+    ParsedExtraction wins; the loser is cancelled. A member that fails hands over to the next.
+    Streaming progress comes from the primary only.
+    """
+
+    def __init__(self, members: list[LLMProvider]) -> None:
+        settings = get_settings()
+        self.members = members
+        self.breakers = [CircuitBreaker() for _ in members]
+        self.hedge_enabled = settings.llm_hedge_enabled
+        self.hedge_min_delay = settings.llm_hedge_min_delay_seconds
+        self.provider_name = "+".join(m.provider_name for m in members)
+        self.model_name = "+".join(m.model_name for m in members)
+        self.extraction_version = "+".join(m.extraction_version for m in members)
+        self.timeout = max(m.timeout for m in members)
+        self.wins = [0] * len(members)
+        self.hedges_fired = 0
+        self.hedge_wins = 0
+
+    @property
+    def is_hosted(self) -> bool:
+        return any(m.is_hosted for m in self.members)
+
+    def warm(self) -> None:
+        for member in self.members:
+            member.warm()
+
+    async def aclose(self) -> None:
+        for member in self.members:
+            await member.aclose()
+
+    def pool_stats(self) -> dict[str, Any]:
+        return {member.provider_name: member.pool_stats() for member in self.members}
+
+    def usage_stats(self) -> dict[str, Any]:
+        return {member.provider_name: member.usage_stats() for member in self.members}
+
+    def _hedge_delay(self, index: int) -> float:
+        p95 = self.breakers[index].p95()
+        if p95 is None:
+            p95 = self.members[index].timeout / 4
+        return max(self.hedge_min_delay, p95)
+
+    async def _call(self, index: int, coro) -> ParsedExtraction:
+        started = time.monotonic()
+        try:
+            result = await coro
+        except AppError as exc:
+            self.breakers[index].record(exc.error_code not in AVAILABILITY_ERRORS, time.monotonic() - started)
+            raise
+        except asyncio.CancelledError:
+            self.breakers[index].release_trial()
+            raise
+        except Exception:
+            self.breakers[index].record(False, time.monotonic() - started)
+            raise
+        self.breakers[index].record(True, time.monotonic() - started)
+        return result
+
+    async def parse(
+        self,
+        text: str,
+        requester_context: str | None = None,
+        reference_date: date | None = None,
+    ) -> ParsedExtraction:
+        return await self.parse_streaming(text, requester_context=requester_context, reference_date=reference_date)
+
+    async def parse_streaming(
+        self,
+        text: str,
+        requester_context: str | None = None,
+        reference_date: date | None = None,
+        on_fields: FieldsCallback | None = None,
+    ) -> ParsedExtraction:
+        remaining = list(range(len(self.members)))
+        running: dict[asyncio.Task, int] = {}
+        last_error: AppError | None = None
+
+        def start_next(streaming: bool) -> bool:
+            while remaining:
+                index = remaining.pop(0)
+                if not self.breakers[index].allow():
+                    continue
+                member = self.members[index]
+                if streaming and on_fields is not None:
+                    coro = member.parse_streaming(text, requester_context, reference_date, on_fields=on_fields)
+                else:
+                    coro = member.parse(text, requester_context=requester_context, reference_date=reference_date)
+                running[asyncio.create_task(self._call(index, coro))] = index
+                return True
+            return False
+
+        if not start_next(streaming=True):
+            raise AppError(
+                ErrorCode.llm_provider_error,
+                "The language model is temporarily unavailable. Please retry.",
+                f"All providers in the failover chain have open circuits: {self.provider_name}.",
+                503,
+            )
+        primary = next(iter(running.values()))
+        try:
+            while running:
+                timeout = None
+                if self.hedge_enabled and len(running) == 1 and remaining:
+                    timeout = self._hedge_delay(next(iter(running.values())))
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if start_next(streaming=False):
+                        self.hedges_fired += 1
+                    continue
+                for task in done:
+                    index = running.pop(task)
+                    try:
+                        result = task.result()
+                    except AppError as exc:
+                        last_error = exc
+                        logger.warning("LLM provider %s failed: %s", self.members[index].provider_name, exc.developer_message)
+                        continue
+                    except Exception as exc:  # noqa: BLE001
+                        last_error = AppError(
+                            ErrorCode.llm_provider_error, "Provider request failed.", f"{type(exc).__name__}: {exc}", 502
+                        )
+                        continue
+                    self.wins[index] += 1
+                    if index != primary:
+                        self.hedge_wins += 1
+                    return result
+                if not running:
+                    # Everything in flight failed: fail over to the next allowed member.
+                    start_next(streaming=False)
+        finally:
+            for task in running:
+                task.cancel()
+        raise last_error or AppError(
+            ErrorCode.llm_provider_error, "Provider request failed.", "Failover chain exhausted.", 502
+        )
+
+    async def _complete_batch(self, prompt: str, max_tokens: int) -> str:
+        """Batches are not hedged: the first allowed member that completes one serves it."""
+        last_error: AppError | None = None
+        for index, member in enumerate(self.members):
+            if type(member)._complete_batch is LLMProvider._complete_batch or not self.breakers[index].allow():
+                continue
+            started = time.monotonic()
+            try:
+                content = await member._complete_batch(prompt, max_tokens)
+            except AppError as exc:
+                self.breakers[index].record(exc.error_code not in AVAILABILITY_ERRORS, time.monotonic() - started)
+                last_error = exc
+                continue
+            self.breakers[index].record(True, time.monotonic() - started)
+            return content
+        raise last_error or AppError(
+            ErrorCode.llm_provider_error,
+            "The language model is temporarily unavailable. Please retry.",
+            "No provider in the failover chain accepted the batch.",
+            503,
+        )
+
+    async def health_check(self) -> HealthStatus:
+        """Healthy while any member is; failing members are listed in last_error."""
+        statuses = await asyncio.gather(*(m.health_check() for m in self.members))
+        errors = [f"{m.provider_name}: {s.last_error}" for m, s in zip(self.members, statuses) if s.status != "ok"]
+        status = "ok" if len(errors) < len(self.members) else "fail"
+        return HealthStatus(status=status, last_error="; ".join(errors) or None)
+
+    def chain_stats(self) -> dict[str, Any]:
+        members = []
+        for member, breaker, wins in zip(self.members, self.breakers, self.wins):
+            p95 = breaker.p95()
+            members.append(
+                {
+                    "provider": member.provider_name,
+                    "model": member.model_name,
+                    "breaker_state": breaker.state.value,
+                    "error_rate": round(breaker.error_rate, 4),
+                    "p95_seconds": round(p95, 3) if p95 is not None else None,
+                    "wins": wins,
+                }
+            )
+        return {
+            "members": members,
+            "hedges_fired": self.hedges_fired,
+            "hedge_wins": self.hedge_wins,
+            "hedge_win_rate": round(self.hedge_wins / self.hedges_fired, 4) if self.hedges_fired else 0.0,
+        }
@@ -1,4 +1,6 @@
+import asyncio
 import json
+import time
 from datetime import date
 from typing import Any
 
@@ -6,13 +8,19 @@ import httpx
 from pydantic import ValidationError
 
 from backend.config import get_settings
+from backend.deadline import attempt_timeout, backoff
 from backend.errors import AppError
 from backend.llm.base import LLMProvider
+from backend.llm.repair import repair_extraction
+from backend.llm.streaming import FieldsCallback, PartialFieldTracker
 from backend.schemas import ErrorCode, HealthStatus, ParsedExtraction
 
-PROMPT_TEMPLATE = """Extract schedule request fields and return ONLY valid JSON.
+# The static instructions are sent as the system prompt, identical on every call, so vendors can
+# serve them from their prompt cache: Anthropic via cache_control on the block, OpenAI automatically
+# for repeated prefixes. Only the user message below varies.
+SYSTEM_PROMPT = """Extract schedule request fields and return ONLY valid JSON.
 Schema:
-{{
+{
   "employee_first_name": "string",
   "employee_last_name": "string or null",
   "current_shift_date": "YYYY-MM-DD or null",
@@ -25,20 +33,28 @@ Schema:
   "partner_employee_last_name": "string or null",
   "partner_shift_date": "YYYY-MM-DD or null",
   "partner_shift_type": "morning|night|null"
-}}
+}
 For swap: employee_*=requester, partner_*=swap partner, current_shift_*=requester shift, target_* and partner_shift_*=partner shift.
 For cover: current_shift_date is the date of the shift to be covered. If the user says "tomorrow" or "my shift tomorrow", set both current_shift_date and target_date to tomorrow (today + 1 day).
-{date_context}
+"""
+
+PROMPT_TEMPLATE = """{date_context}
 User text: {text}
 """
 
+# Part of extraction_version, which keys the extraction cache: bump it whenever SYSTEM_PROMPT,
+# PROMPT_TEMPLATE or the message layout change, so older parses stop being served.
+PROMPT_VERSION = 2
+
 
 class HostedProvider(LLMProvider):
     def __init__(self) -> None:
         settings = get_settings()
         self.timeout = settings.llm_hosted_timeout_seconds
         self.max_retries = settings.llm_max_retries
+        self.reask_on_invalid = settings.llm_repair_reask
         self.provider_name = "hosted"
+        self.use_http2 = True
         self.vendor = settings.hosted_llm_vendor
 
         if self.vendor == "anthropic":
@@ -53,7 +69,7 @@ class HostedProvider(LLMProvider):
                     "ANTHROPIC_API_KEY missing for hosted provider (vendor=anthropic).",
                     500,
                 )
-            self.extraction_version = f"anthropic-{self.model_name}-v1"
+            self.extraction_version = f"anthropic-{self.model_name}-v{PROMPT_VERSION}"
         else:
             self.base_url = settings.openai_base_url.rstrip("/")
             self.api_key = settings.openai_api_key
@@ -65,7 +81,7 @@ class HostedProvider(LLMProvider):
                     "OPENAI_API_KEY missing for hosted provider (vendor=openai).",
                     500,
                 )
-            self.extraction_version = f"openai-{self.model_name}-v1"
+            self.extraction_version = f"openai-{self.model_name}-v{PROMPT_VERSION}"
 
     async def parse(
         self,
@@ -73,6 +89,16 @@ class HostedProvider(LLMProvider):
         requester_context: str | None = None,
         reference_date: date | None = None,
     ) -> ParsedExtraction:
+        return await self.parse_streaming(text, requester_context=requester_context, reference_date=reference_date)
+
+    async def parse_streaming(
+        self,
+        text: str,
+        requester_context: str | None = None,
+        reference_date: date | None = None,
+        on_fields: FieldsCallback | None = None,
+    ) -> ParsedExtraction:
+        """Without on_fields this is one plain API call; with it, the vendor's SSE streaming API."""
         context_line = ""
         if requester_context:
             context_line = f"\nRequester context: {requester_context}\n"
@@ -83,63 +109,75 @@ class HostedProvider(LLMProvider):
                 "Valid scheduling window is today through 30 days from today. "
                 "For relative dates like 'tomorrow' use today + 1 day. Prefer null if uncertain."
             )
+        user_prompt = PROMPT_TEMPLATE.format(date_context=date_context, text=text + context_line)
 
+        delay = get_settings().llm_backoff_base_seconds
         for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = await backoff(delay)
+            timeout = attempt_timeout(self.timeout)
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    if self.vendor == "anthropic":
-                        headers = {
-                            "x-api-key": self.api_key,
-                            "anthropic-version": self.anthropic_version,
-                            "content-type": "application/json",
-                        }
-                        payload = {
-                            "model": self.model_name,
-                            "max_tokens": 1024,
-                            "temperature": 0,
-                            "messages": [
-                                {
-                                    "role": "user",
-                                    "content": PROMPT_TEMPLATE.format(
-                                        date_context=date_context,
-                                        text=text + context_line,
-                                    ),
-                                }
-                            ],
-                        }
-                        response = await client.post(f"{self.base_url}/v1/messages", headers=headers, json=payload)
+                client = self.http_client()
+                if self.vendor == "anthropic":
+                    headers = {
+                        "x-api-key": self.api_key,
+                        "anthropic-version": self.anthropic_version,
+                        "content-type": "application/json",
+                    }
+                    payload = {
+                        "model": self.model_name,
+                        "max_tokens": 1024,
+                        "temperature": 0,
+                        "system": [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
+                        "messages": [
+                            {
+                                "role": "user",
+                                "content": user_prompt,
+                            }
+                        ],
+                    }
+                    if on_fields is not None:
+                        content = await asyncio.wait_for(
+                            self._stream_content(client, f"{self.base_url}/v1/messages", headers, payload, on_fields), timeout
+                        )
+                    else:
+                        response = await asyncio.wait_for(client.post(f"{self.base_url}/v1/messages", headers=headers, json=payload), timeout)
                         response.raise_for_status()
                         body = response.json()
+                        self._record_usage(body.get("usage"), ttft_seconds=None)
                         content_blocks = body.get("content")
                         content = ""
                         if isinstance(content_blocks, list) and content_blocks:
                             first = content_blocks[0]
                             if isinstance(first, dict):
                                 content = str(first.get("text") or "").strip()
+                else:
+                    headers = {"Authorization": f"Bearer {self.api_key}"}
+                    payload = {
+                        "model": self.model_name,
+                        "messages": [
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {
+                                "role": "user",
+                                "content": user_prompt,
+                            },
+                        ],
+                        "temperature": 0,
+                        "response_format": {"type": "json_object"},
+                    }
+                    if on_fields is not None:
+                        content = await asyncio.wait_for(
+                            self._stream_content(client, f"{self.base_url}/chat/completions", headers, payload, on_fields), timeout
+                        )
                     else:
-                        headers = {"Authorization": f"Bearer {self.api_key}"}
-                        payload = {
-                            "model": self.model_name,
-                            "messages": [
-                                {
-                                    "role": "user",
-                                    "content": PROMPT_TEMPLATE.format(
-                                        date_context=date_context,
-                                        text=text + context_line,
-                                    ),
-                                }
-                            ],
-                            "temperature": 0,
-                            "response_format": {"type": "json_object"},
-                        }
-                        response = await client.post(f"{self.base_url}/chat/completions", headers=headers, json=payload)
+                        response = await asyncio.wait_for(client.post(f"{self.base_url}/chat/completions", headers=headers, json=payload), timeout)
                         response.raise_for_status()
                         body = response.json()
+                        self._record_usage(body.get("usage"), ttft_seconds=None)
                         content = body["choices"][0]["message"]["content"]
 
-                data = self._parse_json(content)
-                return ParsedExtraction.model_validate(data)
-            except httpx.TimeoutException as exc:
+                return await repair_extraction(content, self._complete_batch if self.reask_on_invalid else None, user_prompt)
+            except (httpx.TimeoutException, TimeoutError) as exc:
                 if attempt >= self.max_retries:
                     raise AppError(
                         ErrorCode.llm_timeout,
@@ -164,24 +202,140 @@ class HostedProvider(LLMProvider):
                     ) from exc
         raise AppError(ErrorCode.llm_provider_error, "Hosted provider request failed.", "Unexpected retry exit.", 502)
 
-    async def health_check(self) -> HealthStatus:
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+    async def _complete_batch(self, prompt: str, max_tokens: int) -> str:
+        """
+        One plain API call for a batch prompt. OpenAI's json_object mode cannot return an array,
+        so batches rely on the prompt alone.
+        """
+        delay = get_settings().llm_backoff_base_seconds
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = await backoff(delay)
+            timeout = attempt_timeout(self.timeout)
+            try:
+                client = self.http_client()
+                messages = [{"role": "user", "content": prompt}]
                 if self.vendor == "anthropic":
                     headers = {
                         "x-api-key": self.api_key,
                         "anthropic-version": self.anthropic_version,
+                        "content-type": "application/json",
                     }
-                    response = await client.get(f"{self.base_url}/v1/models", headers=headers)
+                    payload = {"model": self.model_name, "max_tokens": max_tokens, "temperature": 0, "messages": messages}
+                    response = await asyncio.wait_for(client.post(f"{self.base_url}/v1/messages", headers=headers, json=payload), timeout)
+                    response.raise_for_status()
+                    body = response.json()
+                    self._record_usage(body.get("usage"), ttft_seconds=None)
+                    blocks = body.get("content")
+                    first = blocks[0] if isinstance(blocks, list) and blocks else {}
+                    return str(first.get("text") or "") if isinstance(first, dict) else ""
+                headers = {"Authorization": f"Bearer {self.api_key}"}
+                payload = {"model": self.model_name, "max_tokens": max_tokens, "temperature": 0, "messages": messages}
+                response = await asyncio.wait_for(client.post(f"{self.base_url}/chat/completions", headers=headers, json=payload), timeout)
+                response.raise_for_status()
+                body = response.json()
+                self._record_usage(body.get("usage"), ttft_seconds=None)
+                return str(body["choices"][0]["message"]["content"] or "")
+            except (httpx.TimeoutException, TimeoutError) as exc:
+                if attempt >= self.max_retries:
+                    raise AppError(
+                        ErrorCode.llm_timeout,
+                        "The hosted language model timed out. Please retry.",
+                        f"Hosted batch timeout after retries: {exc}",
+                        504,
+                    ) from exc
+            except (KeyError, IndexError) as exc:
+                raise AppError(
+                    ErrorCode.extraction_invalid_schema,
+                    "Could not understand the request format.",
+                    f"Hosted batch response missing content: {exc}",
+                    400,
+                ) from exc
+            except httpx.HTTPError as exc:
+                if attempt >= self.max_retries:
+                    raise AppError(
+                        ErrorCode.llm_provider_error,
+                        "Hosted provider request failed.",
+                        f"Hosted batch provider error: {exc}",
+                        502,
+                    ) from exc
+        raise AppError(ErrorCode.llm_provider_error, "Hosted provider request failed.", "Unexpected retry exit.", 502)
+
+    async def _stream_content(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: dict[str, str],
+        payload: dict[str, Any],
+        on_fields: FieldsCallback,
+    ) -> str:
+        """
+        Consume the vendor's SSE stream (Anthropic content_block_delta / OpenAI chat.completion.chunk),
+        forwarding each newly completed field to on_fields; returns the full generated text.
+        """
+        tracker = PartialFieldTracker()
+        started = time.monotonic()
+        ttft: float | None = None
+        usage: dict[str, Any] = {}
+        body = {**payload, "stream": True}
+        if self.vendor != "anthropic":
+            body["stream_options"] = {"include_usage": True}
+        async with client.stream("POST", url, headers=headers, json=body) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                if self.vendor == "anthropic":
+                    if event.get("type") == "message_start":
+                        usage.update((event.get("message") or {}).get("usage") or {})
+                    elif event.get("type") == "message_delta":
+                        usage.update(event.get("usage") or {})
+                    delta = event.get("delta") if event.get("type") == "content_block_delta" else None
+                    piece = delta.get("text", "") if isinstance(delta, dict) else ""
                 else:
-                    headers = {"Authorization": f"Bearer {self.api_key}"}
-                    response = await client.get(f"{self.base_url}/models", headers=headers)
+                    usage.update(event.get("usage") or {})
+                    choices = event.get("choices") or [{}]
+                    piece = (choices[0].get("delta") or {}).get("content") or ""
+                if piece and ttft is None:
+                    ttft = time.monotonic() - started
+                new = tracker.feed(piece)
+                if new:
+                    await on_fields(new)
+        self._record_usage(usage, ttft_seconds=ttft)
+        return tracker.buffer.strip()
+
+    async def health_check(self) -> HealthStatus:
+        try:
+            client = self.http_client()
+            if self.vendor == "anthropic":
+                headers = {
+                    "x-api-key": self.api_key,
+                    "anthropic-version": self.anthropic_version,
+                }
+                response = await client.get(f"{self.base_url}/v1/models", headers=headers)
+            else:
+                headers = {"Authorization": f"Bearer {self.api_key}"}
+                response = await client.get(f"{self.base_url}/models", headers=headers)
             response.raise_for_status()
             return HealthStatus(status="ok")
         except Exception as exc:  # noqa: BLE001
             return HealthStatus(status="fail", last_error=str(exc))
 
-    @staticmethod
-    def _parse_json(content: str) -> dict[str, Any]:
-        return json.loads(content.strip())
-
+    def _record_usage(self, usage: dict[str, Any] | None, ttft_seconds: float | None) -> None:
+        """
+        Normalise vendor usage. Anthropic splits the prompt into uncached input_tokens plus
+        cache_creation_input_tokens and cache_read_input_tokens; OpenAI reports prompt_tokens with
+        prompt_tokens_details.cached_tokens.
+        """
+        usage = usage or {}
+        if self.vendor == "anthropic":
+            cached = usage.get("cache_read_input_tokens") or 0
+            prompt = (usage.get("input_tokens") or 0) + (usage.get("cache_creation_input_tokens") or 0) + cached
+            self.record_usage(prompt or None, cached, usage.get("output_tokens"), ttft_seconds)
+            return
+        details = usage.get("prompt_tokens_details") or {}
+        self.record_usage(usage.get("prompt_tokens"), details.get("cached_tokens"), usage.get("completion_tokens"), ttft_seconds)
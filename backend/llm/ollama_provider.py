@@ -1,4 +1,6 @@
+import asyncio
 import json
+import time
 from datetime import date
 from typing import Any
 
@@ -6,21 +8,37 @@ import httpx
 from pydantic import ValidationError
 
 from backend.config import get_settings
+from backend.deadline import attempt_timeout, backoff
 from backend.errors import AppError
 from backend.llm.base import LLMProvider
+from backend.llm.repair import repair_extraction
+from backend.llm.streaming import FieldsCallback, PartialFieldTracker
 from backend.schemas import ErrorCode, HealthStatus, ParsedExtraction
 
-PROMPT_TEMPLATE = """You must respond with only a single JSON object and nothing else. No explanation, no markdown, no code fence.
+# Part of extraction_version, which keys the extraction cache: bump it whenever SYSTEM_PROMPT,
+# PROMPT_TEMPLATE, EXTRACTION_SCHEMA or the decoding options change, so older parses stop being served.
+PROMPT_VERSION = 2
+
+# Static instructions go in Ollama's `system` field so every call shares one prompt prefix: with the
+# model kept loaded (keep_alive) the runner reuses that prefix's KV cache instead of re-evaluating it.
+SYSTEM_PROMPT = """You must respond with only a single JSON object and nothing else. No explanation, no markdown, no code fence.
 Use this exact schema (use null when unknown):
-{{"employee_first_name":"string","employee_last_name":"string or null","current_shift_date":"YYYY-MM-DD or null","current_shift_type":"morning or night or null","target_date":"YYYY-MM-DD or null","target_shift_type":"morning or night or null","requested_action":"swap or move or cover or null","reason":"string or null","partner_employee_first_name":"string or null","partner_employee_last_name":"string or null","partner_shift_date":"YYYY-MM-DD or null","partner_shift_type":"morning or night or null"}}
+{"employee_first_name":"string","employee_last_name":"string or null","current_shift_date":"YYYY-MM-DD or null","current_shift_type":"morning or night or null","target_date":"YYYY-MM-DD or null","target_shift_type":"morning or night or null","requested_action":"swap or move or cover or null","reason":"string or null","partner_employee_first_name":"string or null","partner_employee_last_name":"string or null","partner_shift_date":"YYYY-MM-DD or null","partner_shift_type":"morning or night or null"}
 For swap requests: set employee_* to the requester, partner_* to the swap partner, current_shift_* to requester's shift, target_* and partner_shift_* to partner's shift.
-For cover requests: current_shift_date is the date of the shift to be covered (the requester's shift). If the user says "tomorrow" or "my shift tomorrow", set both current_shift_date and target_date to tomorrow (today + 1 day).
-{date_context}
+For cover requests: current_shift_date is the date of the shift to be covered (the requester's shift). If the user says "tomorrow" or "my shift tomorrow", set both current_shift_date and target_date to tomorrow (today + 1 day)."""
+
+PROMPT_TEMPLATE = """{date_context}
 
 User request: {text}
 
 JSON:"""
 
+# Passed as `format` so decoding is constrained to a ParsedExtraction object (no fences or prose).
+EXTRACTION_SCHEMA = ParsedExtraction.model_json_schema()
+# One object ends the answer; a blank line after it is the model drifting into commentary (or,
+# under a grammar, padding whitespace up to num_predict).
+STOP_SEQUENCES = ["\n\n"]
+
 class OllamaProvider(LLMProvider):
     def __init__(self) -> None:
         settings = get_settings()
@@ -35,8 +53,12 @@ class OllamaProvider(LLMProvider):
         self.model_name = settings.ollama_model
         self.timeout = settings.llm_parse_timeout_seconds
         self.max_retries = settings.llm_max_retries
+        self.reask_on_invalid = settings.llm_repair_reask
         self.provider_name = "ollama"
-        self.extraction_version = f"ollama-{self.model_name}-v1"
+        self.extraction_version = f"ollama-{self.model_name}-v{PROMPT_VERSION}"
+        self.keep_alive = settings.ollama_keep_alive
+        self.structured_output = settings.ollama_structured_output
+        self.num_predict = settings.ollama_num_predict
 
     async def parse(
         self,
@@ -44,6 +66,16 @@ class OllamaProvider(LLMProvider):
         requester_context: str | None = None,
         reference_date: date | None = None,
     ) -> ParsedExtraction:
+        return await self.parse_streaming(text, requester_context=requester_context, reference_date=reference_date)
+
+    async def parse_streaming(
+        self,
+        text: str,
+        requester_context: str | None = None,
+        reference_date: date | None = None,
+        on_fields: FieldsCallback | None = None,
+    ) -> ParsedExtraction:
+        """Without on_fields this is one non-streaming /api/generate call; with it, `stream: true`."""
         context_line = ""
         if requester_context:
             context_line = f"\nRequester context: {requester_context}\n"
@@ -55,16 +87,33 @@ class OllamaProvider(LLMProvider):
                 "For relative dates like 'tomorrow' use today + 1 day. Prefer null if uncertain."
             )
         prompt = PROMPT_TEMPLATE.format(date_context=date_context, text=text + context_line)
-        payload = {"model": self.model_name, "prompt": prompt, "stream": False}
+        payload = {
+            "model": self.model_name,
+            "system": SYSTEM_PROMPT,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+            "options": {"num_predict": self.num_predict, "stop": STOP_SEQUENCES},
+        }
+        if self.structured_output:
+            payload["format"] = EXTRACTION_SCHEMA
 
+        delay = get_settings().llm_backoff_base_seconds
         for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = await backoff(delay)
+            timeout = attempt_timeout(self.timeout)
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(f"{self.base_url}/api/generate", json=payload)
-                response.raise_for_status()
-                body = response.json()
-                msg = body.get("message")
-                content = (body.get("response") or (msg.get("content") if isinstance(msg, dict) else None) or "").strip()
+                client = self.http_client()
+                if on_fields is None:
+                    response = await asyncio.wait_for(client.post(f"{self.base_url}/api/generate", json=payload), timeout)
+                    response.raise_for_status()
+                    body = response.json()
+                    self._record_usage(body, ttft_seconds=None)
+                    msg = body.get("message")
+                    content = (body.get("response") or (msg.get("content") if isinstance(msg, dict) else None) or "").strip()
+                else:
+                    content = (await asyncio.wait_for(self._generate_streaming(client, payload, on_fields), timeout)).strip()
                 if not content:
                     raise AppError(
                         ErrorCode.extraction_invalid_schema,
@@ -72,9 +121,8 @@ class OllamaProvider(LLMProvider):
                         "Ollama returned an empty response.",
                         400,
                     )
-                data = self._parse_json(content)
-                return ParsedExtraction.model_validate(data)
-            except httpx.TimeoutException as exc:
+                return await repair_extraction(content, self._complete_batch if self.reask_on_invalid else None, prompt)
+            except (httpx.TimeoutException, TimeoutError) as exc:
                 if attempt >= self.max_retries:
                     raise AppError(
                         ErrorCode.llm_timeout,
@@ -113,10 +161,73 @@ class OllamaProvider(LLMProvider):
                     ) from exc
         raise AppError(ErrorCode.llm_provider_error, "Provider request failed.", "Unexpected retry exit.", 502)
 
+    async def _complete_batch(self, prompt: str, max_tokens: int) -> str:
+        """Non-streaming /api/generate with the context window widened to fit the whole batch."""
+        settings = get_settings()
+        payload = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": False,
+            "options": {"num_ctx": settings.llm_batch_context_tokens, "num_predict": max_tokens},
+            "keep_alive": self.keep_alive,
+        }
+        delay = get_settings().llm_backoff_base_seconds
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = await backoff(delay)
+            timeout = attempt_timeout(self.timeout)
+            try:
+                response = await asyncio.wait_for(self.http_client().post(f"{self.base_url}/api/generate", json=payload), timeout)
+                response.raise_for_status()
+                body = response.json()
+                self._record_usage(body, ttft_seconds=None)
+                return str(body.get("response") or "")
+            except (httpx.TimeoutException, TimeoutError) as exc:
+                if attempt >= self.max_retries:
+                    raise AppError(
+                        ErrorCode.llm_timeout,
+                        "The language model timed out. Please retry.",
+                        f"Ollama batch timeout after retries: {exc}",
+                        504,
+                    ) from exc
+            except httpx.HTTPError as exc:
+                if attempt >= self.max_retries:
+                    raise AppError(
+                        ErrorCode.llm_provider_error,
+                        "Provider request failed.",
+                        f"Ollama batch provider error: {exc}",
+                        502,
+                    ) from exc
+        raise AppError(ErrorCode.llm_provider_error, "Provider request failed.", "Unexpected retry exit.", 502)
+
+    async def _generate_streaming(self, client: httpx.AsyncClient, payload: dict[str, Any], on_fields: FieldsCallback) -> str:
+        """Read Ollama's NDJSON chunks, forwarding each newly completed field to on_fields."""
+        tracker = PartialFieldTracker()
+        started = time.monotonic()
+        ttft: float | None = None
+        async with client.stream("POST", f"{self.base_url}/api/generate", json={**payload, "stream": True}) as response:
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                piece = chunk.get("response") or ""
+                if piece and ttft is None:
+                    ttft = time.monotonic() - started
+                new = tracker.feed(piece)
+                if new:
+                    await on_fields(new)
+                if chunk.get("done"):
+                    self._record_usage(chunk, ttft_seconds=ttft)
+                    break
+        return tracker.buffer
+
     async def health_check(self) -> HealthStatus:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
+            client = self.http_client()
+            response = await client.get(f"{self.base_url}/api/tags")
             response.raise_for_status()
             data = response.json()
             models = data.get("models") if isinstance(data, dict) else None
@@ -131,15 +242,12 @@ class OllamaProvider(LLMProvider):
         except Exception as exc:  # noqa: BLE001
             return HealthStatus(status="fail", last_error=str(exc))
 
-    @staticmethod
-    def _parse_json(content: str) -> dict[str, Any]:
-        cleaned = content.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.strip("`")
-            cleaned = cleaned.replace("json", "", 1).strip()
-        start = cleaned.find("{")
-        end = cleaned.rfind("}")
-        if start != -1 and end != -1 and end >= start:
-            cleaned = cleaned[start : end + 1]
-        return json.loads(cleaned)
-
+    def _record_usage(self, body: dict[str, Any], ttft_seconds: float | None) -> None:
+        """
+        From Ollama's final stats: prompt_eval_count counts only tokens actually evaluated, so a
+        KV-cache prefix hit shows up as a smaller count. Without a stream, time to first token is
+        model load plus prompt evaluation (reported in nanoseconds).
+        """
+        if ttft_seconds is None and "prompt_eval_duration" in body:
+            ttft_seconds = (body.get("load_duration", 0) + body["prompt_eval_duration"]) / 1e9
+        self.record_usage(body.get("prompt_eval_count"), None, body.get("eval_count"), ttft_seconds)
@@ -0,0 +1,242 @@
+"""
+Tolerant handling of model output that is almost a valid ParsedExtraction.
+
+Providers hand their raw content to `repair_extraction`: common JSON defects (fences, prose around
+the object, trailing commas, Python literals, single quotes, a truncated tail) are fixed locally,
+near-miss field values ("Night", "evening", "2026-03-04T00:00:00", "none") are coerced, and only
+when fields are still invalid is the model asked, in one short follow-up, to correct just those.
+The follow-up repeats the original prompt so relative dates and the requester context still
+resolve. Requester names are never taken from a repair: a missing or invalid requester is left
+empty so extraction falls back to the authenticated user.
+"""
+import json
+import logging
+import re
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import date
+from typing import Any
+
+from pydantic import ValidationError
+
+from backend.errors import AppError
+from backend.schemas import ParsedExtraction, RequestedActionEnum, ShiftTypeEnum
+
+logger = logging.getLogger("shift-scheduler")
+
+# Sends a raw prompt to the same model and returns its text (a provider's `_complete_batch`).
+CompleteFn = Callable[[str, int], Awaitable[str]]
+
+REASK_MAX_TOKENS = 200
+
+REASK_PROMPT_TEMPLATE = """{original_prompt}
+
+Some fields in your JSON answer to the request above were invalid:
+{problems}
+Allowed values: shift types "morning" or "night"; requested_action "swap", "move" or "cover"; dates "YYYY-MM-DD"; null when unknown.
+Return ONLY a JSON object containing corrected values for exactly these fields: {fields}"""
+
+_SHIFT_TYPES = {
+    "morning": ShiftTypeEnum.morning,
+    "mornings": ShiftTypeEnum.morning,
+    "am": ShiftTypeEnum.morning,
+    "day": ShiftTypeEnum.morning,
+    "days": ShiftTypeEnum.morning,
+    "early": ShiftTypeEnum.morning,
+    "night": ShiftTypeEnum.night,
+    "nights": ShiftTypeEnum.night,
+    "pm": ShiftTypeEnum.night,
+    "evening": ShiftTypeEnum.night,
+    "evenings": ShiftTypeEnum.night,
+    "overnight": ShiftTypeEnum.night,
+    "late": ShiftTypeEnum.night,
+}
+_ACTIONS = {
+    "swap": RequestedActionEnum.swap,
+    "switch": RequestedActionEnum.swap,
+    "trade": RequestedActionEnum.swap,
+    "exchange": RequestedActionEnum.swap,
+    "move": RequestedActionEnum.move,
+    "change": RequestedActionEnum.move,
+    "reschedule": RequestedActionEnum.move,
+    "transfer": RequestedActionEnum.move,
+    "cover": RequestedActionEnum.cover,
+    "coverage": RequestedActionEnum.cover,
+    "replace": RequestedActionEnum.cover,
+    "fill": RequestedActionEnum.cover,
+}
+_NULLISH = frozenset({"", "null", "none", "n/a", "na", "unknown", "nil", "-"})
+_SHIFT_FIELDS = frozenset({"current_shift_type", "target_shift_type", "partner_shift_type"})
+_DATE_FIELDS = frozenset({"current_shift_date", "target_date", "partner_shift_date"})
+# Identity must come from the model's first answer or the authenticated user, never a re-ask.
+_REQUESTER_FIELDS = frozenset({"employee_first_name", "employee_last_name"})
+_DATE_PREFIX = re.compile(r"^(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})(?:$|[T\s])")
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_PY_LITERAL = re.compile(r"(:\s*)(None|True|False)(?=\s*[,}])")
+_SINGLE_QUOTED = re.compile(r"(?<=[{,:\s])'([^'\\]*)'(?=\s*[:,}])")
+_MISSING_COMMA = re.compile(r'("|\d|null|true|false)(\s*\n\s*)(")')
+_DANGLING_KEY = re.compile(r'([{,])\s*"[^"]*"\s*:?\s*$')
+_SMART_QUOTES = str.maketrans({"\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'"})
+
+
+class RepairStats:
+    """
+    Process-wide repair counters for GET /metrics/llm. Outcomes count parses; fixes count what was
+    changed. Every `repaired_locally` parse is a round trip the user did not have to make.
+    """
+
+    OUTCOMES = ("clean", "repaired_locally", "reask_fixed", "reask_failed", "unrepairable")
+    FIXES = ("json_syntax", "enum_value", "date_value", "null_literal", "requester_cleared")
+
+    def __init__(self) -> None:
+        self.outcomes: Counter[str] = Counter()
+        self.fixes: Counter[str] = Counter()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "outcomes": {name: self.outcomes[name] for name in self.OUTCOMES},
+            "fixes": {name: self.fixes[name] for name in self.FIXES},
+            "round_trips_avoided": self.outcomes["repaired_locally"] + self.outcomes["reask_fixed"],
+        }
+
+
+repair_stats = RepairStats()
+
+
+def loads_tolerant(content: str) -> tuple[dict[str, Any], bool]:
+    """
+    Parse the JSON object in `content`, fixing common defects if a strict parse fails.
+    Returns the object and whether any fix was needed. Raises json.JSONDecodeError when there is
+    no object to recover.
+    """
+    cleaned = content.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.strip("`")
+        cleaned = cleaned.replace("json", "", 1).strip()
+    start = cleaned.find("{")
+    if start == -1:
+        raise json.JSONDecodeError("No JSON object in model output", content, 0)
+    end = cleaned.rfind("}")
+    strict = cleaned[start : end + 1] if end > start else cleaned[start:]
+    try:
+        return _as_object(json.loads(strict), content), False
+    except json.JSONDecodeError:
+        pass
+
+    fixed = strict.translate(_SMART_QUOTES)
+    fixed = _PY_LITERAL.sub(lambda m: m.group(1) + {"None": "null", "True": "true", "False": "false"}[m.group(2)], fixed)
+    fixed = _SINGLE_QUOTED.sub(r'"\1"', fixed)
+    fixed = _MISSING_COMMA.sub(r"\1,\2\3", fixed)
+    fixed = _close_truncated(fixed)
+    fixed = _TRAILING_COMMA.sub(r"\1", fixed)
+    return _as_object(json.loads(fixed), content), True
+
+
+def _as_object(value: Any, content: str) -> dict[str, Any]:
+    if not isinstance(value, dict):
+        raise json.JSONDecodeError("Model output is not a JSON object", content, 0)
+    return value
+
+
+def _close_truncated(text: str) -> str:
+    """Close the string and object a cut-off answer left open, dropping a key that has no value yet."""
+    if text.count("{") <= text.count("}"):
+        return text
+    if len(re.findall(r'(?<!\\)"', text)) % 2:
+        text += '"'
+    text = _DANGLING_KEY.sub(r"\1", text)
+    return text + "}" * (text.count("{") - text.count("}"))
+
+
+def coerce_fields(data: dict[str, Any]) -> tuple[dict[str, Any], Counter[str]]:
+    """Map near-miss enum, date and null values onto what ParsedExtraction accepts."""
+    out = dict(data)
+    fixes: Counter[str] = Counter()
+    for name, value in data.items():
+        if not isinstance(value, str) or name not in ParsedExtraction.model_fields:
+            continue
+        key = value.strip().lower()
+        if key in _NULLISH and name != "employee_first_name":
+            out[name] = None
+            fixes["null_literal"] += 1
+        elif name in _SHIFT_FIELDS and key in _SHIFT_TYPES and value != _SHIFT_TYPES[key].value:
+            out[name] = _SHIFT_TYPES[key].value
+            fixes["enum_value"] += 1
+        elif name == "requested_action" and key in _ACTIONS and value != _ACTIONS[key].value:
+            out[name] = _ACTIONS[key].value
+            fixes["enum_value"] += 1
+        elif name in _DATE_FIELDS and (match := _DATE_PREFIX.match(value.strip())):
+            try:
+                iso = date(*(int(part) for part in match.groups())).isoformat()
+            except ValueError:
+                continue
+            if iso != value:
+                out[name] = iso
+                fixes["date_value"] += 1
+    return out, fixes
+
+
+async def repair_extraction(
+    content: str,
+    complete: CompleteFn | None = None,
+    original_prompt: str = "",
+) -> ParsedExtraction:
+    """
+    Validate model output into a ParsedExtraction, repairing locally first and, if `complete` is
+    given, re-asking once for just the fields that are still invalid. `original_prompt` (request
+    text, date and requester context) is repeated in the re-ask. An invalid requester name is
+    cleared rather than re-asked. Raises the original json.JSONDecodeError / ValidationError when
+    neither works.
+    """
+    try:
+        data, syntax_fixed = loads_tolerant(content)
+    except json.JSONDecodeError:
+        repair_stats.outcomes["unrepairable"] += 1
+        raise
+    if syntax_fixed:
+        repair_stats.fixes["json_syntax"] += 1
+    try:
+        result = ParsedExtraction.model_validate(data)
+        repair_stats.outcomes["repaired_locally" if syntax_fixed else "clean"] += 1
+        return result
+    except ValidationError:
+        pass
+
+    data, fixes = coerce_fields(data)
+    repair_stats.fixes.update(fixes)
+    try:
+        result = ParsedExtraction.model_validate(data)
+        repair_stats.outcomes["repaired_locally"] += 1
+        return result
+    except ValidationError as exc:
+        invalid = exc
+    if any(err["loc"] and err["loc"][0] in _REQUESTER_FIELDS for err in invalid.errors()):
+        # Empty names are what extraction treats as "the authenticated user".
+        data = {**data, "employee_first_name": "", "employee_last_name": None}
+        repair_stats.fixes["requester_cleared"] += 1
+        try:
+            result = ParsedExtraction.model_validate(data)
+            repair_stats.outcomes["repaired_locally"] += 1
+            return result
+        except ValidationError as exc:
+            invalid = exc
+    if complete is None:
+        repair_stats.outcomes["unrepairable"] += 1
+        raise invalid
+
+    bad_fields = sorted({str(err["loc"][0]) for err in invalid.errors() if err["loc"]})
+    problems = "\n".join(f"- {name}: {json.dumps(data.get(name))}" for name in bad_fields)
+    prompt = REASK_PROMPT_TEMPLATE.format(
+        original_prompt=original_prompt.strip(), problems=problems, fields=", ".join(bad_fields)
+    ).lstrip()
+    try:
+        patch, _ = loads_tolerant(await complete(prompt, REASK_MAX_TOKENS))
+        patch, _ = coerce_fields(patch)
+        result = ParsedExtraction.model_validate({**data, **{k: patch[k] for k in bad_fields if k in patch}})
+    except (AppError, json.JSONDecodeError, ValidationError) as exc:
+        logger.info("Extraction re-ask for %s failed: %s", bad_fields, exc)
+        repair_stats.outcomes["reask_failed"] += 1
+        raise invalid from None
+    repair_stats.outcomes["reask_fixed"] += 1
+    return result
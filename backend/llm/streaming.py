@@ -0,0 +1,42 @@
+import json
+import re
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from backend.schemas import ParsedExtraction
+
+# Receives extraction fields as soon as the model has finished emitting their values.
+FieldsCallback = Callable[[dict[str, Any]], Awaitable[None]]
+
+_FIELD = re.compile(r'"(\w+)"\s*:\s*("(?:[^"\\]|\\.)*"|null|true|false|-?\d+(?:\.\d+)?)\s*[,}]')
+_KNOWN = frozenset(ParsedExtraction.model_fields)
+
+
+class PartialFieldTracker:
+    """
+    Pull completed `"field": value` pairs out of a JSON object that is still being generated.
+
+    A pair counts once its value is closed and followed by `,` or `}`, so a string cut off
+    mid-token is never reported. Only ParsedExtraction fields with non-null values are emitted,
+    each at most once.
+    """
+
+    def __init__(self) -> None:
+        self.buffer = ""
+        self.seen: dict[str, Any] = {}
+
+    def feed(self, chunk: str) -> dict[str, Any]:
+        self.buffer += chunk
+        new: dict[str, Any] = {}
+        for name, raw in _FIELD.findall(self.buffer):
+            if name not in _KNOWN or name in self.seen:
+                continue
+            try:
+                value = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            if value is None:
+                continue
+            self.seen[name] = value
+            new[name] = value
+        return new
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 import uuid
@@ -10,9 +11,12 @@ from sqlalchemy.exc import IntegrityError
 
 from backend.config import get_settings
 from backend.db import init_db
+from backend.deadline import deadline_scope
 from backend.errors import AppError
+from backend.llm.factory import close_llm_provider, get_llm_provider
 from backend.schemas import ErrorCode
 from backend.routers import approval, employees, health, metrics, partner, schedule
+from backend.services.job_queue import start_job_workers
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,7 +31,14 @@ async def lifespan(_: FastAPI):
     if settings.dev_mode:
         await init_db()
         logger.info("Database tables initialized in dev mode.")
+    # One provider (and pooled HTTP client) per process, shared by parses and /health/llm.
+    get_llm_provider().warm()
+    workers = start_job_workers(schedule.job_queue, schedule.service)
     yield
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    await close_llm_provider()
 
 
 app = FastAPI(title="Shift Scheduler Agent", version="1.0.0", lifespan=lifespan)
@@ -55,7 +66,14 @@ async def request_context_middleware(request: Request, call_next):
     request.state.request_id = request_id
     request.state.correlation_id = correlation_id
     started = time.perf_counter()
-    response = await call_next(request)
+    budget = settings.request_deadline_seconds
+    try:
+        # A client with its own timeout can ask us to give up sooner, never later.
+        budget = min(budget, float(request.headers.get("x-request-timeout", budget)))
+    except ValueError:
+        pass
+    with deadline_scope(budget):
+        response = await call_next(request)
     elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
     response.headers["x-request-id"] = request_id
     response.headers["x-correlation-id"] = correlation_id
@@ -84,6 +102,7 @@ async def app_error_handler(request: Request, exc: AppError):
             "developerMessage": exc.developer_message,
             "correlationId": correlation_id,
         },
+        headers=exc.headers,
     )
 
 
@@ -3,8 +3,15 @@ from datetime import datetime
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.llm.factory import get_llm_provider
+from backend.llm.failover import FailoverProvider
+from backend.llm.repair import repair_stats
 from backend.models import RequestMetrics, RequestStatus, ScheduleRequest
-from backend.schemas import MetricsOut
+from backend.schemas import LLMMetricsOut, MetricsOut
+from backend.services.admission import AdmissionController
+from backend.services.extraction_cache import ExtractionCache
+from backend.services.near_duplicate import NearDuplicateIndex
+from backend.services.single_flight import SingleFlight
 
 
 def _avg_seconds(start_col, end_col):
@@ -42,6 +49,18 @@ async def get_metrics(session: AsyncSession, since: datetime | None = None) -> M
         .where(*where_clause)
     )
 
+    by_path = await session.execute(
+        select(
+            RequestMetrics.parse_path,
+            func.count(),
+            _avg_seconds(RequestMetrics.submitted_at, RequestMetrics.parsed_at),
+        )
+        .join(ScheduleRequest, ScheduleRequest.id == RequestMetrics.request_id)
+        .where(RequestMetrics.parse_path.is_not(None), *where_clause)
+        .group_by(RequestMetrics.parse_path)
+    )
+    path_rows = by_path.all()
+
     total_requests = int(total or 0)
     approval_rate = float((approved or 0) / total_requests) if total_requests else 0.0
     return MetricsOut(
@@ -51,5 +70,26 @@ async def get_metrics(session: AsyncSession, since: datetime | None = None) -> M
         parse_time_avg=float(parse_time or 0.0),
         validation_time_avg=float(validation_time or 0.0),
         approval_latency_avg=float(approval_latency or 0.0),
+        parse_path_counts={path: int(count) for path, count, _ in path_rows},
+        parse_time_avg_by_path={path: float(avg or 0.0) for path, _, avg in path_rows},
     )
 
+
+async def get_llm_metrics(
+    cache: ExtractionCache, index: NearDuplicateIndex, single_flight: SingleFlight, admission: AdmissionController
+) -> LLMMetricsOut:
+    """Extraction cache counters (shared via Redis) plus this worker's parse-path, HTTP pool, admission, failover and prompt-usage stats."""
+    provider = get_llm_provider()
+    return LLMMetricsOut(
+        **await cache.stats(),
+        near_duplicate_enabled=index.enabled,
+        near_duplicate_lookups=index.lookups,
+        near_duplicate_hits=index.hits,
+        near_duplicate_bypass_rate=index.bypass_rate,
+        single_flight_coalesced=single_flight.coalesced,
+        llm_http_pool=provider.pool_stats(),
+        admission=admission.stats(),
+        failover=provider.chain_stats() if isinstance(provider, FailoverProvider) else {},
+        prompt_usage=provider.usage_stats(),
+        json_repair=repair_stats.stats(),
+    )
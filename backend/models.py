@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, String, Text, UniqueConstraint, func, Computed
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func, Computed
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -30,6 +30,11 @@ class EmployeeRole(str, enum.Enum):
     admin = "admin"
 
 
+class WorkloadPeriod(str, enum.Enum):
+    week = "week"  # ISO week, period_start is the Monday
+    month = "month"  # calendar month, period_start is the 1st
+
+
 class Employee(Base):
     __tablename__ = "employees"
 
@@ -49,6 +54,11 @@ class Employee(Base):
     shifts: Mapped[list["Shift"]] = relationship(back_populates="assigned_employee")
 
 
+# Case-insensitive name resolution (services/employee_names.py) matches on lower(...).
+Index("ix_employees_lower_first_name", func.lower(Employee.first_name))
+Index("ix_employees_lower_last_name", func.lower(Employee.last_name))
+
+
 class Shift(Base):
     __tablename__ = "shifts"
 
@@ -65,6 +75,23 @@ class Shift(Base):
     assigned_employee: Mapped[Employee | None] = relationship(back_populates="shifts")
 
 
+class EmployeeWorkload(Base):
+    """Assigned-shift counters per employee and period, maintained by services/workload.py."""
+
+    __tablename__ = "employee_workload"
+
+    employee_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("employees.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    period: Mapped[WorkloadPeriod] = mapped_column(Enum(WorkloadPeriod, name="workload_period"), primary_key=True)
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    total: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    morning: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    night: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+
 class ExtractionVersion(Base):
     __tablename__ = "extraction_versions"
 
@@ -110,6 +137,8 @@ class ScheduleRequest(Base):
     coverage_shift_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("shifts.id"), nullable=True
     )
+    # Set on every member of a proposed multi-way swap rotation (same id for the whole cycle).
+    swap_cycle_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True, index=True)
 
 
 class RequestMetrics(Base):
@@ -125,6 +154,8 @@ class RequestMetrics(Base):
     validated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     approved_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     rejected_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # ParsePathEnum value: rule | cache | near_duplicate | llm | coalesced | structured (null before 0004).
+    parse_path: Mapped[str | None] = mapped_column(String(20), nullable=True)
 
 
 class AuditLog(Base):
@@ -6,11 +6,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.db import get_db_session
 from backend.deps import get_current_user, require_admin
 from backend.models import Employee
-from backend.schemas import ApprovalActionOut, PendingApprovalItem
+from backend.schemas import (
+    ApprovalActionOut,
+    ConflictGraphResponse,
+    PendingApprovalItem,
+    SwapCycleOut,
+)
 from backend.services.approval_service import ApprovalService
+from backend.services.simulation_service import SimulationService
+from backend.services.swap_cycle_service import swap_cycle_solver
 
 router = APIRouter(prefix="/approval", tags=["approval"])
 service = ApprovalService()
+simulation_service = SimulationService()
 
 
 @router.get("/pending", response_model=list[PendingApprovalItem])
@@ -21,6 +29,24 @@ async def list_pending(
     return await service.list_pending(session, current_user=current_user)
 
 
+@router.get("/conflicts", response_model=ConflictGraphResponse)
+async def conflict_graph(
+    session: AsyncSession = Depends(get_db_session),
+    _: Employee = Depends(require_admin),
+) -> ConflictGraphResponse:
+    """Unresolved requests applied together in memory; linked when they cannot all be approved."""
+    return await simulation_service.conflict_graph(session)
+
+
+@router.get("/swap-cycles", response_model=list[SwapCycleOut])
+async def swap_cycles(
+    session: AsyncSession = Depends(get_db_session),
+    _: Employee = Depends(require_admin),
+) -> list[SwapCycleOut]:
+    """Multi-way rotations across open swap requests; the graph also picks up requests other workers created."""
+    return await swap_cycle_solver.proposals(session)
+
+
 @router.post("/{request_id}/approve", response_model=ApprovalActionOut)
 async def approve_request(
     request_id: UUID,
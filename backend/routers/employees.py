@@ -9,6 +9,7 @@ from backend.deps import require_admin
 from backend.errors import AppError
 from backend.models import Employee, EmployeeRole
 from backend.schemas import EmployeeCreate, EmployeeOut, EmployeeUpdate, ErrorCode
+from backend.services.employee_names import find_employees_by_name
 
 router = APIRouter(prefix="/employees", tags=["employees"])
 
@@ -76,8 +77,8 @@ async def update_employee(
     if payload.last_name is not None:
         employee.last_name = payload.last_name
     if payload.first_name is not None or payload.last_name is not None:
-        other = await session.scalar(select(Employee).where(Employee.first_name == employee.first_name, Employee.last_name == employee.last_name, Employee.id != employee_id))
-        if other:
+        others = await find_employees_by_name(session, employee.first_name, employee.last_name, exclude_id=employee_id)
+        if others:
             raise AppError(
                 ErrorCode.employee_duplicate_name,
                 "Another employee already has this name.",
@@ -6,10 +6,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.db import get_db_session
 from backend.deps import require_admin
 from backend.models import Employee
-from backend.metrics import get_metrics
-from backend.schemas import MetricsOut
+from backend.metrics import get_llm_metrics, get_metrics
+from backend.schemas import LLMMetricsOut, MetricsOut
+from backend.services.admission import llm_admission
+from backend.services.extraction_cache import ExtractionCache
+from backend.services.near_duplicate import near_duplicate_index
+from backend.services.single_flight import parse_single_flight
 
 router = APIRouter(tags=["metrics"])
+extraction_cache = ExtractionCache()
 
 
 @router.get("/metrics", response_model=MetricsOut)
@@ -20,3 +25,7 @@ async def metrics_endpoint(
 ) -> MetricsOut:
     return await get_metrics(session, since)
 
+
+@router.get("/metrics/llm", response_model=LLMMetricsOut)
+async def llm_metrics_endpoint(_: Employee = Depends(require_admin)) -> LLMMetricsOut:
+    return await get_llm_metrics(extraction_cache, near_duplicate_index, parse_single_flight, llm_admission)
@@ -1,17 +1,24 @@
 from datetime import date
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db import get_db_session
 from backend.deps import get_current_user, require_admin
 from backend.models import Employee, EmployeeRole
-from backend.schemas import PreviewRequestIn, PreviewResponse, ScheduleRequestListItem, ScheduleRequestOut, ShiftAssignIn, ShiftsResponse, StructuredRequestIn
+from backend.schemas import AutoFillResponse, BatchPreviewIn, BatchPreviewResponse, CoverageResponse, JobAcceptedOut, JobStatusOut, PreviewRequestIn, PreviewResponse, RosterOptimizeIn, RosterPlanResponse, ScheduleRequestListItem, ScheduleRequestOut, ShiftAssignIn, ShiftsResponse, StructuredRequestIn
+from backend.services.coverage_service import CoverageService
+from backend.services.job_queue import JobQueue
+from backend.services.roster_optimizer import RosterOptimizer
 from backend.services.scheduler_service import SchedulerService
 
 router = APIRouter(prefix="/schedule", tags=["schedule"])
 service = SchedulerService()
+coverage_service = CoverageService()
+roster_optimizer = RosterOptimizer()
+job_queue = JobQueue()
 
 
 @router.post("/request", response_model=ScheduleRequestOut)
@@ -29,6 +36,24 @@ async def create_schedule_request(
     )
 
 
+@router.post("/request/async", response_model=JobAcceptedOut, status_code=status.HTTP_202_ACCEPTED)
+async def submit_schedule_request_job(
+    payload: PreviewRequestIn,
+    request: Request,
+    current_user: Employee = Depends(get_current_user),
+) -> JobAcceptedOut:
+    """Queue the request for a worker and return at once; poll GET /schedule/jobs/{jobId} for the result."""
+    return await job_queue.enqueue(payload, current_user, request.state.correlation_id)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusOut)
+async def get_schedule_request_job(
+    job_id: str,
+    current_user: Employee = Depends(get_current_user),
+) -> JobStatusOut:
+    return await job_queue.get(job_id, current_user)
+
+
 @router.get("/requests", response_model=list[ScheduleRequestListItem])
 async def list_schedule_requests(
     session: AsyncSession = Depends(get_db_session),
@@ -67,6 +92,30 @@ async def preview_schedule_request(
     )
 
 
+@router.post("/preview/stream")
+async def preview_schedule_request_stream(
+    payload: PreviewRequestIn,
+    request: Request,
+    current_user: Employee = Depends(get_current_user),
+) -> StreamingResponse:
+    """Same as /schedule/preview, as server-sent events so the UI can show progress while the model runs."""
+    return StreamingResponse(
+        service.preview_stream(payload, current_user, request.state.correlation_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/preview/batch", response_model=BatchPreviewResponse)
+async def preview_schedule_request_batch(
+    payload: BatchPreviewIn,
+    session: AsyncSession = Depends(get_db_session),
+    current_user: Employee = Depends(get_current_user),
+) -> BatchPreviewResponse:
+    """Validate many structured and free-text requests against one roster load and flag in-batch slot conflicts."""
+    return await service.preview_batch(session=session, payload=payload, current_user=current_user)
+
+
 @router.post("/request/structured", response_model=ScheduleRequestOut)
 async def create_structured_schedule_request(
     payload: StructuredRequestIn,
@@ -82,6 +131,37 @@ async def create_structured_schedule_request(
     )
 
 
+@router.get("/coverage", response_model=CoverageResponse)
+async def coverage_overview(
+    from_date: date | None = Query(default=None, alias="from"),
+    to_date: date | None = Query(default=None, alias="to"),
+    session: AsyncSession = Depends(get_db_session),
+    _: Employee = Depends(require_admin),
+) -> CoverageResponse:
+    """Eligible-candidate counts for every shift in the window, highest coverage risk first."""
+    return await coverage_service.eligibility_overview(session, from_date=from_date, to_date=to_date)
+
+
+@router.post("/coverage/auto-fill", response_model=AutoFillResponse)
+async def coverage_auto_fill(
+    apply: bool = False,
+    session: AsyncSession = Depends(get_db_session),
+    _: Employee = Depends(require_admin),
+) -> AutoFillResponse:
+    """Min-cost matching of all pending_fill shifts to eligible employees; apply=true commits it."""
+    return await coverage_service.auto_fill(session, apply=apply)
+
+
+@router.post("/roster/optimize", response_model=RosterPlanResponse)
+async def optimize_roster(
+    payload: RosterOptimizeIn,
+    session: AsyncSession = Depends(get_db_session),
+    _: Employee = Depends(require_admin),
+) -> RosterPlanResponse:
+    """Plan assignments for every shift slot in the horizon; apply=true writes them in one transaction."""
+    return await roster_optimizer.plan(session, payload)
+
+
 @router.get("/shifts/{shift_id}/candidates")
 async def list_shift_candidates(
     shift_id: UUID,
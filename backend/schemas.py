@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from enum import Enum
-from typing import Any
+from typing import Annotated, Any
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
@@ -17,6 +17,17 @@ class RequestedActionEnum(str, Enum):
     cover = "cover"
 
 
+class ParsePathEnum(str, Enum):
+    """Which stage produced a request's extraction."""
+
+    rule = "rule"
+    cache = "cache"
+    near_duplicate = "near_duplicate"
+    llm = "llm"
+    coalesced = "coalesced"
+    structured = "structured"
+
+
 class ErrorCode(str, Enum):
     extraction_unparsable = "EXTRACTION_UNPARSABLE"
     extraction_invalid_schema = "EXTRACTION_INVALID_SCHEMA"
@@ -32,6 +43,7 @@ class ErrorCode(str, Enum):
     employee_not_found = "EMPLOYEE_NOT_FOUND"
     employee_duplicate_name = "EMPLOYEE_DUPLICATE_NAME"
     rule_employee_ambiguous = "RULE_EMPLOYEE_AMBIGUOUS"
+    llm_overloaded = "LLM_OVERLOADED"
 
 
 class ParsedExtraction(BaseModel):
@@ -70,6 +82,7 @@ class ExtractionResult(BaseModel):
     raw_payload: dict[str, Any]
     extraction_version: str
     provider_name: str
+    parse_path: ParsePathEnum = ParsePathEnum.llm
 
 
 class ScheduleRequestIn(BaseModel):
@@ -120,6 +133,27 @@ class ScheduleRequestOut(BaseModel):
     summary: str | None = None
 
 
+class JobStatusEnum(str, Enum):
+    queued = "queued"
+    processing = "processing"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class JobAcceptedOut(BaseModel):
+    jobId: str
+    status: JobStatusEnum
+    duplicate: bool = False
+
+
+class JobStatusOut(BaseModel):
+    jobId: str
+    status: JobStatusEnum
+    attempts: int = 0
+    result: ScheduleRequestOut | None = None
+    error: dict[str, Any] | None = None
+
+
 class PreviewRequestIn(BaseModel):
     """One of text (NL) or structured payload."""
     text: str | None = Field(default=None, min_length=1, max_length=5000)
@@ -149,6 +183,44 @@ class PreviewResponse(BaseModel):
     needsInput: list[NeedsInputItem] = Field(default_factory=list)
 
 
+class BatchPreviewIn(BaseModel):
+    """
+    Requests validated together against one roster load: structured items, free-text requests
+    (parsed in batched LLM calls), or both. Results are indexed items first, then texts.
+    """
+    items: list[StructuredRequestIn] = Field(default_factory=list, max_length=200)
+    texts: list[Annotated[str, Field(min_length=1, max_length=5000)]] = Field(default_factory=list, max_length=200)
+
+    @model_validator(mode="after")
+    def require_items(self) -> "BatchPreviewIn":
+        total = len(self.items) + len(self.texts)
+        if not 1 <= total <= 200:
+            raise ValueError("Provide between 1 and 200 'items' and 'texts' in total")
+        if any(not text.strip() for text in self.texts):
+            raise ValueError("'texts' entries must not be blank")
+        return self
+
+
+class BatchConflict(BaseModel):
+    """Two or more batch items claiming the same shift slot."""
+    date: date
+    type: ShiftTypeEnum
+    items: list[int]
+
+
+class BatchPreviewItem(BaseModel):
+    index: int
+    parsed: dict[str, Any]
+    validation: RuleEngineResult
+    summary: str
+    conflictsWith: list[int] = Field(default_factory=list)
+
+
+class BatchPreviewResponse(BaseModel):
+    results: list[BatchPreviewItem]
+    conflicts: list[BatchConflict] = Field(default_factory=list)
+
+
 class PartnerPendingItem(BaseModel):
     requestId: UUID
     summary: str
@@ -173,6 +245,45 @@ class PendingApprovalItem(BaseModel):
     partner_shift_date: date | None = None
     partner_shift_type: str | None = None
     result_summary: str | None = None
+    conflictsWith: list[UUID] = Field(default_factory=list)
+
+
+class RequestConflict(BaseModel):
+    """Unresolved requests that cannot all be approved: same slot, or same employee twice on one day."""
+    kind: str
+    date: date
+    type: ShiftTypeEnum | None = None
+    employee_id: UUID | None = None
+    requestIds: list[UUID]
+    skillEligibleRequestIds: list[UUID] = Field(default_factory=list)
+
+
+class ConflictGraphNode(BaseModel):
+    requestId: UUID
+    status: str
+    requested_action: str | None = None
+    conflictsWith: list[UUID] = Field(default_factory=list)
+
+
+class ConflictGraphResponse(BaseModel):
+    requests: list[ConflictGraphNode]
+    conflicts: list[RequestConflict] = Field(default_factory=list)
+
+
+class SwapCycleStep(BaseModel):
+    requestId: UUID
+    employee_id: UUID
+    gives_shift_id: UUID
+    takes_shift_id: UUID
+
+
+class SwapCycleOut(BaseModel):
+    """Open swap requests that satisfy each other when applied as one rotation."""
+    # swap_cycle_id stored on each member once linked; linked is False while a member belongs to another rotation.
+    cycleId: UUID
+    linked: bool
+    requestIds: list[UUID]
+    steps: list[SwapCycleStep]
 
 
 class ApprovalActionOut(BaseModel):
@@ -188,6 +299,27 @@ class MetricsOut(BaseModel):
     parse_time_avg: float
     validation_time_avg: float
     approval_latency_avg: float
+    parse_path_counts: dict[str, int] = Field(default_factory=dict)
+    parse_time_avg_by_path: dict[str, float] = Field(default_factory=dict)
+
+
+class LLMMetricsOut(BaseModel):
+    cache_enabled: bool
+    cache_hits: int
+    cache_misses: int
+    cache_hit_rate: float
+    cache_entries: int
+    cache_evictions: int
+    near_duplicate_enabled: bool
+    near_duplicate_lookups: int
+    near_duplicate_hits: int
+    near_duplicate_bypass_rate: float
+    single_flight_coalesced: int
+    llm_http_pool: dict[str, Any] = Field(default_factory=dict)
+    admission: dict[str, Any] = Field(default_factory=dict)
+    failover: dict[str, Any] = Field(default_factory=dict)
+    prompt_usage: dict[str, Any] = Field(default_factory=dict)
+    json_repair: dict[str, Any] = Field(default_factory=dict)
 
 
 class HealthStatus(BaseModel):
@@ -216,6 +348,67 @@ class ShiftCandidateOut(BaseModel):
     shifts_this_week: int = 0
 
 
+class ShiftCoverageOut(BaseModel):
+    shift_id: UUID
+    date: date
+    type: ShiftTypeEnum
+    assigned_employee_id: UUID | None = None
+    eligible_count: int
+    coverage_risk: float
+    risk_rank: int
+
+
+class CoverageResponse(BaseModel):
+    from_date: date
+    to_date: date
+    employee_count: int
+    shifts: list[ShiftCoverageOut]
+
+
+class AutoFillAssignment(BaseModel):
+    shift_id: UUID
+    request_id: UUID | None = None
+    date: date
+    type: ShiftTypeEnum
+    employee_id: UUID
+    full_name: str
+    cost: float
+
+
+class AutoFillResponse(BaseModel):
+    applied: bool
+    assignments: list[AutoFillAssignment]
+    unfilled_shift_ids: list[UUID] = Field(default_factory=list)
+
+
+class RosterOptimizeIn(BaseModel):
+    from_date: date
+    to_date: date
+    apply: bool = False
+    replace_existing: bool = False
+
+
+class RosterAssignmentOut(BaseModel):
+    shift_id: UUID
+    date: date
+    type: ShiftTypeEnum
+    employee_id: UUID | None = None
+    full_name: str | None = None
+
+
+class RosterPlanResponse(BaseModel):
+    from_date: date
+    to_date: date
+    applied: bool
+    slots: int
+    filled: int
+    coverage: float
+    min_load: int
+    max_load: int
+    elapsed_ms: float
+    assignments: list[RosterAssignmentOut]
+
+
 class ShiftAssignIn(BaseModel):
     employee_id: UUID
 
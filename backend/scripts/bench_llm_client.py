@@ -0,0 +1,74 @@
+"""
+Benchmark the shared pooled LLM HTTP client against a fresh client per call.
+
+Run from project root (with the configured provider reachable) with:
+  python -m backend.scripts.bench_llm_client [--requests 200] [--concurrency 10] [--url URL]
+
+Issues GETs to the provider's health endpoint (Ollama /api/tags, or --url) both ways and
+prints latency percentiles plus the pooled client's connection stats, so handshake and
+connection-setup cost per call is visible.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from backend.llm.factory import close_llm_provider, get_llm_provider
+
+
+def _default_url() -> str:
+    provider = get_llm_provider()
+    base_url = getattr(provider, "base_url", None)
+    if base_url is None:
+        raise SystemExit("Pass --url for hosted providers (their health endpoints need credentials).")
+    return f"{base_url}/api/tags"
+
+
+async def _timed(calls: int, concurrency: int, get) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await get()
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    q = statistics.quantiles(latencies, n=100)
+    print(f"  {label:<22} p50 {q[49]:7.2f} ms   p95 {q[94]:7.2f} ms   p99 {q[98]:7.2f} ms")
+
+
+async def run(n_requests: int, concurrency: int, url: str | None) -> None:
+    url = url or _default_url()
+    provider = get_llm_provider()
+
+    async def fresh() -> httpx.Response:
+        async with httpx.AsyncClient(timeout=provider.timeout) as client:
+            return await client.get(url)
+
+    async def pooled() -> httpx.Response:
+        return await provider.http_client().get(url)
+
+    print(f"url={url} requests={n_requests} concurrency={concurrency}")
+    _report("fresh client per call", await _timed(n_requests, concurrency, fresh))
+    _report("shared pooled client", await _timed(n_requests, concurrency, pooled))
+    print(f"  pool: {provider.pool_stats()}")
+    await close_llm_provider()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--url", default=None)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency, args.url))
@@ -0,0 +1,82 @@
+"""
+Benchmark case-insensitive employee name resolution on a large roster.
+
+Run from project root (after `make migrate`, so the lower(...) indexes exist) with:
+  python -m backend.scripts.bench_name_resolution [--employees 50000] [--lookups 200]
+
+Bulk-inserts synthetic employees inside a transaction that is rolled back at the end.
+Times find_employees_by_name (indexed lower() equality) against the legacy ilike
+lookup and prints the query plan for each so index use is visible.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db import SessionLocal
+from backend.models import Employee
+from backend.services.employee_names import find_employees_by_name, name_match_clause
+
+
+async def _legacy_lookup(session: AsyncSession, first: str, last: str) -> list[Employee]:
+    stmt = select(Employee).where(Employee.first_name.ilike(first), Employee.last_name.ilike(last))
+    return list((await session.execute(stmt)).scalars().all())
+
+
+async def _explain(session: AsyncSession, stmt) -> str:
+    compiled = stmt.compile(dialect=session.bind.dialect, compile_kwargs={"literal_binds": True})
+    rows = await session.execute(text(f"EXPLAIN {compiled}"))
+    return "\n    ".join(r[0] for r in rows)
+
+
+async def run(n_employees: int, n_lookups: int) -> None:
+    rng = random.Random(42)
+    names = [(f"First{i}", f"Last{uuid.uuid4().hex[:10]}") for i in range(n_employees)]
+    async with SessionLocal() as session:
+        batch = 5000
+        for start in range(0, n_employees, batch):
+            await session.execute(
+                insert(Employee),
+                [
+                    {"id": uuid.uuid4(), "first_name": f, "last_name": last, "certifications": {}, "skills": {}, "availability": {}}
+                    for f, last in names[start : start + batch]
+                ],
+            )
+        await session.execute(text("ANALYZE employees"))
+        probes = [(f.upper(), last.lower()) for f, last in rng.sample(names, n_lookups)]
+
+        started = time.perf_counter()
+        for first, last in probes:
+            assert len(await find_employees_by_name(session, first, last)) == 1
+        indexed_ms = (time.perf_counter() - started) * 1000 / n_lookups
+
+        started = time.perf_counter()
+        for first, last in probes:
+            assert len(await _legacy_lookup(session, first, last)) == 1
+        legacy_ms = (time.perf_counter() - started) * 1000 / n_lookups
+
+        first, last = probes[0]
+        print(f"employees={n_employees} lookups={n_lookups}")
+        print(f"  indexed lower() equality: {indexed_ms:7.2f} ms/lookup")
+        print("    " + await _explain(session, select(Employee).where(name_match_clause(first, last))))
+        print(f"  legacy ilike:             {legacy_ms:7.2f} ms/lookup")
+        print(
+            "    "
+            + await _explain(
+                session, select(Employee).where(Employee.first_name.ilike(first), Employee.last_name.ilike(last))
+            )
+        )
+        await session.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.employees, args.lookups))
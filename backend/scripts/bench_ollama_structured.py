@@ -0,0 +1,79 @@
+"""
+Compare Ollama extraction with and without schema-constrained decoding.
+
+Run from project root (with OLLAMA_BASE_URL reachable and the model pulled) with:
+  python -m backend.scripts.bench_ollama_structured [--rounds 5] [--concurrency 2]
+
+Parses a fixed set of request phrasings `--rounds` times in free-form mode (prompted JSON
+cleaned up by llm/repair.py, no token cap) and in structured mode (`format` = ParsedExtraction
+schema, OLLAMA_NUM_PREDICT cap), then prints parse-failure rate, tokens generated per call and latency
+percentiles for each.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+
+from backend.errors import AppError
+from backend.llm.ollama_provider import OllamaProvider
+
+SAMPLE_TEXTS = [
+    "Can someone cover my shift tomorrow? I have a doctor's appointment.",
+    "I'd like to move from the morning shift on {d3} to the night shift on {d5}.",
+    "Swap my night shift on {d2} with Priya Patel's morning shift on {d4}",
+    "please switch me to mornings next monday, childcare issue",
+    "Need cover for {d6} night, family emergency - Tom",
+    "move me off nights on {d7} to the morning one on {d8} thanks!!",
+    "Is it possible to swap my {d3} morning with Jordan Lee's {d3} night?",
+    "I can't make my shift tomorrow morning, can anyone take it",
+]
+
+
+async def _run_mode(structured: bool, texts: list[str], today: date, concurrency: int) -> None:
+    provider = OllamaProvider()
+    provider.structured_output = structured
+    if not structured:
+        provider.num_predict = -1  # Ollama: no limit
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures: dict[str, int] = {}
+
+    async def one(text: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await provider.parse(text, requester_context="The requester is Alex Kim.", reference_date=today)
+            except AppError as exc:
+                failures[exc.error_code.value] = failures.get(exc.error_code.value, 0) + 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one(text) for text in texts))
+    usage = provider.usage_stats()
+    q = statistics.quantiles(latencies, n=100)
+    label = "structured (format)" if structured else "free-form"
+    print(
+        f"  {label:<20} failures {sum(failures.values()):3d}/{len(texts)} ({sum(failures.values()) / len(texts):6.1%})"
+        f"   output tokens avg {usage['output_tokens_avg']}   p50 {q[49]:8.1f} ms   p95 {q[94]:8.1f} ms"
+    )
+    if failures:
+        print(f"  {'':<20} {failures}")
+    await provider.aclose()
+
+
+async def run(rounds: int, concurrency: int) -> None:
+    today = date.today()
+    days = {f"d{n}": (today + timedelta(days=n)).isoformat() for n in range(1, 9)}
+    texts = [text.format(**days) for text in SAMPLE_TEXTS] * rounds
+    print(f"texts={len(texts)} concurrency={concurrency}")
+    await _run_mode(False, texts, today, concurrency)
+    await _run_mode(True, texts, today, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(run(args.rounds, args.concurrency))
@@ -27,6 +27,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db import SessionLocal, init_db
 from backend.models import Employee, EmployeeRole, Shift, ShiftType
+from backend.services.workload import rebuild_workload
 
 
 # --- Seed data: normal + edge cases ---
@@ -149,6 +150,8 @@ async def seed(session: AsyncSession) -> None:
     async with SessionLocal() as session3:
         for row in get_shifts(employee_by_name):
             session3.add(Shift(**row))
+        await session3.flush()
+        await rebuild_workload(session3)
         await session3.commit()
 
     print("Seed complete: employees and shifts created/updated.")
@@ -0,0 +1,203 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import date
+from enum import IntEnum
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from backend.config import get_settings
+from backend.db import redis_client
+from backend.deadline import remaining
+from backend.errors import AppError
+from backend.schemas import ErrorCode
+from backend.services.rule_parser import mentioned_dates
+from backend.time_utils import is_urgent_shift_date, org_now
+
+HOLDERS_KEY = "llm:admission:holders"
+POLL_SECONDS = 0.1
+
+# Holders are scored by lease expiry (Redis server time, ms): a crashed replica's slots free themselves.
+_ACQUIRE = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+  redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+  return 1
+end
+return 0
+"""
+
+
+class Priority(IntEnum):
+    """Lower values are admitted first."""
+
+    urgent = 0
+    submit = 1
+    preview = 2
+
+
+def request_priority(text: str, today: date, submit: bool) -> Priority:
+    """
+    Urgent when the text names a shift date inside the 48h window used for `urgent` in request
+    lists (checked before parsing, from its date phrases); otherwise submits outrank previews.
+    """
+    now = org_now()
+    if any(is_urgent_shift_date(d, now) for d in mentioned_dates(text, today)):
+        return Priority.urgent
+    return Priority.submit if submit else Priority.preview
+
+
+class AdmissionController:
+    """
+    Bound concurrent provider calls per process and across replicas.
+
+    A caller first takes one of LLM_ADMISSION_LOCAL_LIMIT in-process slots, waiting in a
+    priority queue of at most LLM_ADMISSION_MAX_QUEUE callers, then one of
+    LLM_ADMISSION_CLUSTER_LIMIT slots in a Redis sorted-set semaphore. Previews may not take the
+    last LLM_ADMISSION_PRIORITY_RESERVE slots of either, so urgent requests and submits still
+    get in during a preview burst. A full queue sheds the caller (429, or the lowest-priority
+    waiter when the caller outranks it); waiting past LLM_ADMISSION_MAX_WAIT_SECONDS fails
+    with 503. Both carry Retry-After. Redis failures degrade to the per-process limit.
+    """
+
+    def __init__(self, redis: Redis | None = None, local_limit: int | None = None, cluster_limit: int | None = None) -> None:
+        settings = get_settings()
+        self.redis = redis or redis_client
+        self.local_limit = settings.llm_admission_local_limit if local_limit is None else local_limit
+        self.cluster_limit = settings.llm_admission_cluster_limit if cluster_limit is None else cluster_limit
+        self.max_queue = settings.llm_admission_max_queue
+        self.max_wait = settings.llm_admission_max_wait_seconds
+        self.reserve = settings.llm_admission_priority_reserve
+        # A slot outlives its call only if the process dies; lease covers every retry of the slowest provider.
+        slowest = max(settings.llm_parse_timeout_seconds, settings.llm_hosted_timeout_seconds)
+        self.lease_ms = int((slowest * (settings.llm_max_retries + 1) + 5) * 1000)
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._avg_hold_seconds = 2.0
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+
+    def _capacity(self, limit: int, priority: Priority) -> int:
+        return max(1, limit - self.reserve) if priority is Priority.preview else limit
+
+    def retry_after(self) -> int:
+        """Seconds until the queue ahead should have drained, from the recent average call time."""
+        backlog = (len(self._waiters) + 1) / max(1, self.local_limit)
+        return max(1, min(60, math.ceil(self._avg_hold_seconds * backlog)))
+
+    def _overloaded(self, status_code: int, developer_message: str) -> AppError:
+        if status_code == 429:
+            self.shed += 1
+        else:
+            self.timed_out += 1
+        return AppError(
+            ErrorCode.llm_overloaded,
+            "The assistant is busy right now. Please retry in a few seconds.",
+            developer_message,
+            status_code,
+            headers={"Retry-After": str(self.retry_after())},
+        )
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority) -> AsyncIterator[None]:
+        # Never queue past the request's own deadline.
+        left = remaining()
+        deadline = time.monotonic() + (self.max_wait if left is None else max(0.0, min(self.max_wait, left)))
+        await self._acquire_local(priority, deadline)
+        token = uuid.uuid4().hex
+        held_cluster = False
+        try:
+            held_cluster = await self._acquire_cluster(token, priority, deadline)
+            self.admitted += 1
+            started = time.monotonic()
+            yield
+            self._avg_hold_seconds = 0.8 * self._avg_hold_seconds + 0.2 * (time.monotonic() - started)
+        finally:
+            if held_cluster:
+                try:
+                    await self.redis.zrem(HOLDERS_KEY, token)
+                except RedisError:
+                    pass
+            self._release_local()
+
+    async def _acquire_local(self, priority: Priority, deadline: float) -> None:
+        outranks_queue = not self._waiters or priority < self._waiters[0][0]
+        if outranks_queue and self._active < self._capacity(self.local_limit, priority):
+            self._active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            worst = max(self._waiters)
+            if worst[0] <= priority:
+                raise self._overloaded(429, f"LLM admission queue full ({self.max_queue} waiting).")
+            self._waiters.remove(worst)
+            heapq.heapify(self._waiters)
+            worst[2].set_exception(
+                self._overloaded(429, "Shed from the LLM admission queue by a higher-priority request.")
+            )
+        future = asyncio.get_running_loop().create_future()
+        entry = (int(priority), next(self._seq), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await asyncio.wait_for(future, timeout=max(0.0, deadline - time.monotonic()))
+        except (TimeoutError, asyncio.CancelledError) as exc:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Granted just as the wait ended: hand the slot on.
+                self._release_local()
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            if isinstance(exc, TimeoutError):
+                raise self._overloaded(503, f"No local LLM slot within {self.max_wait:.0f}s or the request deadline.") from exc
+            raise
+
+    def _release_local(self) -> None:
+        self._active -= 1
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._active >= self._capacity(self.local_limit, Priority(priority)):
+                return
+            heapq.heappop(self._waiters)
+            self._active += 1
+            future.set_result(None)
+
+    async def _acquire_cluster(self, token: str, priority: Priority, deadline: float) -> bool:
+        if self.cluster_limit <= 0:
+            return False
+        capacity = self._capacity(self.cluster_limit, priority)
+        while True:
+            try:
+                if await self.redis.eval(_ACQUIRE, 1, HOLDERS_KEY, capacity, self.lease_ms, token):
+                    return True
+            except RedisError:
+                return False
+            if time.monotonic() >= deadline:
+                raise self._overloaded(503, f"No cluster LLM slot within {self.max_wait:.0f}s or the request deadline.")
+            await asyncio.sleep(POLL_SECONDS)
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "active": self._active,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+            "local_limit": self.local_limit,
+            "cluster_limit": self.cluster_limit,
+            "avg_call_seconds": round(self._avg_hold_seconds, 3),
+        }
+
+
+llm_admission = AdmissionController()
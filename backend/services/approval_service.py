@@ -1,4 +1,4 @@
-from datetime import UTC, date, datetime, timedelta
+from datetime import UTC, date, datetime
 from uuid import UUID
 
 from sqlalchemy import and_, select, update
@@ -8,29 +8,24 @@ from backend.db import redis_client
 from backend.errors import AppError
 from backend.models import AuditLog, Employee, EmployeeRole, RequestMetrics, RequestStatus, ScheduleRequest, Shift, ShiftType
 from backend.schemas import ApprovalActionOut, ErrorCode, PendingApprovalItem
-from backend.time_utils import org_now, org_tz
+from backend.services.employee_names import find_employees_by_name
+from backend.services.simulation_service import SimulationService
+from backend.services.workload import record_assignment_change, record_assignment_changes
+from backend.time_utils import is_urgent_shift_date
 
 
 async def _resolve_employee_from_extraction(
     session: AsyncSession, extraction: dict, first_key: str, last_key: str
 ) -> Employee | None:
     """Resolve single employee by first/last from extraction dict. Returns None if 0 or 2+ matches."""
-    first = (extraction.get(first_key) or "").strip() or None
-    last = (extraction.get(last_key) or "").strip() or None
-    if not first and not last:
-        return None
-    if first and last:
-        stmt = select(Employee).where(Employee.first_name == first, Employee.last_name == last)
-    elif first:
-        stmt = select(Employee).where(Employee.first_name == first)
-    else:
-        stmt = select(Employee).where(Employee.last_name == last)
-    result = await session.execute(stmt)
-    employees = list(result.scalars().all())
+    employees = await find_employees_by_name(session, extraction.get(first_key), extraction.get(last_key))
     return employees[0] if len(employees) == 1 else None
 
 
 class ApprovalService:
+    def __init__(self) -> None:
+        self.simulation_service = SimulationService()
+
     async def list_pending(self, session: AsyncSession, current_user: Employee) -> list[PendingApprovalItem]:
         stmt = select(ScheduleRequest).where(
             ScheduleRequest.status.in_([RequestStatus.pending, RequestStatus.pending_admin])
@@ -77,8 +72,7 @@ class ApprovalService:
                 if sh:
                     shift_date_val = sh.date
             if shift_date_val is not None:
-                shift_start = datetime.combine(shift_date_val, datetime.min.time(), tzinfo=org_tz())
-                urgent = shift_start <= org_now() + timedelta(hours=48)
+                urgent = is_urgent_shift_date(shift_date_val)
             items.append(
                 PendingApprovalItem(
                     requestId=request.id,
@@ -95,6 +89,11 @@ class ApprovalService:
                     urgent=urgent,
                 )
             )
+        if current_user.role == EmployeeRole.admin and items:
+            graph = await self.simulation_service.conflict_graph(session)
+            conflicts_by_request = {node.requestId: node.conflictsWith for node in graph.requests}
+            for item in items:
+                item.conflictsWith = conflicts_by_request.get(item.requestId, [])
         items.sort(key=lambda x: (not x.urgent, x.submittedAt))
         return items
 
@@ -156,6 +155,13 @@ class ApprovalService:
                     "Shift not found for swap",
                     409,
                 )
+            await record_assignment_changes(
+                session,
+                [
+                    (shift_requester.date, shift_requester.type, shift_requester.assigned_employee_id, partner.id),
+                    (shift_partner.date, shift_partner.type, shift_partner.assigned_employee_id, employee.id),
+                ],
+            )
             shift_requester.assigned_employee_id = partner.id
             shift_partner.assigned_employee_id = employee.id
         else:
@@ -169,6 +175,9 @@ class ApprovalService:
                     )
                 )
             )
+            await record_assignment_change(
+                session, target_date, target_shift_type, shift.assigned_employee_id if shift else None, employee.id
+            )
             if shift:
                 shift.assigned_employee_id = employee.id
             else:
@@ -0,0 +1,395 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import date, timedelta
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import AuditLog, Employee, RequestStatus, ScheduleRequest, Shift
+from backend.schemas import (
+    AutoFillAssignment,
+    AutoFillResponse,
+    CoverageResponse,
+    ShiftCoverageOut,
+    ShiftTypeEnum,
+)
+from backend.services.extraction_service import SCHEDULE_WINDOW_DAYS
+from backend.services.rule_engine import RuleEngine
+from backend.services.workload import record_assignment_changes
+from backend.time_utils import org_today
+
+
+def encode_skill_masks(skill_lists: list[list[str]], vocabulary: dict[str, int]) -> np.ndarray:
+    """Pack each skill list into uint64 bitmask words (one row per list); unknown skills are dropped."""
+    words = max(1, (len(vocabulary) + 63) // 64)
+    masks = np.zeros((len(skill_lists), words), dtype=np.uint64)
+    for row, skills in enumerate(skill_lists):
+        for skill in skills:
+            bit = vocabulary.get(skill)
+            if bit is not None:
+                masks[row, bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+    return masks
+
+
+def compute_eligibility(
+    employee_masks: np.ndarray,
+    cert_ok: np.ndarray,
+    shift_masks: np.ndarray,
+    slot_taken: np.ndarray,
+    holds_slot: np.ndarray,
+) -> np.ndarray:
+    """
+    Employee x shift eligibility in one vectorized pass.
+
+    Mirrors RuleEngine.get_eligible_candidates_for_shift: required skills are a subset of the
+    employee's, certifications are valid, and the slot is held by someone other than the employee.
+    """
+    missing = shift_masks[np.newaxis, :, :] & ~employee_masks[:, np.newaxis, :]
+    skills_ok = ~missing.any(axis=2)
+    return skills_ok & cert_ok[:, np.newaxis] & slot_taken[np.newaxis, :] & ~holds_slot
+
+
+# Auto-fill cost weights: fewer shifts this week first, spread nights, keep specialists free,
+# and honour stated shift-type preferences.
+WEIGHT_WEEKLY = 1.0
+WEIGHT_NIGHT = 0.5
+WEIGHT_SURPLUS_SKILL = 0.25
+WEIGHT_PREFERRED = -0.5
+_INFEASIBLE = 1e9
+_RULES = RuleEngine()
+
+
+def min_cost_assignment(cost: np.ndarray) -> list[tuple[int, int]]:
+    """
+    Hungarian algorithm (shortest augmenting path, O(n^2 m)) for a rectangular cost matrix.
+
+    Returns (row, col) pairs covering min(rows, cols) entries; callers drop pairs whose cost
+    marks them infeasible.
+    """
+    n, m = cost.shape
+    if n == 0 or m == 0:
+        return []
+    transposed = n > m
+    if transposed:
+        cost = cost.T
+        n, m = m, n
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.int64)  # match[j] = 1-based row assigned to column j, 0 = free
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            u[match[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    pairs = [(int(match[j]) - 1, j - 1) for j in range(1, m + 1) if match[j]]
+    return [(c, r) for r, c in pairs] if transposed else pairs
+
+
+@dataclass(frozen=True)
+class OpenShift:
+    shift_id: UUID
+    request_id: UUID | None
+    date: date
+    type: ShiftTypeEnum
+    required_skills: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class PoolEmployee:
+    employee_id: UUID
+    skills: tuple[str, ...]
+    cert_ok: bool
+    unavailable_dates: frozenset[date]
+    preferred_types: frozenset[str]
+
+
+def pool_employee(employee: Employee) -> PoolEmployee:
+    """Plain snapshot of an Employee for the CPU-bound planners (safe to hand to a worker thread)."""
+    availability = employee.availability or {}
+    return PoolEmployee(
+        employee_id=employee.id,
+        skills=tuple((employee.skills or {}).get("skills", [])),
+        cert_ok=_RULES.validate_certifications(employee.certifications or {}),
+        unavailable_dates=frozenset(date.fromisoformat(str(d)) for d in availability.get("unavailable_dates", [])),
+        preferred_types=frozenset(availability.get("preferred_shift_types", [])),
+    )
+
+
+def plan_auto_fill(
+    open_shifts: list[OpenShift],
+    pool: list[PoolEmployee],
+    roster: list[tuple[date, ShiftTypeEnum, UUID]],
+) -> list[tuple[int, int, float]]:
+    """
+    Assign open coverage shifts to employees; returns (shift index, employee index, cost).
+
+    Each date is one min-cost bipartite matching (an employee takes at most one shift a day),
+    solved in date order so weekly and night counts include earlier picks. Eligibility matches
+    list_candidates (skills, certifications, not already in the slot) plus the availability
+    hard exclusion and not already working that day. CPU-bound: call via asyncio.to_thread.
+    """
+    if not open_shifts or not pool:
+        return []
+    vocabulary: dict[str, int] = {}
+    for s in open_shifts:
+        for skill in s.required_skills:
+            vocabulary.setdefault(skill, len(vocabulary))
+    employee_masks = encode_skill_masks([list(e.skills) for e in pool], vocabulary)
+    shift_masks = encode_skill_masks([list(s.required_skills) for s in open_shifts], vocabulary)
+    cert_ok = np.array([e.cert_ok for e in pool], dtype=bool)
+    skill_counts = np.array([len(set(e.skills)) for e in pool], dtype=float)
+    index = {e.employee_id: k for k, e in enumerate(pool)}
+
+    weekly: dict[date, np.ndarray] = {}
+    nights: dict[date, np.ndarray] = {}
+    busy: dict[date, np.ndarray] = {}
+
+    def week_of(d: date) -> date:
+        return d - timedelta(days=d.weekday())
+
+    def counters(d: date) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        week = week_of(d)
+        if week not in weekly:
+            weekly[week] = np.zeros(len(pool))
+            nights[week] = np.zeros(len(pool))
+        if d not in busy:
+            busy[d] = np.zeros(len(pool), dtype=bool)
+        return weekly[week], nights[week], busy[d]
+
+    def record(d: date, shift_type: ShiftTypeEnum, k: int) -> None:
+        week_counts, night_counts, busy_today = counters(d)
+        week_counts[k] += 1
+        if shift_type == ShiftTypeEnum.night:
+            night_counts[k] += 1
+        busy_today[k] = True
+
+    for d, shift_type, employee_id in roster:
+        if employee_id in index:
+            record(d, shift_type, index[employee_id])
+
+    by_date: dict[date, list[int]] = {}
+    for i, s in enumerate(open_shifts):
+        by_date.setdefault(s.date, []).append(i)
+
+    plan: list[tuple[int, int, float]] = []
+    for d in sorted(by_date):
+        rows = by_date[d]
+        week_counts, night_counts, busy_today = counters(d)
+        available = np.array([d not in e.unavailable_dates for e in pool], dtype=bool)
+        missing = shift_masks[rows][:, np.newaxis, :] & ~employee_masks[np.newaxis, :, :]
+        eligible = ~missing.any(axis=2) & (cert_ok & available & ~busy_today)[np.newaxis, :]
+
+        cost = np.tile(WEIGHT_WEEKLY * week_counts, (len(rows), 1))
+        for r, i in enumerate(rows):
+            s = open_shifts[i]
+            if s.type == ShiftTypeEnum.night:
+                cost[r] += WEIGHT_NIGHT * night_counts
+            cost[r] += WEIGHT_SURPLUS_SKILL * np.maximum(skill_counts - len(set(s.required_skills)), 0)
+            cost[r] += WEIGHT_PREFERRED * np.array([s.type.value in e.preferred_types for e in pool])
+        cost = np.where(eligible, cost, _INFEASIBLE)
+
+        for r, k in min_cost_assignment(cost):
+            if cost[r, k] >= _INFEASIBLE:
+                continue
+            i = rows[r]
+            plan.append((i, k, float(cost[r, k])))
+            record(d, open_shifts[i].type, k)
+    return plan
+
+
+class CoverageService:
+    def __init__(self) -> None:
+        self.rule_engine = RuleEngine()
+
+    async def eligibility_overview(
+        self,
+        session: AsyncSession,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> CoverageResponse:
+        """Per-shift eligible counts for a date range, ranked by coverage risk (fewest eligible first)."""
+        from_date = from_date or org_today()
+        to_date = to_date or from_date + timedelta(days=SCHEDULE_WINDOW_DAYS)
+
+        emp_rows = (
+            await session.execute(select(Employee.id, Employee.skills, Employee.certifications))
+        ).all()
+        shifts = list(
+            (
+                await session.execute(
+                    select(Shift)
+                    .where(and_(Shift.date >= from_date, Shift.date <= to_date))
+                    .order_by(Shift.date, Shift.type)
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+        shift_skills = [list((s.required_skills or {}).get("skills", [])) for s in shifts]
+        vocabulary: dict[str, int] = {}
+        for skills in shift_skills:
+            for skill in skills:
+                vocabulary.setdefault(skill, len(vocabulary))
+        employee_masks = encode_skill_masks(
+            [list((skills or {}).get("skills", [])) for _, skills, _ in emp_rows], vocabulary
+        )
+        shift_masks = encode_skill_masks(shift_skills, vocabulary)
+        cert_ok = np.fromiter(
+            (self.rule_engine.validate_certifications(certs or {}) for _, _, certs in emp_rows),
+            dtype=bool,
+            count=len(emp_rows),
+        )
+
+        employee_index = {emp_id: i for i, (emp_id, _, _) in enumerate(emp_rows)}
+        holders_by_slot: dict[tuple, set[int]] = {}
+        for s in shifts:
+            if s.assigned_employee_id in employee_index:
+                holders_by_slot.setdefault((s.date, s.type), set()).add(employee_index[s.assigned_employee_id])
+        slot_taken = np.fromiter(
+            ((s.date, s.type) in holders_by_slot for s in shifts), dtype=bool, count=len(shifts)
+        )
+        holds_slot = np.zeros((len(emp_rows), len(shifts)), dtype=bool)
+        for col, s in enumerate(shifts):
+            rows = list(holders_by_slot.get((s.date, s.type), ()))
+            holds_slot[rows, col] = True
+
+        eligible = compute_eligibility(employee_masks, cert_ok, shift_masks, slot_taken, holds_slot)
+        counts = eligible.sum(axis=0) if len(emp_rows) else np.zeros(len(shifts), dtype=int)
+
+        ranked = sorted(range(len(shifts)), key=lambda k: (int(counts[k]), shifts[k].date))
+        items = [
+            ShiftCoverageOut(
+                shift_id=shifts[k].id,
+                date=shifts[k].date,
+                type=ShiftTypeEnum(shifts[k].type.value),
+                assigned_employee_id=shifts[k].assigned_employee_id,
+                eligible_count=int(counts[k]),
+                coverage_risk=round(1.0 / (1 + int(counts[k])), 4),
+                risk_rank=rank,
+            )
+            for rank, k in enumerate(ranked, start=1)
+        ]
+        return CoverageResponse(
+            from_date=from_date,
+            to_date=to_date,
+            employee_count=len(emp_rows),
+            shifts=items,
+        )
+
+    async def auto_fill(self, session: AsyncSession, apply: bool = False) -> AutoFillResponse:
+        """
+        Match every pending_fill coverage shift to an employee at minimum total cost.
+
+        Loads open requests, the employee pool and the surrounding weeks' roster in three queries,
+        solves in a worker thread, and (when apply is set) writes all assignments in one commit.
+        """
+        open_rows = (
+            await session.execute(
+                select(ScheduleRequest, Shift)
+                .join(Shift, Shift.id == ScheduleRequest.coverage_shift_id)
+                .where(ScheduleRequest.status == RequestStatus.pending_fill)
+                .order_by(Shift.date, Shift.type, ScheduleRequest.created_at)
+            )
+        ).all()
+        open_shifts: list[OpenShift] = []
+        requests_by_shift: dict[UUID, ScheduleRequest] = {}
+        for request, shift in open_rows:
+            if shift.id in requests_by_shift:
+                continue
+            requests_by_shift[shift.id] = request
+            open_shifts.append(
+                OpenShift(
+                    shift_id=shift.id,
+                    request_id=request.id,
+                    date=shift.date,
+                    type=ShiftTypeEnum(shift.type.value),
+                    required_skills=tuple((shift.required_skills or {}).get("skills", [])),
+                )
+            )
+        if not open_shifts:
+            return AutoFillResponse(applied=apply, assignments=[], unfilled_shift_ids=[])
+
+        employees = list((await session.execute(select(Employee))).scalars().all())
+        pool = [pool_employee(e) for e in employees]
+        first = min(s.date for s in open_shifts)
+        last = max(s.date for s in open_shifts)
+        roster = [
+            (d, ShiftTypeEnum(t.value), emp_id)
+            for d, t, emp_id in (
+                await session.execute(
+                    select(Shift.date, Shift.type, Shift.assigned_employee_id).where(
+                        Shift.date >= first - timedelta(days=first.weekday()),
+                        Shift.date <= last + timedelta(days=6 - last.weekday()),
+                        Shift.assigned_employee_id.is_not(None),
+                    )
+                )
+            ).all()
+        ]
+
+        plan = await asyncio.to_thread(plan_auto_fill, open_shifts, pool, roster)
+
+        assignments = [
+            AutoFillAssignment(
+                shift_id=open_shifts[i].shift_id,
+                request_id=open_shifts[i].request_id,
+                date=open_shifts[i].date,
+                type=open_shifts[i].type,
+                employee_id=employees[k].id,
+                full_name=employees[k].full_name,
+                cost=round(cost, 4),
+            )
+            for i, k, cost in plan
+        ]
+        filled = {a.shift_id for a in assignments}
+        unfilled = [s.shift_id for s in open_shifts if s.shift_id not in filled]
+
+        if apply and assignments:
+            shifts = {shift.id: shift for _, shift in open_rows}
+            await record_assignment_changes(
+                session,
+                [
+                    (a.date, shifts[a.shift_id].type, shifts[a.shift_id].assigned_employee_id, a.employee_id)
+                    for a in assignments
+                ],
+            )
+            for a in assignments:
+                shifts[a.shift_id].assigned_employee_id = a.employee_id
+                requests_by_shift[a.shift_id].status = RequestStatus.approved
+            session.add(
+                AuditLog(
+                    action="coverage.auto_fill.applied",
+                    meta={
+                        "assignments": [
+                            {"shift_id": str(a.shift_id), "employee_id": str(a.employee_id)} for a in assignments
+                        ],
+                        "unfilled": [str(s) for s in unfilled],
+                    },
+                )
+            )
+            await session.commit()
+        return AutoFillResponse(applied=apply and bool(assignments), assignments=assignments, unfilled_shift_ids=unfilled)
@@ -0,0 +1,61 @@
+"""
+Case-insensitive employee name resolution.
+
+Matches on lower(first_name) / lower(last_name) so lookups use the functional indexes
+(ix_employees_lower_first_name / ix_employees_lower_last_name) instead of scanning employees.
+"""
+
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Employee
+
+
+def _clean(value: str | None) -> str | None:
+    return (value or "").strip() or None
+
+
+def name_match_clause(first_name: str | None, last_name: str | None) -> ColumnElement[bool] | None:
+    """WHERE clause for first only, last only, or both; None when neither is given."""
+    first = _clean(first_name)
+    last = _clean(last_name)
+    if first and last:
+        return and_(
+            func.lower(Employee.first_name) == first.lower(),
+            func.lower(Employee.last_name) == last.lower(),
+        )
+    if first:
+        return func.lower(Employee.first_name) == first.lower()
+    if last:
+        return func.lower(Employee.last_name) == last.lower()
+    return None
+
+
+def matches_name(employee: Employee, first_name: str | None, last_name: str | None) -> bool:
+    """In-memory twin of name_match_clause for already-loaded employees."""
+    first = _clean(first_name)
+    last = _clean(last_name)
+    if not first and not last:
+        return False
+    return (first is None or (employee.first_name or "").lower() == first.lower()) and (
+        last is None or (employee.last_name or "").lower() == last.lower()
+    )
+
+
+async def find_employees_by_name(
+    session: AsyncSession,
+    first_name: str | None,
+    last_name: str | None,
+    exclude_id: UUID | None = None,
+) -> list[Employee]:
+    """Resolve by first only, last only, or both. Case-insensitive. Returns 0, 1, or many."""
+    clause = name_match_clause(first_name, last_name)
+    if clause is None:
+        return []
+    stmt = select(Employee).where(clause)
+    if exclude_id is not None:
+        stmt = stmt.where(Employee.id != exclude_id)
+    result = await session.execute(stmt)
+    return list(result.scalars().all())
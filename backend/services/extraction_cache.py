@@ -0,0 +1,111 @@
+import hashlib
+import json
+import time
+from datetime import date
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from backend.config import get_settings
+from backend.db import redis_client
+from backend.schemas import ParsedExtraction
+
+KEY_PREFIX = "extract:v1:"
+INDEX_KEY = "extract:v1:index"
+STATS_KEY = "extract:v1:stats"
+
+
+def normalize_text(text: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing sentence punctuation: the variation the LLM ignores anyway."""
+    return " ".join(text.casefold().split()).rstrip(".!? ")
+
+
+def cache_key(text: str, requester_context: str, reference_date: date, extraction_version: str) -> str:
+    """
+    Relative phrases ("tomorrow") resolve against reference_date, and the requester context decides
+    who "my shift" is, so both are part of the key; a new extraction_version never sees old entries.
+    """
+    material = json.dumps(
+        [extraction_version, reference_date.isoformat(), requester_context, normalize_text(text)],
+        ensure_ascii=False,
+    )
+    return KEY_PREFIX + hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Redis cache of provider parse results with TTL and LRU eviction past max_entries.
+
+    A sorted set (member = key, score = last use) tracks recency; once it grows past max_entries
+    the oldest keys are removed. Hit/miss/eviction counters live in a Redis hash so every worker
+    reports the same totals. Redis failures degrade to a miss, never to a failed request.
+    """
+
+    def __init__(self, redis: Redis | None = None) -> None:
+        settings = get_settings()
+        self.redis = redis or redis_client
+        self.ttl_seconds = settings.extraction_cache_ttl_seconds
+        self.max_entries = settings.extraction_cache_max_entries
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    async def get(self, key: str) -> ParsedExtraction | None:
+        if not self.enabled:
+            return None
+        try:
+            raw = await self.redis.get(key)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hincrby(STATS_KEY, "hits" if raw is not None else "misses", 1)
+                if raw is not None:
+                    pipe.zadd(INDEX_KEY, {key: time.time()})
+                await pipe.execute()
+        except RedisError:
+            return None
+        if raw is None:
+            return None
+        try:
+            return ParsedExtraction.model_validate_json(raw)
+        except ValueError:
+            return None
+
+    async def set(self, key: str, parsed: ParsedExtraction) -> None:
+        if not self.enabled:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.set(key, parsed.model_dump_json(), ex=self.ttl_seconds)
+                pipe.zadd(INDEX_KEY, {key: time.time()})
+                pipe.zcard(INDEX_KEY)
+                *_, size = await pipe.execute()
+            if size > self.max_entries:
+                await self._evict(size - self.max_entries)
+        except RedisError:
+            return
+
+    async def _evict(self, count: int) -> None:
+        # Expired keys linger in the index until they reach the old end; deleting them is a no-op.
+        oldest = [member for member, _ in await self.redis.zpopmin(INDEX_KEY, count)]
+        if oldest:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.delete(*oldest)
+                pipe.hincrby(STATS_KEY, "evictions", len(oldest))
+                await pipe.execute()
+
+    async def stats(self) -> dict:
+        try:
+            counters = await self.redis.hgetall(STATS_KEY)
+            entries = await self.redis.zcard(INDEX_KEY)
+        except RedisError:
+            counters, entries = {}, 0
+        hits = int(counters.get("hits", 0))
+        misses = int(counters.get("misses", 0))
+        return {
+            "cache_enabled": self.enabled,
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "cache_hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "cache_entries": int(entries),
+            "cache_evictions": int(counters.get("evictions", 0)),
+        }
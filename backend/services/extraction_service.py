@@ -1,9 +1,11 @@
+from collections.abc import Awaitable, Callable
 from datetime import date, timedelta
 from typing import Any
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.config import get_settings
 from backend.errors import AppError
 from backend.llm.factory import get_llm_provider
 from backend.models import Employee, ExtractionVersion, Shift
@@ -12,15 +14,24 @@ from backend.schemas import (
     ExtractionResult,
     NeedsInputItem,
     ParsedExtraction,
+    ParsePathEnum,
     RequestedActionEnum,
     ShiftTypeEnum,
     ValidatedExtraction,
 )
+from backend.services.admission import llm_admission, request_priority
+from backend.services.extraction_cache import ExtractionCache, cache_key
+from backend.services.near_duplicate import near_duplicate_index
+from backend.services.rule_parser import parse_deterministic
+from backend.services.single_flight import parse_single_flight
 from backend.time_utils import org_today
 
 
 SCHEDULE_WINDOW_DAYS = 30
 
+# (event, data) progress hook for streaming previews.
+ProgressCallback = Callable[[str, dict[str, Any]], Awaitable[None]]
+
 
 def _next_occurrence(today: date) -> date:
     return today + timedelta(days=1)
@@ -44,17 +55,87 @@ def _normalize_parsed_dates(parsed: ParsedExtraction, today: date) -> None:
 class ExtractionService:
     def __init__(self) -> None:
         self.provider = get_llm_provider()
+        self.cache = ExtractionCache()
+        self.near_duplicates = near_duplicate_index
+        self.single_flight = parse_single_flight
+        self.admission = llm_admission
+        self.fast_path_enabled = get_settings().fast_path_parser_enabled
 
     def _build_requester_context(self, current_user: Employee) -> str:
         # Never include stable identifiers (UUIDs) in LLM context.
         # For hosted providers, minimize even further.
-        if self.provider.provider_name == "hosted":
+        if self.provider.is_hosted:
             return "Interpret 'my shift', 'I', and 'me' as the requester."
         return (
             f"The requester is {current_user.full_name}. "
             "Interpret 'my shift', 'I', and 'me' as this person."
         )
 
+    async def _parse_without_provider(
+        self,
+        text: str,
+        current_user: Employee,
+        requester_context: str,
+        today: date,
+    ) -> tuple[ParsedExtraction, ParsePathEnum] | None:
+        """Deterministic templates, then the exact-text cache, then the near-duplicate index."""
+        if self.fast_path_enabled:
+            parsed = parse_deterministic(text, current_user.first_name, current_user.last_name, today)
+            if parsed is not None:
+                return parsed, ParsePathEnum.rule
+        version = self.provider.extraction_version
+        key = cache_key(text, requester_context, today, version)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached, ParsePathEnum.cache
+        parsed = self.near_duplicates.lookup(text, requester_context, version, today)
+        if parsed is not None:
+            await self.cache.set(key, parsed)
+            return parsed, ParsePathEnum.near_duplicate
+        return None
+
+    async def _parse(
+        self,
+        text: str,
+        current_user: Employee,
+        requester_context: str,
+        today: date,
+        on_progress: ProgressCallback | None = None,
+        submit: bool = False,
+    ) -> tuple[ParsedExtraction, ParsePathEnum]:
+        """
+        Cheapest confident parse first: deterministic templates, the exact-text cache, the
+        near-duplicate index, then the provider (single-flight per key). Returns the parse and the path that served it;
+        every result is a fresh copy callers may mutate. on_progress receives a "partial" event
+        per batch of fields the provider finishes generating. Provider calls wait for an admission
+        slot; submit ranks the call above previews.
+        """
+        local = await self._parse_without_provider(text, current_user, requester_context, today)
+        if local is not None:
+            return local
+        version = self.provider.extraction_version
+        key = cache_key(text, requester_context, today, version)
+
+        async def call_provider() -> ParsedExtraction:
+            async with self.admission.slot(request_priority(text, today, submit)):
+                if on_progress is None:
+                    result = await self.provider.parse(text, requester_context=requester_context, reference_date=today)
+                else:
+
+                    async def on_fields(fields: dict[str, Any]) -> None:
+                        await on_progress("partial", fields)
+
+                    result = await self.provider.parse_streaming(
+                        text, requester_context=requester_context, reference_date=today, on_fields=on_fields
+                    )
+            self.near_duplicates.add(text, requester_context, version, today, result)
+            await self.cache.set(key, result)
+            return result
+
+        # Identical parses already in flight (double submit, preview then submit) share one call.
+        parsed, led = await self.single_flight.do(key, call_provider)
+        return parsed, ParsePathEnum.llm if led else ParsePathEnum.coalesced
+
     async def extract(
         self,
         session: AsyncSession,
@@ -70,7 +151,7 @@ class ExtractionService:
             )
         requester_context = self._build_requester_context(current_user)
         today = org_today()
-        parsed = await self.provider.parse(text, requester_context=requester_context, reference_date=today)
+        parsed, parse_path = await self._parse(text, current_user, requester_context, today, submit=True)
         _normalize_parsed_dates(parsed, today)
         await self._enforce_parsed_preconditions(session, current_user, parsed)
         validated = self._apply_defaults(parsed, today)
@@ -82,6 +163,7 @@ class ExtractionService:
             raw_payload=raw_payload,
             extraction_version=self.provider.extraction_version,
             provider_name=self.provider.provider_name,
+            parse_path=parse_path,
         )
 
     def _apply_defaults(self, parsed: ParsedExtraction, today: date | None = None) -> ValidatedExtraction:
@@ -124,20 +206,64 @@ class ExtractionService:
         session: AsyncSession,
         text: str,
         current_user: Employee,
+        on_progress: ProgressCallback | None = None,
     ) -> tuple[ParsedExtraction, list[NeedsInputItem]]:
         """
         Parse text into a draft extraction, returning UI prompts for missing/ambiguous fields.
 
         This is designed for PREVIEW flows so the UI can guide the user to completion
-        without a hard failure.
+        without a hard failure. on_progress (streaming preview) hears "parsing" and "partial" events.
         """
         requester_context = self._build_requester_context(current_user)
         today = org_today()
-        parsed = await self.provider.parse(text, requester_context=requester_context, reference_date=today)
+        if on_progress is not None:
+            await on_progress("parsing", {})
+        parsed, _ = await self._parse(text, current_user, requester_context, today, on_progress)
 
         needs = await self._collect_needs_input(session, current_user, parsed, today)
         return parsed, needs
 
+    async def parse_many_lenient(
+        self,
+        session: AsyncSession,
+        texts: list[str],
+        current_user: Employee,
+    ) -> list[tuple[ParsedExtraction, list[NeedsInputItem]] | AppError]:
+        """
+        parse_lenient for many texts from one requester. Texts the local paths cannot answer go
+        to the provider together via parse_many; each result is a draft with its UI prompts or
+        the AppError that text failed with.
+        """
+        requester_context = self._build_requester_context(current_user)
+        today = org_today()
+        version = self.provider.extraction_version
+        parsed: list[ParsedExtraction | AppError | None] = []
+        for text in texts:
+            local = await self._parse_without_provider(text, current_user, requester_context, today)
+            parsed.append(local[0] if local is not None else None)
+
+        pending = [i for i, item in enumerate(parsed) if item is None]
+        if pending:
+            priority = min(request_priority(texts[i], today, submit=False) for i in pending)
+            async with self.admission.slot(priority):
+                provided = await self.provider.parse_many(
+                    [texts[i] for i in pending], requester_context=requester_context, reference_date=today
+                )
+            for i, result in zip(pending, provided):
+                if isinstance(result, ParsedExtraction):
+                    self.near_duplicates.add(texts[i], requester_context, version, today, result)
+                    await self.cache.set(cache_key(texts[i], requester_context, today, version), result)
+                    result = result.model_copy()
+                parsed[i] = result
+
+        results: list[tuple[ParsedExtraction, list[NeedsInputItem]] | AppError] = []
+        for item in parsed:
+            if isinstance(item, AppError):
+                results.append(item)
+            else:
+                results.append((item, await self._collect_needs_input(session, current_user, item, today)))
+        return results
+
     async def _collect_needs_input(
         self,
         session: AsyncSession,
@@ -201,13 +327,10 @@ class ExtractionService:
         return needs
 
     async def _enforce_parsed_preconditions(self, session: AsyncSession, current_user: Employee, parsed: ParsedExtraction) -> None:
+        # A requester the model left empty (or repair cleared) is the authenticated user.
         if not (parsed.employee_first_name or "").strip() and not (parsed.employee_last_name or "").strip():
-            raise AppError(
-                ErrorCode.validation_error,
-                "Requester first or last name is required.",
-                "employee_first_name and employee_last_name both missing.",
-                400,
-            )
+            parsed.employee_first_name = current_user.first_name
+            parsed.employee_last_name = current_user.last_name
         if parsed.target_date is None:
             if parsed.requested_action == RequestedActionEnum.cover and parsed.current_shift_date is not None:
                 parsed.target_date = parsed.current_shift_date
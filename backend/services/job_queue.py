@@ -0,0 +1,215 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+import uuid
+from datetime import UTC, datetime
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from backend.config import get_settings
+from backend.db import SessionLocal, redis_client
+from backend.deadline import deadline_scope
+from backend.errors import AppError
+from backend.models import Employee
+from backend.schemas import (
+    ErrorCode,
+    JobAcceptedOut,
+    JobStatusEnum,
+    JobStatusOut,
+    PreviewRequestIn,
+    ScheduleRequestOut,
+)
+from backend.services.extraction_cache import normalize_text
+from backend.services.scheduler_service import SchedulerService
+from backend.time_utils import org_today
+
+logger = logging.getLogger("shift-scheduler")
+
+STREAM_KEY = "schedule:jobs"
+GROUP = "schedule-workers"
+JOB_KEY = "schedule:job:"
+SUBMISSION_KEY = "schedule:job:submission:"
+
+
+def submission_key(employee_id: uuid.UUID, payload: PreviewRequestIn) -> str:
+    """
+    One job per (requester, request, org day): a client retrying its POST gets the same job back
+    unless that job failed. Text is normalized like the extraction cache; structured payloads are
+    keyed on their JSON.
+    """
+    body = normalize_text(payload.text) if payload.text else payload.structured.model_dump_json()
+    material = json.dumps([str(employee_id), org_today().isoformat(), body])
+    return SUBMISSION_KEY + hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class JobQueue:
+    """
+    Schedule-request submissions on a Redis Stream with a consumer group.
+
+    Job state lives in a hash per job (status, owner, payload, result or error) with
+    JOB_RESULT_TTL_SECONDS. Delivery is at-least-once: an entry is acknowledged only after its
+    outcome is stored, and entries left pending by a crashed worker are reclaimed after
+    JOB_CLAIM_IDLE_SECONDS. Re-running a job is safe because request creation is idempotent by
+    extraction fingerprint.
+    """
+
+    def __init__(self, redis: Redis | None = None) -> None:
+        settings = get_settings()
+        self.redis = redis or redis_client
+        self.result_ttl = settings.job_result_ttl_seconds
+        self.claim_idle_ms = settings.job_claim_idle_seconds * 1000
+        self.max_attempts = settings.job_max_attempts
+
+    async def enqueue(self, payload: PreviewRequestIn, current_user: Employee, correlation_id: str) -> JobAcceptedOut:
+        job_id = str(uuid.uuid4())
+        dedupe = submission_key(current_user.id, payload)
+        if not await self.redis.set(dedupe, job_id, nx=True, ex=self.result_ttl):
+            existing = await self.redis.get(dedupe)
+            state = await self.redis.hget(JOB_KEY + existing, "status") if existing else None
+            if state is not None and state != JobStatusEnum.failed.value:
+                return JobAcceptedOut(jobId=existing, status=JobStatusEnum(state), duplicate=True)
+            await self.redis.set(dedupe, job_id, ex=self.result_ttl)
+        key = JOB_KEY + job_id
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                key,
+                mapping={
+                    "status": JobStatusEnum.queued.value,
+                    "employee_id": str(current_user.id),
+                    "payload": payload.model_dump_json(),
+                    "correlation_id": correlation_id,
+                    "created_at": datetime.now(UTC).isoformat(),
+                    "attempts": 0,
+                },
+            )
+            pipe.expire(key, self.result_ttl)
+            pipe.xadd(STREAM_KEY, {"job_id": job_id})
+            await pipe.execute()
+        return JobAcceptedOut(jobId=job_id, status=JobStatusEnum.queued)
+
+    async def get(self, job_id: str, current_user: Employee) -> JobStatusOut:
+        job = await self.redis.hgetall(JOB_KEY + job_id)
+        if not job or job.get("employee_id") != str(current_user.id):
+            raise AppError(
+                ErrorCode.validation_error,
+                "Request job not found or expired.",
+                f"Job {job_id} missing, expired or owned by another employee.",
+                404,
+            )
+        return JobStatusOut(
+            jobId=job_id,
+            status=JobStatusEnum(job["status"]),
+            attempts=int(job.get("attempts", 0)),
+            result=ScheduleRequestOut.model_validate_json(job["result"]) if job.get("result") else None,
+            error=json.loads(job["error"]) if job.get("error") else None,
+        )
+
+    async def ensure_group(self) -> None:
+        try:
+            await self.redis.xgroup_create(STREAM_KEY, GROUP, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def next_entry(self, consumer: str) -> tuple[str, str] | None:
+        """Reclaim one entry abandoned by a dead consumer, else block briefly for a new one."""
+        _, claimed, *_ = await self.redis.xautoclaim(
+            STREAM_KEY, GROUP, consumer, min_idle_time=self.claim_idle_ms, start_id="0-0", count=1
+        )
+        if not claimed:
+            response = await self.redis.xreadgroup(GROUP, consumer, {STREAM_KEY: ">"}, count=1, block=5000)
+            claimed = response[0][1] if response else []
+        if not claimed:
+            return None
+        entry_id, fields = claimed[0]
+        return entry_id, fields["job_id"]
+
+    async def _finish(self, entry_id: str, job_id: str, **fields: str) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(JOB_KEY + job_id, mapping=fields)
+            pipe.xack(STREAM_KEY, GROUP, entry_id)
+            pipe.xdel(STREAM_KEY, entry_id)
+            await pipe.execute()
+
+    async def process(self, entry_id: str, job_id: str, service: SchedulerService) -> None:
+        key = JOB_KEY + job_id
+        job = await self.redis.hgetall(key)
+        if not job or job.get("status") in (JobStatusEnum.succeeded.value, JobStatusEnum.failed.value):
+            # Expired, or finished by an earlier delivery whose ack was lost.
+            await self.redis.xack(STREAM_KEY, GROUP, entry_id)
+            return
+        attempts = await self.redis.hincrby(key, "attempts", 1)
+        await self.redis.hset(key, "status", JobStatusEnum.processing.value)
+        try:
+            async with SessionLocal() as session:
+                # Short-lived: the extraction below may take a while and must not hold a connection.
+                current_user = await session.get(Employee, uuid.UUID(job["employee_id"]))
+            if current_user is None:
+                raise AppError(
+                    ErrorCode.employee_not_found,
+                    "Employee for this request no longer exists.",
+                    f"Employee {job['employee_id']} not found for job {job_id}.",
+                    404,
+                )
+            with deadline_scope(get_settings().request_deadline_seconds):
+                async with SessionLocal() as session:
+                    result = await service.request_unified(
+                        session=session,
+                        payload=PreviewRequestIn.model_validate_json(job["payload"]),
+                        correlation_id=job["correlation_id"],
+                        current_user=current_user,
+                    )
+        except AppError as exc:
+            if exc.error_code == ErrorCode.llm_overloaded and attempts < self.max_attempts:
+                # Shed by admission control: leave the entry pending for a later reclaim.
+                await self.redis.hset(key, "status", JobStatusEnum.queued.value)
+                return
+            error = {
+                "errorCode": exc.error_code.value,
+                "userMessage": exc.user_message,
+                "developerMessage": exc.developer_message,
+                "statusCode": exc.status_code,
+            }
+            await self._finish(entry_id, job_id, status=JobStatusEnum.failed.value, error=json.dumps(error))
+            return
+        except Exception as exc:
+            logger.exception("schedule job %s attempt %s failed", job_id, attempts)
+            if attempts < self.max_attempts:
+                # Leave the entry pending; it is reclaimed after JOB_CLAIM_IDLE_SECONDS.
+                await self.redis.hset(key, "status", JobStatusEnum.queued.value)
+                return
+            error = {
+                "errorCode": ErrorCode.db_error.value,
+                "userMessage": "The request could not be processed. Please try again.",
+                "developerMessage": f"{type(exc).__name__}: {str(exc)[:500]}",
+                "statusCode": 500,
+            }
+            await self._finish(entry_id, job_id, status=JobStatusEnum.failed.value, error=json.dumps(error))
+            return
+        await self._finish(entry_id, job_id, status=JobStatusEnum.succeeded.value, result=result.model_dump_json())
+
+    async def run_worker(self, consumer: str, service: SchedulerService) -> None:
+        await self.ensure_group()
+        while True:
+            try:
+                entry = await self.next_entry(consumer)
+                if entry is not None:
+                    await self.process(*entry, service)
+            except asyncio.CancelledError:
+                raise
+            except RedisError:
+                logger.exception("schedule job worker %s lost Redis; retrying", consumer)
+                await asyncio.sleep(1)
+
+
+def start_job_workers(queue: JobQueue, service: SchedulerService) -> list[asyncio.Task]:
+    """Run JOB_WORKER_CONCURRENCY consumers in this process; every replica joins the same group."""
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    return [
+        asyncio.create_task(queue.run_worker(f"{prefix}-{i}", service))
+        for i in range(get_settings().job_worker_concurrency)
+    ]
@@ -0,0 +1,237 @@
+import re
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+
+from backend.config import get_settings
+from backend.schemas import ParsedExtraction
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(1729)
+_A = _rng.integers(1, 2**31, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2**31, NUM_PERM, dtype=np.uint64)
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+# Spellings that mean the same thing to the parser; canonicalised before hashing and comparison.
+_ALIASES = {
+    "tmrw": "tomorrow",
+    "tmr": "tomorrow",
+    "tmw": "tomorrow",
+    "tomorow": "tomorrow",
+    "2morrow": "tomorrow",
+    "tonite": "tonight",
+    "nite": "night",
+    "pls": "please",
+    "plz": "please",
+    "thx": "thanks",
+    "ty": "thanks",
+    "shft": "shift",
+    # Action paraphrases: the extraction only keeps swap / move / cover.
+    "switch": "swap",
+    "trade": "swap",
+    "exchange": "swap",
+    "take": "cover",
+    "fill": "cover",
+    "reschedule": "move",
+}
+# Words whose presence or absence never changes the extraction. Filler is also left out of the
+# signature; stop words are hashed (they separate near-duplicates from exact ones) but never compared.
+_FILLER = frozenset(
+    {
+        "please", "thanks", "thank", "hi", "hey", "hello", "can", "could", "would", "someone", "anyone",
+        "somebody", "anybody", "kindly", "just", "ok", "okay", "um", "so", "possible", "possibly",
+    }
+)
+_STOP = frozenset({"a", "an", "the", "of", "to", "for", "on", "at", "in"})
+_MONTHS = frozenset(
+    {
+        "jan", "january", "feb", "february", "mar", "march", "apr", "april", "may", "jun", "june", "jul",
+        "july", "aug", "august", "sep", "sept", "september", "oct", "october", "nov", "november", "dec", "december",
+    }
+)
+_WEEKDAYS = frozenset(
+    {
+        "mon", "monday", "tue", "tues", "tuesday", "wed", "wednesday", "thu", "thurs", "thursday",
+        "fri", "friday", "sat", "saturday", "sun", "sunday",
+    }
+)
+
+
+_SHIFT_WORDS = {
+    "morning": "morning", "mornings": "morning", "am": "morning", "early": "morning",
+    "night": "night", "nights": "night", "pm": "night", "evening": "night", "evenings": "night",
+    "overnight": "night", "late": "night",
+}
+_RELATIVE_DATES = frozenset({"today", "tonight", "tomorrow", "yesterday", "next", "this", "week", "weekend"})
+# Request phrasing that is neither a name nor a date or shift type. Any other word is treated as
+# a name (or reason) and must appear in both texts.
+_COMMON = frozenset(
+    {
+        "i", "i'm", "im", "me", "my", "mine", "you", "your", "we", "us", "our", "he", "she", "they", "them",
+        "his", "her", "their", "is", "are", "be", "am", "will", "do", "does", "want", "wants", "need", "needs",
+        "like", "with", "and", "or", "from", "instead", "off", "shift", "shifts", "work", "working", "day",
+        "swap", "move", "cover", "change", "replace", "coverage", "get", "go", "up", "over", "into",
+    }
+)
+
+
+def canonical_tokens(text: str) -> tuple[str, ...]:
+    return tuple(_ALIASES.get(t, t) for t in _TOKEN.findall(text.casefold()))
+
+
+def is_relative_only(tokens: tuple[str, ...]) -> bool:
+    """No digits, month or weekday names: every date in the text is relative to the reference date."""
+    return not any(any(c.isdigit() for c in t) or t in _MONTHS or t in _WEEKDAYS for t in tokens)
+
+
+def minhash_signature(tokens: tuple[str, ...]) -> np.ndarray:
+    """MinHash over character shingles of the non-filler tokens, so "pls"/"can someone" do not dilute the score."""
+    text = " ".join(t for t in tokens if t not in _FILLER)
+    shingles = {text[i : i + SHINGLE] for i in range(max(1, len(text) - SHINGLE + 1))}
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((_A[:, np.newaxis] * hashes[np.newaxis, :] + _B[:, np.newaxis]) % _PRIME).min(axis=1)
+
+
+def estimated_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def key_facts(tokens: tuple[str, ...]) -> tuple:
+    """
+    What a similar text must agree on before its extraction is reused: dates and shift types in
+    order ("swap my night for morning" differs from "swap my morning for night"), the actions named,
+    and every remaining content word (names, reasons) in any order.
+    """
+    dates = tuple(
+        t for t in tokens if any(c.isdigit() for c in t) or t in _MONTHS or t in _WEEKDAYS or t in _RELATIVE_DATES
+    )
+    shifts = tuple(_SHIFT_WORDS[t] for t in tokens if t in _SHIFT_WORDS)
+    actions = frozenset(t for t in tokens if t in {"swap", "move", "cover"})
+    words = frozenset(
+        t
+        for t in tokens
+        if t not in _FILLER and t not in _STOP and t not in _COMMON and t not in _SHIFT_WORDS and t not in dates
+    )
+    return dates, shifts, actions, words
+
+
+def reanchor(parsed: ParsedExtraction, days: int) -> ParsedExtraction:
+    """Copy of parsed with every date moved by days (a 'tomorrow' parsed yesterday is today)."""
+    if days == 0:
+        return parsed.model_copy()
+    shift = timedelta(days=days)
+    updates = {
+        field: getattr(parsed, field) + shift
+        for field in ("current_shift_date", "target_date", "partner_shift_date")
+        if getattr(parsed, field) is not None
+    }
+    return parsed.model_copy(update=updates)
+
+
+@dataclass
+class _Entry:
+    scope: tuple[str, str]
+    tokens: tuple[str, ...]
+    facts: tuple
+    signature: np.ndarray
+    parsed: ParsedExtraction
+    reference_date: date
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index over recent successful extractions, consulted before calling the provider.
+
+    Signatures are 64 MinHash values over character 3-grams of the canonicalised text minus filler;
+    LSH splits them into 16 bands of 4 so only texts sharing a band are compared. A neighbour is
+    reused when its estimated Jaccard similarity reaches NEAR_DUPLICATE_THRESHOLD, it was parsed
+    with the same extraction version and requester context, and its key facts (dates, shift
+    types, actions, names) agree, so paraphrases and reordered names still match.
+    Relative-only texts are re-anchored to today's date; texts naming weekdays, months or digits are
+    reused only on the same reference date. In-process and FIFO-bounded; counters are per worker.
+    """
+
+    def __init__(self, threshold: float | None = None, max_entries: int | None = None) -> None:
+        settings = get_settings()
+        self.threshold = settings.near_duplicate_threshold if threshold is None else threshold
+        self.max_entries = settings.near_duplicate_max_entries if max_entries is None else max_entries
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._buckets: dict[tuple, set[int]] = {}
+        self._next_id = 0
+        self.lookups = 0
+        self.hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return 0 < self.threshold <= 1 and self.max_entries > 0
+
+    def _band_keys(self, scope: tuple[str, str], signature: np.ndarray) -> list[tuple]:
+        return [(scope, b, signature[b * ROWS : (b + 1) * ROWS].tobytes()) for b in range(BANDS)]
+
+    def lookup(
+        self, text: str, requester_context: str, extraction_version: str, today: date
+    ) -> ParsedExtraction | None:
+        if not self.enabled:
+            return None
+        self.lookups += 1
+        scope = (extraction_version, requester_context)
+        tokens = canonical_tokens(text)
+        facts = key_facts(tokens)
+        signature = minhash_signature(tokens)
+        candidates: set[int] = set()
+        for key in self._band_keys(scope, signature):
+            candidates |= self._buckets.get(key, set())
+        best: tuple[float, _Entry] | None = None
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            if entry.reference_date != today and not is_relative_only(entry.tokens):
+                continue
+            score = estimated_jaccard(signature, entry.signature)
+            if score >= self.threshold and facts == entry.facts and (best is None or score > best[0]):
+                best = (score, entry)
+        if best is None:
+            return None
+        self.hits += 1
+        entry = best[1]
+        return reanchor(entry.parsed, (today - entry.reference_date).days)
+
+    def add(
+        self,
+        text: str,
+        requester_context: str,
+        extraction_version: str,
+        today: date,
+        parsed: ParsedExtraction,
+    ) -> None:
+        if not self.enabled:
+            return
+        scope = (extraction_version, requester_context)
+        tokens = canonical_tokens(text)
+        signature = minhash_signature(tokens)
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = _Entry(scope, tokens, key_facts(tokens), signature, parsed.model_copy(), today)
+        for key in self._band_keys(scope, signature):
+            self._buckets.setdefault(key, set()).add(entry_id)
+        while len(self._entries) > self.max_entries:
+            old_id, old = self._entries.popitem(last=False)
+            for key in self._band_keys(old.scope, old.signature):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(old_id)
+                    if not bucket:
+                        del self._buckets[key]
+
+    @property
+    def bypass_rate(self) -> float:
+        return round(self.hits / self.lookups, 4) if self.lookups else 0.0
+
+
+near_duplicate_index = NearDuplicateIndex()
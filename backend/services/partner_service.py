@@ -1,12 +1,13 @@
 from datetime import date, timedelta
 from uuid import UUID
 
-from sqlalchemy import and_, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.errors import AppError
-from backend.models import Employee, RequestStatus, ScheduleRequest, Shift
+from backend.models import Employee, RequestStatus, ScheduleRequest
 from backend.schemas import ErrorCode, PartnerPendingItem
+from backend.services.workload import weekly_totals
 
 
 def _week_range(d: date) -> tuple[date, date]:
@@ -25,6 +26,16 @@ class PartnerService:
         )
         result = await session.execute(stmt)
         requests = result.scalars().all()
+        week_of: dict = {}
+        for req in requests:
+            pd = req.validated_extraction.get("partner_shift_date") or req.validated_extraction.get("target_date")
+            try:
+                if pd:
+                    pd = pd if isinstance(pd, date) else date.fromisoformat(str(pd))
+                    week_of[req.id] = _week_range(pd)[0]
+            except (TypeError, ValueError):
+                pass
+        workload_by_week = await weekly_totals(session, current_user.id, week_of.values())
         items = []
         for req in requests:
             ext = req.validated_extraction
@@ -34,22 +45,7 @@ class PartnerService:
             requester_shift_type = ext.get("current_shift_type")
             partner_shift_date = ext.get("partner_shift_date") or ext.get("target_date")
             partner_shift_type = ext.get("partner_shift_type") or ext.get("target_shift_type")
-            workload = None
-            if partner_shift_date:
-                try:
-                    pd = partner_shift_date if isinstance(partner_shift_date, date) else date.fromisoformat(str(partner_shift_date))
-                    w_start, w_end = _week_range(pd)
-                    count_stmt = select(Shift).where(
-                        and_(
-                            Shift.date >= w_start,
-                            Shift.date <= w_end,
-                            Shift.assigned_employee_id == current_user.id,
-                        )
-                    )
-                    count_result = await session.execute(count_stmt)
-                    workload = len(count_result.scalars().all())
-                except (TypeError, ValueError):
-                    pass
+            workload = workload_by_week.get(week_of[req.id]) if req.id in week_of else None
             items.append(
                 PartnerPendingItem(
                     requestId=req.id,
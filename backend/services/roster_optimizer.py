@@ -0,0 +1,329 @@
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import get_settings
+from backend.errors import AppError
+from backend.models import AuditLog, Employee, Shift
+from backend.schemas import (
+    ErrorCode,
+    RosterAssignmentOut,
+    RosterOptimizeIn,
+    RosterPlanResponse,
+    ShiftTypeEnum,
+)
+from backend.services.coverage_service import (
+    OpenShift,
+    PoolEmployee,
+    encode_skill_masks,
+    pool_employee,
+)
+from backend.services.workload import record_assignment_changes
+
+MAX_HORIZON_DAYS = 62
+
+
+def _week_start(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+
+class _RosterState:
+    """Mutable assignment plus the per-employee day/week/horizon counters the constraints need."""
+
+    def __init__(
+        self,
+        slots: list[OpenShift],
+        pool: list[PoolEmployee],
+        fixed: list[tuple[date, ShiftTypeEnum, UUID]],
+        max_per_week: int,
+    ) -> None:
+        self.max_per_week = max_per_week
+        days = sorted({s.date for s in slots} | {d for d, _, _ in fixed})
+        day_index = {d: i for i, d in enumerate(days)}
+        weeks = sorted({_week_start(d) for d in days})
+        week_index = {w: i for i, w in enumerate(weeks)}
+        self.slot_day = np.array([day_index[s.date] for s in slots], dtype=np.int64)
+        self.slot_week = np.array([week_index[_week_start(s.date)] for s in slots], dtype=np.int64)
+
+        vocabulary: dict[str, int] = {}
+        for s in slots:
+            for skill in s.required_skills:
+                vocabulary.setdefault(skill, len(vocabulary))
+        employee_masks = encode_skill_masks([list(e.skills) for e in pool], vocabulary)
+        slot_masks = encode_skill_masks([list(s.required_skills) for s in slots], vocabulary)
+        skills_ok = ~(slot_masks[:, np.newaxis, :] & ~employee_masks[np.newaxis, :, :]).any(axis=2)
+        cert_ok = np.array([e.cert_ok for e in pool], dtype=bool)
+        available = np.array([[d not in e.unavailable_dates for e in pool] for d in days], dtype=bool)
+        self.eligible = skills_ok & cert_ok[np.newaxis, :] & available[self.slot_day]
+        prefers = {t: np.array([t.value in e.preferred_types for e in pool], dtype=bool) for t in ShiftTypeEnum}
+        self.preferred = np.stack([prefers[s.type] for s in slots])
+        self.candidates = [np.flatnonzero(row) for row in self.eligible]
+
+        self.busy = np.zeros((len(pool), len(days)), dtype=bool)
+        self.week_load = np.zeros((len(pool), len(weeks)), dtype=np.int64)
+        self.load = np.zeros(len(pool), dtype=np.int64)
+        index = {e.employee_id: k for k, e in enumerate(pool)}
+        for d, _, employee_id in fixed:
+            k = index.get(employee_id)
+            if k is not None:
+                self.busy[k, day_index[d]] = True
+                self.week_load[k, week_index[_week_start(d)]] += 1
+                self.load[k] += 1
+        self.assignment = np.full(len(slots), -1, dtype=np.int64)
+        self.slots_of: list[set[int]] = [set() for _ in pool]
+
+    def place(self, s: int, k: int) -> None:
+        self.assignment[s] = k
+        self.busy[k, self.slot_day[s]] = True
+        self.week_load[k, self.slot_week[s]] += 1
+        self.load[k] += 1
+        self.slots_of[k].add(s)
+
+    def unplace(self, s: int) -> int:
+        k = int(self.assignment[s])
+        self.assignment[s] = -1
+        self.busy[k, self.slot_day[s]] = False
+        self.week_load[k, self.slot_week[s]] -= 1
+        self.load[k] -= 1
+        self.slots_of[k].discard(s)
+        return k
+
+    def free_candidates(self, s: int, exclude: int | None = None) -> np.ndarray:
+        cands = self.candidates[s]
+        ok = ~self.busy[cands, self.slot_day[s]] & (self.week_load[cands, self.slot_week[s]] < self.max_per_week)
+        if exclude is not None:
+            ok &= cands != exclude
+        return cands[ok]
+
+    def best_free(self, s: int, exclude: int | None = None) -> int | None:
+        """Least-loaded feasible candidate, stated preference breaking ties."""
+        cands = self.free_candidates(s, exclude)
+        if not len(cands):
+            return None
+        score = self.load[cands] * 2 - self.preferred[s, cands]
+        return int(cands[int(np.argmin(score))])
+
+    def try_fill(self, s: int, deadline: float) -> bool:
+        """Fill an open slot directly, or by moving one blocking assignment of a candidate elsewhere."""
+        k = self.best_free(s)
+        if k is not None:
+            self.place(s, k)
+            return True
+        day, week = self.slot_day[s], self.slot_week[s]
+        for b in self.candidates[s][np.argsort(self.load[self.candidates[s]], kind="stable")]:
+            if time.perf_counter() >= deadline:
+                return False
+            b = int(b)
+            if self.busy[b, day]:
+                blockers = [t for t in self.slots_of[b] if self.slot_day[t] == day]
+            else:
+                blockers = [t for t in self.slots_of[b] if self.slot_week[t] == week]
+            for t in blockers:
+                self.unplace(t)
+                c = self.best_free(t, exclude=b)
+                if c is not None and not self.busy[b, day] and self.week_load[b, week] < self.max_per_week:
+                    self.place(t, c)
+                    self.place(s, b)
+                    return True
+                self.place(t, b)
+        return False
+
+    def rebalance(self, s: int) -> bool:
+        """Hand a filled slot to a less-loaded feasible candidate when that lowers the sum of squared loads."""
+        a = int(self.assignment[s])
+        cands = self.free_candidates(s, exclude=a)
+        if not len(cands):
+            return False
+        c = int(cands[int(np.argmin(self.load[cands]))])
+        if self.load[c] + 1 >= self.load[a]:
+            return False
+        self.unplace(s)
+        self.place(s, c)
+        return True
+
+
+def optimize_roster(
+    slots: list[OpenShift],
+    pool: list[PoolEmployee],
+    fixed: list[tuple[date, ShiftTypeEnum, UUID]],
+    max_per_week: int,
+    time_budget_seconds: float,
+    seed: int = 0,
+    incumbents: list[int | None] | None = None,
+) -> list[int | None]:
+    """
+    Assign employees to slots: maximise filled slots first, then balance horizon workload.
+
+    Hard constraints: required skills, valid certifications, not unavailable that day, one shift
+    per employee per day and at most max_per_week shifts per ISO week (fixed assignments count).
+    Greedy construction fills the scarcest slots first with the least-loaded candidate; local
+    search then repairs open slots (one-step ejection) and moves slots from heavily to lightly
+    loaded employees until nothing improves or the time budget runs out. A slot still open at
+    the end goes back to its incumbent (pool index, when re-planning assigned shifts) if that
+    employee is free that day. CPU-bound: call via asyncio.to_thread.
+    """
+    if not slots:
+        return []
+    if not pool:
+        return [None] * len(slots)
+    deadline = time.perf_counter() + time_budget_seconds
+    state = _RosterState(slots, pool, fixed, max_per_week)
+    order = sorted(range(len(slots)), key=lambda s: (len(state.candidates[s]), slots[s].date))
+    for s in order:
+        k = state.best_free(s)
+        if k is not None:
+            state.place(s, k)
+
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        changed = False
+        for s in [s for s in order if state.assignment[s] < 0]:
+            changed |= state.try_fill(s, deadline)
+        filled = [s for s in range(len(slots)) if state.assignment[s] >= 0]
+        rng.shuffle(filled)
+        for s in filled:
+            if time.perf_counter() >= deadline:
+                break
+            changed |= state.rebalance(s)
+        if not changed:
+            break
+    for s, k in enumerate(incumbents or []):
+        if k is not None and state.assignment[s] < 0 and not state.busy[k, state.slot_day[s]]:
+            state.place(s, k)
+    return [int(k) if k >= 0 else None for k in state.assignment]
+
+
+class RosterOptimizer:
+    async def plan(self, session: AsyncSession, payload: RosterOptimizeIn) -> RosterPlanResponse:
+        """
+        Plan (and optionally write) assignments for every shift slot in a horizon.
+
+        Reads employees and the shifts of every ISO week the horizon touches in two queries
+        (assignments outside the horizon count towards the weekly cap), optimises in a worker
+        thread within ROSTER_OPTIMIZER_TIME_BUDGET_SECONDS, and applies with one bulk UPDATE +
+        commit. With replace_existing, a slot nobody else can take keeps its current holder.
+        """
+        if payload.to_date < payload.from_date or (payload.to_date - payload.from_date).days > MAX_HORIZON_DAYS:
+            raise AppError(
+                ErrorCode.validation_error,
+                f"Choose a horizon of at most {MAX_HORIZON_DAYS} days with from_date before to_date.",
+                f"Invalid roster horizon {payload.from_date}..{payload.to_date}.",
+                400,
+            )
+        settings = get_settings()
+        employees = list((await session.execute(select(Employee))).scalars().all())
+        shifts = list(
+            (
+                await session.execute(
+                    select(Shift)
+                    .where(
+                        Shift.date >= _week_start(payload.from_date),
+                        Shift.date <= _week_start(payload.to_date) + timedelta(days=6),
+                    )
+                    .order_by(Shift.date, Shift.type, Shift.id)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        in_horizon = [s for s in shifts if payload.from_date <= s.date <= payload.to_date]
+        targets = [s for s in in_horizon if payload.replace_existing or s.assigned_employee_id is None]
+        target_ids = {s.id for s in targets}
+        fixed = [
+            (s.date, ShiftTypeEnum(s.type.value), s.assigned_employee_id)
+            for s in shifts
+            if s.assigned_employee_id is not None and s.id not in target_ids
+        ]
+        slots = [
+            OpenShift(
+                shift_id=s.id,
+                request_id=None,
+                date=s.date,
+                type=ShiftTypeEnum(s.type.value),
+                required_skills=tuple((s.required_skills or {}).get("skills", [])),
+            )
+            for s in targets
+        ]
+        pool = [pool_employee(e) for e in employees]
+        pool_index = {e.id: k for k, e in enumerate(employees)}
+        incumbents = [pool_index.get(s.assigned_employee_id) for s in targets]
+
+        started = time.perf_counter()
+        plan = await asyncio.to_thread(
+            optimize_roster,
+            slots,
+            pool,
+            fixed,
+            settings.roster_max_shifts_per_week,
+            settings.roster_optimizer_time_budget_seconds,
+            0,
+            incumbents,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        assignments = [
+            RosterAssignmentOut(
+                shift_id=slot.shift_id,
+                date=slot.date,
+                type=slot.type,
+                employee_id=employees[k].id if k is not None else None,
+                full_name=employees[k].full_name if k is not None else None,
+            )
+            for slot, k in zip(slots, plan)
+        ]
+        loads: dict[UUID, int] = {e.id: 0 for e in employees}
+        for d, _, employee_id in fixed:
+            if employee_id in loads and payload.from_date <= d <= payload.to_date:
+                loads[employee_id] += 1
+        for a in assignments:
+            if a.employee_id is not None:
+                loads[a.employee_id] += 1
+        filled = sum(1 for a in assignments if a.employee_id is not None)
+
+        applied = False
+        if payload.apply and assignments:
+            by_id = {s.id: s for s in targets}
+            await record_assignment_changes(
+                session,
+                [
+                    (a.date, by_id[a.shift_id].type, by_id[a.shift_id].assigned_employee_id, a.employee_id)
+                    for a in assignments
+                ],
+            )
+            await session.execute(
+                update(Shift),
+                [{"id": a.shift_id, "assigned_employee_id": a.employee_id} for a in assignments],
+            )
+            session.add(
+                AuditLog(
+                    action="roster.optimized.applied",
+                    meta={
+                        "from_date": payload.from_date.isoformat(),
+                        "to_date": payload.to_date.isoformat(),
+                        "slots": len(slots),
+                        "filled": filled,
+                        "replace_existing": payload.replace_existing,
+                    },
+                )
+            )
+            await session.commit()
+            applied = True
+
+        return RosterPlanResponse(
+            from_date=payload.from_date,
+            to_date=payload.to_date,
+            applied=applied,
+            slots=len(slots),
+            filled=filled,
+            coverage=round(filled / len(slots), 4) if slots else 1.0,
+            min_load=min(loads.values(), default=0),
+            max_load=max(loads.values(), default=0),
+            elapsed_ms=round(elapsed_ms, 1),
+            assignments=assignments,
+        )
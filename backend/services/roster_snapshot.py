@@ -0,0 +1,90 @@
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Employee, Shift, ShiftType
+from backend.schemas import ValidatedExtraction
+from backend.services.employee_names import matches_name, name_match_clause
+
+Slot = tuple[date, ShiftType]
+
+
+def _clean(value: str | None) -> str | None:
+    return (value or "").strip() or None
+
+
+def _names_in(extraction: ValidatedExtraction) -> list[tuple[str | None, str | None]]:
+    names = [(_clean(extraction.employee_first_name), _clean(extraction.employee_last_name))]
+    partner = (_clean(extraction.partner_employee_first_name), _clean(extraction.partner_employee_last_name))
+    if partner != (None, None):
+        names.append(partner)
+    return names
+
+
+def _dates_in(extraction: ValidatedExtraction) -> set[date]:
+    return {
+        d
+        for d in (extraction.target_date, extraction.current_shift_date, extraction.partner_shift_date)
+        if d is not None
+    }
+
+
+class RosterSnapshot:
+    """
+    In-memory view of every employee and shift a set of extractions can touch.
+
+    Loaded with at most two queries (employees by name, shifts by date) so rule checks
+    run against dicts instead of issuing one round trip per check.
+    """
+
+    def __init__(self, employees: Iterable[Employee], shifts: Iterable[Shift]) -> None:
+        self.employees: list[Employee] = list(employees)
+        self._shifts_by_slot: dict[Slot, list[Shift]] = {}
+        for shift in shifts:
+            self._shifts_by_slot.setdefault((shift.date, shift.type), []).append(shift)
+        # Conflict-path suggestions memoized per slot so repeated conflicts reuse one lookup.
+        self.suggestions: dict[Slot, list[dict]] = {}
+
+    @classmethod
+    async def load(
+        cls, session: AsyncSession, extractions: Iterable[ValidatedExtraction]
+    ) -> "RosterSnapshot":
+        names: set[tuple[str | None, str | None]] = set()
+        dates: set[date] = set()
+        for extraction in extractions:
+            names.update(n for n in _names_in(extraction) if n != (None, None))
+            dates.update(_dates_in(extraction))
+
+        employees: list[Employee] = []
+        if names:
+            clauses = [name_match_clause(first, last) for first, last in names]
+            result = await session.execute(select(Employee).where(or_(*clauses)))
+            employees = list(result.scalars().all())
+
+        shifts: list[Shift] = []
+        if dates:
+            result = await session.execute(select(Shift).where(Shift.date.in_(dates)))
+            shifts = list(result.scalars().all())
+        return cls(employees, shifts)
+
+    def resolve_employee(self, first_name: str | None, last_name: str | None) -> list[Employee]:
+        """Same contract as RuleEngine.resolve_employee, answered from the snapshot."""
+        return [e for e in self.employees if matches_name(e, first_name, last_name)]
+
+    def shift_at(self, shift_date: date, shift_type: ShiftType) -> Shift | None:
+        shifts = self._shifts_by_slot.get((shift_date, shift_type))
+        return shifts[0] if shifts else None
+
+    def assigned_shift_at(self, shift_date: date, shift_type: ShiftType) -> Shift | None:
+        for shift in self._shifts_by_slot.get((shift_date, shift_type), []):
+            if shift.assigned_employee_id is not None:
+                return shift
+        return None
+
+    def shift_held_by(self, shift_date: date, shift_type: ShiftType, employee_id) -> Shift | None:
+        for shift in self._shifts_by_slot.get((shift_date, shift_type), []):
+            if shift.assigned_employee_id == employee_id:
+                return shift
+        return None
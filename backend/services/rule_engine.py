@@ -1,22 +1,37 @@
-from datetime import date
+from datetime import date, timedelta
 from uuid import UUID
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, case, exists, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.config import get_settings
 from backend.models import Employee, Shift, ShiftType
 from backend.schemas import ErrorCode, RuleEngineResult, ValidatedExtraction, RequestedActionEnum
+from backend.services.employee_names import find_employees_by_name
+from backend.services.roster_snapshot import RosterSnapshot
+from backend.services.workload import weekly_total_for
 
 
 class RuleEngine:
-    async def validate_request(self, session: AsyncSession, extraction: ValidatedExtraction) -> RuleEngineResult:
+    async def validate_request(
+        self,
+        session: AsyncSession,
+        extraction: ValidatedExtraction,
+        snapshot: RosterSnapshot | None = None,
+    ) -> RuleEngineResult:
+        """
+        Run every rule against a RosterSnapshot so validation costs a fixed number of queries.
+
+        Pass a preloaded snapshot to validate several extractions against one roster load.
+        """
+        if snapshot is None:
+            snapshot = await RosterSnapshot.load(session, [extraction])
         errors: list[ErrorCode] = []
         details: dict = {}
         suggestions: list[dict] = []
 
-        employees = await self.resolve_employee(
-            session, extraction.employee_first_name, extraction.employee_last_name
-        )
+        employees = snapshot.resolve_employee(extraction.employee_first_name, extraction.employee_last_name)
         if len(employees) == 0:
             errors.append(ErrorCode.rule_employee_not_found)
             employee = None
@@ -28,17 +43,16 @@ class RuleEngine:
             details["employee_id"] = str(employee.id)
 
         if extraction.requested_action == RequestedActionEnum.swap:
-            partner, partner_errors = await self._resolve_partner_and_validate_swap(
-                session, extraction, employee, details
+            partner, partner_errors = self._resolve_partner_and_validate_swap(
+                snapshot, extraction, employee, details
             )
             errors.extend(partner_errors)
             if partner and employee:
                 # Side A: partner takes requester's shift (current_shift_*)
                 if extraction.current_shift_date and extraction.current_shift_type:
-                    skill_ok_a = await self._validate_skill_for_shift(
-                        session,
-                        extraction.current_shift_date,
-                        ShiftType(extraction.current_shift_type.value),
+                    current_shift_type = ShiftType(extraction.current_shift_type.value)
+                    skill_ok_a = self._skills_cover(
+                        snapshot.shift_at(extraction.current_shift_date, current_shift_type),
                         partner.skills,
                     )
                     if not skill_ok_a:
@@ -46,69 +60,65 @@ class RuleEngine:
                     cert_ok_a = self.validate_certifications(partner.certifications)
                     if not cert_ok_a:
                         errors.append(ErrorCode.rule_cert_expired)
-                    conflict_a = await self.check_shift_conflict(
-                        session,
+                    conflict_a = self._slot_conflict(
+                        snapshot,
                         extraction.current_shift_date,
-                        ShiftType(extraction.current_shift_type.value),
+                        current_shift_type,
                         allowed_assignee_id=employee.id,
                     )
                     if conflict_a:
                         errors.append(ErrorCode.rule_conflict)
 
                 # Side B: requester takes partner's shift (target_*)
-                skill_ok_b = await self.validate_skill_match(session, extraction, employee.skills)
+                target_shift_type = ShiftType(extraction.target_shift_type.value)
+                skill_ok_b = self._skills_cover(
+                    snapshot.shift_at(extraction.target_date, target_shift_type), employee.skills
+                )
                 if not skill_ok_b:
                     errors.append(ErrorCode.rule_skill_mismatch)
                 cert_ok_b = self.validate_certifications(employee.certifications)
                 if not cert_ok_b:
                     errors.append(ErrorCode.rule_cert_expired)
-                target_shift_type = ShiftType(extraction.target_shift_type.value)
-                conflict_b = await self.check_shift_conflict(
-                    session,
+                conflict_b = self._slot_conflict(
+                    snapshot,
                     extraction.target_date,
                     target_shift_type,
                     allowed_assignee_id=partner.id,
                 )
                 if conflict_b:
                     errors.append(ErrorCode.rule_conflict)
-                    suggestions = await self.suggest_alternative_employee(
-                        session, extraction.target_date, target_shift_type
+                    suggestions = await self._suggestions_for(
+                        session, snapshot, extraction.target_date, target_shift_type
                     )
         else:
+            target_shift_type = ShiftType(extraction.target_shift_type.value)
             if employee:
-                skill_ok = await self.validate_skill_match(session, extraction, employee.skills)
+                skill_ok = self._skills_cover(
+                    snapshot.shift_at(extraction.target_date, target_shift_type), employee.skills
+                )
                 if not skill_ok:
                     errors.append(ErrorCode.rule_skill_mismatch)
                 cert_ok = self.validate_certifications(employee.certifications)
                 if not cert_ok:
                     errors.append(ErrorCode.rule_cert_expired)
-            target_shift_type = ShiftType(extraction.target_shift_type.value)
             conflict = False
             if employee:
                 # For cover: conflict only if the shift is taken by someone other than the requester.
                 # Explicitly check requester's shift first so we don't falsely conflict when they own it.
                 if extraction.requested_action == RequestedActionEnum.cover:
-                    requester_shift = await session.scalar(
-                        select(Shift).where(
-                            and_(
-                                Shift.date == extraction.target_date,
-                                Shift.type == target_shift_type,
-                                Shift.assigned_employee_id == employee.id,
-                            )
-                        )
-                    )
+                    requester_shift = snapshot.shift_held_by(extraction.target_date, target_shift_type, employee.id)
                     if requester_shift is None:
-                        conflict = await self.check_shift_conflict(
-                            session, extraction.target_date, target_shift_type, allowed_assignee_id=None
+                        conflict = self._slot_conflict(
+                            snapshot, extraction.target_date, target_shift_type, allowed_assignee_id=None
                         )
                 else:
-                    conflict = await self.check_shift_conflict(
-                        session, extraction.target_date, target_shift_type, allowed_assignee_id=employee.id
+                    conflict = self._slot_conflict(
+                        snapshot, extraction.target_date, target_shift_type, allowed_assignee_id=employee.id
                     )
             if conflict:
                 errors.append(ErrorCode.rule_conflict)
-                suggestions = await self.suggest_alternative_employee(
-                    session, extraction.target_date, target_shift_type
+                suggestions = await self._suggestions_for(
+                    session, snapshot, extraction.target_date, target_shift_type
                 )
 
         return RuleEngineResult(
@@ -119,9 +129,38 @@ class RuleEngine:
             validationDetails=details,
         )
 
-    async def _resolve_partner_and_validate_swap(
+    async def _suggestions_for(
+        self, session: AsyncSession, snapshot: RosterSnapshot, shift_date: date, shift_type: ShiftType
+    ) -> list[dict]:
+        slot = (shift_date, shift_type)
+        if slot not in snapshot.suggestions:
+            snapshot.suggestions[slot] = await self.suggest_alternative_employee(session, shift_date, shift_type)
+        return snapshot.suggestions[slot]
+
+    @staticmethod
+    def _skills_cover(shift: Shift | None, employee_skills: dict) -> bool:
+        if not shift:
+            return True
+        required = set((shift.required_skills or {}).get("skills", []))
+        employee_set = set((employee_skills or {}).get("skills", []))
+        return required.issubset(employee_set)
+
+    @staticmethod
+    def _slot_conflict(
+        snapshot: RosterSnapshot,
+        shift_date: date,
+        shift_type: ShiftType,
+        allowed_assignee_id: UUID | None = None,
+    ) -> bool:
+        """Snapshot twin of check_shift_conflict."""
+        existing = snapshot.assigned_shift_at(shift_date, shift_type)
+        if existing is None:
+            return False
+        return allowed_assignee_id is None or existing.assigned_employee_id != allowed_assignee_id
+
+    def _resolve_partner_and_validate_swap(
         self,
-        session: AsyncSession,
+        snapshot: RosterSnapshot,
         extraction: ValidatedExtraction,
         requester: Employee | None,
         details: dict,
@@ -132,7 +171,7 @@ class RuleEngine:
         if not partner_first.strip() and not partner_last.strip():
             errs.append(ErrorCode.rule_employee_not_found)
             return None, errs
-        partners = await self.resolve_employee(session, partner_first or None, partner_last or None)
+        partners = snapshot.resolve_employee(partner_first or None, partner_last or None)
         if len(partners) == 0:
             errs.append(ErrorCode.rule_employee_not_found)
             return None, errs
@@ -149,22 +188,7 @@ class RuleEngine:
         last_name: str | None,
     ) -> list[Employee]:
         """Resolve by first only, last only, or both. Case-insensitive. Returns 0, 1, or many."""
-        first = (first_name or "").strip() or None
-        last = (last_name or "").strip() or None
-        if not first and not last:
-            return []
-        # Case-insensitive match so "john"/"doe" finds "John"/"Doe"
-        if first and last:
-            stmt = select(Employee).where(
-                Employee.first_name.ilike(first),
-                Employee.last_name.ilike(last),
-            )
-        elif first:
-            stmt = select(Employee).where(Employee.first_name.ilike(first))
-        else:
-            stmt = select(Employee).where(Employee.last_name.ilike(last))
-        result = await session.execute(stmt)
-        return list(result.scalars().all())
+        return await find_employees_by_name(session, first_name, last_name)
 
     async def validate_employee_exists(self, session: AsyncSession, employee_first_name: str, employee_last_name: str | None = None) -> Employee | None:
         """Convenience: returns single employee or None. Use resolve_employee for ambiguous handling."""
@@ -186,11 +210,7 @@ class RuleEngine:
                 )
             )
         )
-        if not shift:
-            return True
-        required = set((shift.required_skills or {}).get("skills", []))
-        employee_set = set((employee_skills or {}).get("skills", []))
-        return required.issubset(employee_set)
+        return self._skills_cover(shift, employee_skills)
 
     def validate_certifications(self, certifications: dict) -> bool:
         if not certifications:
@@ -198,6 +218,12 @@ class RuleEngine:
         expired = certifications.get("expired", False)
         return not expired
 
+    def qualifies_for(self, employee: Employee, shift: Shift | None) -> bool:
+        """Skill and certification rules for putting employee on shift (no shift: nothing required)."""
+        return self._skills_cover(shift, employee.skills or {}) and self.validate_certifications(
+            employee.certifications or {}
+        )
+
     async def _validate_skill_for_shift(
         self,
         session: AsyncSession,
@@ -210,11 +236,7 @@ class RuleEngine:
                 and_(Shift.date == shift_date, Shift.type == shift_type)
             )
         )
-        if not shift:
-            return True
-        required = set((shift.required_skills or {}).get("skills", []))
-        employee_set = set((employee_skills or {}).get("skills", []))
-        return required.issubset(employee_set)
+        return self._skills_cover(shift, employee_skills)
 
     async def check_shift_conflict(
         self,
@@ -240,49 +262,119 @@ class RuleEngine:
         return True
 
     async def suggest_alternative_employee(
-        self, session: AsyncSession, shift_date: date, shift_type: ShiftType
+        self,
+        session: AsyncSession,
+        shift_date: date,
+        shift_type: ShiftType,
+        top_k: int | None = None,
     ) -> list[dict]:
-        shifts = await session.execute(
-            select(Shift, Employee)
-            .join(Employee, Shift.assigned_employee_id == Employee.id, isouter=True)
-            .where(and_(Shift.date == shift_date, Shift.type == shift_type))
+        """
+        Top-k employees who could take the slot, ranked in one query.
+
+        Filters on the slot's required skills, valid certifications, not already holding the slot
+        and not marked unavailable that day; ranks by stated shift-type preference, then by
+        shifts already assigned in the slot's ISO week.
+        """
+        if top_k is None:
+            top_k = get_settings().suggestion_top_k
+        if top_k <= 0:
+            return []
+        week_start, _ = _iso_week(shift_date)
+        slot = and_(Shift.date == shift_date, Shift.type == shift_type)
+        required = (
+            select(Shift.required_skills["skills"])
+            .where(slot)
+            .limit(1)
+            .scalar_subquery()
+        )
+        have = func.coalesce(Employee.skills["skills"], literal([], JSONB))
+        holds_slot = exists().where(slot, Shift.assigned_employee_id == Employee.id)
+        weekly_count = weekly_total_for(Employee.id, week_start).label("shifts_this_week")
+        preference_rank = case(
+            (Employee.availability["preferred_shift_types"].contains([shift_type.value]), 0),
+            (Employee.availability.has_key("preferred_shift_types"), 2),
+            else_=1,
+        )
+        stmt = (
+            select(Employee, weekly_count)
+            .where(
+                have.op("@>")(func.coalesce(required, literal([], JSONB))),
+                certifications_valid(Employee.certifications),
+                ~holds_slot,
+                available_on(Employee.availability, shift_date),
+            )
+            .order_by(preference_rank, weekly_count, Employee.last_name, Employee.first_name)
+            .limit(top_k)
         )
-        taken_ids = {row.Employee.id for row in shifts if row.Employee is not None}
-        result = await session.execute(select(Employee))
-        candidates = result.scalars().all()
-        suggestions = []
-        for employee in candidates:
-            if employee.id in taken_ids:
-                continue
-            suggestions.append({"employee_first_name": employee.first_name, "employee_last_name": employee.last_name, "reason": "Available for requested slot"})
-            if len(suggestions) >= 3:
-                break
-        return suggestions
+        result = await session.execute(stmt)
+        return [
+            {
+                "employee_id": str(emp.id),
+                "employee_first_name": emp.first_name,
+                "employee_last_name": emp.last_name,
+                "shifts_this_week": int(count or 0),
+                "reason": f"Eligible for requested slot; {int(count or 0)} shift(s) this week",
+            }
+            for emp, count in result.all()
+        ]
 
     async def get_eligible_candidates_for_shift(
         self, session: AsyncSession, shift: Shift
     ) -> list[tuple[Employee, str]]:
         """Return (Employee, reason) for employees who can take this shift (skills, certs, no conflict)."""
-        result = await session.execute(select(Employee))
-        all_employees = result.scalars().all()
-        out: list[tuple[Employee, str]] = []
-        for emp in all_employees:
-            reasons: list[str] = []
-            skill_ok = await self._validate_skill_for_shift(
-                session, shift.date, shift.type, emp.skills or {}
-            )
-            if not skill_ok:
-                reasons.append("skill mismatch")
-            cert_ok = self.validate_certifications(emp.certifications or {})
-            if not cert_ok:
-                reasons.append("cert expired")
-            conflict = await self.check_shift_conflict(
-                session, shift.date, shift.type, allowed_assignee_id=emp.id
-            )
-            if not conflict:
-                reasons.append("already has shift that day/type")
-            if reasons:
-                continue
-            out.append((emp, "Eligible"))
-        return out
+        rows = await self.get_eligible_candidates_with_workload(session, shift)
+        return [(emp, "Eligible") for emp, _ in rows]
+
+    async def get_eligible_candidates_with_workload(
+        self, session: AsyncSession, shift: Shift
+    ) -> list[tuple[Employee, int]]:
+        """
+        Return (Employee, shifts assigned in the shift's ISO week) for every eligible employee.
+
+        One statement: JSONB containment for skills, a cert filter, an anti-join on the slot,
+        and the weekly count read from employee_workload. Eligibility matches the per-employee checks
+        (_validate_skill_for_shift, validate_certifications, check_shift_conflict).
+        """
+        week_start, _ = _iso_week(shift.date)
+        required = list((shift.required_skills or {}).get("skills", []))
+
+        slot = and_(Shift.date == shift.date, Shift.type == shift.type)
+        holds_slot = exists().where(slot, Shift.assigned_employee_id == Employee.id)
+        # check_shift_conflict(..., allowed_assignee_id=emp.id) is True only when someone else holds the slot.
+        slot_taken = exists().where(slot, Shift.assigned_employee_id.is_not(None))
+        weekly_count = weekly_total_for(Employee.id, week_start)
+        stmt = select(Employee, weekly_count).where(
+            skills_contain(Employee.skills, required),
+            certifications_valid(Employee.certifications),
+            slot_taken,
+            ~holds_slot,
+        )
+        result = await session.execute(stmt)
+        return [(emp, int(count or 0)) for emp, count in result.all()]
+
+
+def _iso_week(d: date) -> tuple[date, date]:
+    start = d - timedelta(days=d.weekday())
+    return start, start + timedelta(days=6)
+
+
+def available_on(availability_column, shift_date: date):
+    """False when availability lists the date under "unavailable_dates" (ISO strings)."""
+    unavailable = func.coalesce(availability_column["unavailable_dates"], literal([], JSONB))
+    return ~unavailable.op("@>")(literal([shift_date.isoformat()], JSONB))
+
+
+# JSON values Python treats as falsy; validate_certifications only rejects a truthy "expired".
+_FALSY_JSON = (False, None, 0, "", [], {})
+
+
+def skills_contain(skills_column, required: list[str]):
+    """SQL twin of set(required).issubset(skills["skills"]) using JSONB containment."""
+    have = func.coalesce(skills_column["skills"], literal([], JSONB))
+    return have.op("@>")(literal(sorted(set(required)), JSONB))
+
 
+def certifications_valid(certifications_column):
+    """SQL twin of RuleEngine.validate_certifications."""
+    expired = func.coalesce(certifications_column["expired"], literal(False, JSONB))
+    return or_(certifications_column.is_(None), expired.in_([literal(v, JSONB) for v in _FALSY_JSON]))
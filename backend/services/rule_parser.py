@@ -0,0 +1,119 @@
+import re
+from datetime import date, timedelta
+
+from backend.schemas import ParsedExtraction, RequestedActionEnum, ShiftTypeEnum
+
+_WEEKDAYS = {
+    "monday": 0, "mon": 0, "tuesday": 1, "tue": 1, "tues": 1, "wednesday": 2, "wed": 2,
+    "thursday": 3, "thu": 3, "thurs": 3, "friday": 4, "fri": 4, "saturday": 5, "sat": 5, "sunday": 6, "sun": 6,
+}
+_DATE = r"(?:on\s+)?(?:today|tonight|tomorrow|tmrw|\d{4}-\d{2}-\d{2}|" + "|".join(_WEEKDAYS) + r")"
+_TYPE = r"(?:morning|night)"
+_NAME = r"[A-Za-z][A-Za-z'-]*"
+# Words that may follow "with" but are never a partner's name.
+_NOT_NAMES = frozenset({"my", "me", "the", "a", "someone", "anyone", "him", "her", "them"})
+
+_COVER = re.compile(
+    rf"(?:(?:can|could)\s+(?:someone|anyone|somebody)\s+|please\s+|i\s+need\s+(?:someone\s+to\s+)?)?"
+    rf"cover\s+(?:for\s+)?my\s+(?:(?P<type>{_TYPE})\s+)?shift\s+(?P<date>{_DATE})(?:\s+please)?",
+    re.IGNORECASE,
+)
+_MOVE = re.compile(
+    rf"(?:please\s+|can\s+you\s+)?move\s+me\s+to\s+(?:the\s+)?(?P<type>{_TYPE})s?(?:\s+shift)?\s+(?P<date>{_DATE})",
+    re.IGNORECASE,
+)
+_SWAP = re.compile(
+    rf"swap\s+my\s+(?P<cur_date>{_DATE})\s+(?P<cur_type>{_TYPE})(?:\s+shift)?\s+with\s+"
+    rf"(?P<first>{_NAME})(?:\s+(?P<last>{_NAME}))?'s\s+(?P<p_date>{_DATE})\s+(?P<p_type>{_TYPE})(?:\s+shift)?",
+    re.IGNORECASE,
+)
+
+_DATE_MENTION = re.compile(rf"\b{_DATE}\b", re.IGNORECASE)
+
+
+def resolve_date(phrase: str, today: date) -> date | None:
+    """
+    Resolve a date phrase against the org's today. Returns None when the phrase is ambiguous,
+    e.g. a weekday name that is also today ("Friday" said on a Friday), so the caller falls back.
+    """
+    word = phrase.lower().removeprefix("on").strip()
+    if word in ("today", "tonight"):
+        return today
+    if word in ("tomorrow", "tmrw"):
+        return today + timedelta(days=1)
+    if word in _WEEKDAYS:
+        ahead = (_WEEKDAYS[word] - today.weekday()) % 7
+        return today + timedelta(days=ahead) if ahead else None
+    try:
+        return date.fromisoformat(word)
+    except ValueError:
+        return None
+
+
+def mentioned_dates(text: str, today: date) -> list[date]:
+    """Every date phrase in free text that resolves unambiguously, e.g. to rank a request before it is parsed."""
+    dates = (resolve_date(m.group(0), today) for m in _DATE_MENTION.finditer(text))
+    return [d for d in dates if d is not None]
+
+
+def _shift_type(word: str | None) -> ShiftTypeEnum | None:
+    return ShiftTypeEnum(word.lower()) if word else None
+
+
+def parse_deterministic(text: str, first_name: str, last_name: str | None, today: date) -> ParsedExtraction | None:
+    """
+    Parse the handful of request templates that make up most traffic without calling the LLM.
+
+    Only whole-text matches count, and every date must resolve unambiguously; anything else
+    returns None and the caller uses the provider. Output follows the provider prompt's contract
+    (swap: current_* is the requester's shift, target_* and partner_shift_* the partner's).
+    """
+    cleaned = " ".join(text.split()).rstrip(".!?")
+    requester = {"employee_first_name": first_name, "employee_last_name": last_name}
+
+    if m := _COVER.fullmatch(cleaned):
+        day = resolve_date(m["date"], today)
+        if day is None:
+            return None
+        shift_type = _shift_type(m["type"])
+        return ParsedExtraction(
+            **requester,
+            current_shift_date=day,
+            current_shift_type=shift_type,
+            target_date=day,
+            target_shift_type=shift_type,
+            requested_action=RequestedActionEnum.cover,
+        )
+
+    if m := _MOVE.fullmatch(cleaned):
+        day = resolve_date(m["date"], today)
+        if day is None:
+            return None
+        return ParsedExtraction(
+            **requester,
+            target_date=day,
+            target_shift_type=_shift_type(m["type"]),
+            requested_action=RequestedActionEnum.move,
+        )
+
+    if m := _SWAP.fullmatch(cleaned):
+        if m["first"].lower() in _NOT_NAMES:
+            return None
+        current_day = resolve_date(m["cur_date"], today)
+        partner_day = resolve_date(m["p_date"], today)
+        if current_day is None or partner_day is None:
+            return None
+        partner_type = _shift_type(m["p_type"])
+        return ParsedExtraction(
+            **requester,
+            current_shift_date=current_day,
+            current_shift_type=_shift_type(m["cur_type"]),
+            target_date=partner_day,
+            target_shift_type=partner_type,
+            requested_action=RequestedActionEnum.swap,
+            partner_employee_first_name=m["first"],
+            partner_employee_last_name=m["last"],
+            partner_shift_date=partner_day,
+            partner_shift_type=partner_type,
+        )
+    return None
@@ -1,19 +1,28 @@
+import asyncio
 import hashlib
 import json
+import logging
 import uuid
-from datetime import UTC, datetime, date, timedelta
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, date
+from typing import Any
 
 from sqlalchemy import and_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db import redis_client
+from backend.db import SessionLocal, redis_client
 from backend.errors import AppError
 from backend.models import AuditLog, Employee, RequestMetrics, RequestStatus, ScheduleRequest, Shift, ShiftType
 from backend.models import EmployeeRole
 from backend.schemas import (
+    BatchConflict,
+    BatchPreviewIn,
+    BatchPreviewItem,
+    BatchPreviewResponse,
     ErrorCode,
     ParsedExtraction,
+    ParsePathEnum,
     PreviewRequestIn,
     PreviewResponse,
     RequestedActionEnum,
@@ -23,12 +32,53 @@ from backend.schemas import (
     ShiftCandidateOut,
     ShiftOut,
     ShiftsResponse,
+    ShiftTypeEnum,
     StructuredRequestIn,
     ValidatedExtraction,
 )
-from backend.services.extraction_service import ExtractionService
+from backend.services.extraction_service import ExtractionService, ProgressCallback
+from backend.services.roster_snapshot import RosterSnapshot
 from backend.services.rule_engine import RuleEngine
-from backend.time_utils import org_now, org_tz
+from backend.services.swap_cycle_service import swap_cycle_solver
+from backend.services.workload import record_assignment_change
+from backend.time_utils import is_urgent_shift_date, org_now
+
+logger = logging.getLogger("shift-scheduler")
+
+
+def _claimed_slots(extraction: ValidatedExtraction) -> set[tuple[date, ShiftTypeEnum]]:
+    """Slots an extraction would put someone into if approved (covers only release a slot)."""
+    action = extraction.requested_action
+    if action == RequestedActionEnum.cover:
+        return set()
+    if action == RequestedActionEnum.swap:
+        slots = {
+            (
+                extraction.partner_shift_date or extraction.target_date,
+                extraction.partner_shift_type or extraction.target_shift_type,
+            )
+        }
+        if extraction.current_shift_date and extraction.current_shift_type:
+            slots.add((extraction.current_shift_date, extraction.current_shift_type))
+        return slots
+    return {(extraction.target_date, extraction.target_shift_type)}
+
+
+def find_batch_conflicts(extractions: list[ValidatedExtraction]) -> list[BatchConflict]:
+    """Group batch items by the slots they claim; any slot claimed by two or more items is a conflict."""
+    claims: dict[tuple[date, ShiftTypeEnum], list[int]] = {}
+    for index, extraction in enumerate(extractions):
+        for slot in _claimed_slots(extraction):
+            claims.setdefault(slot, []).append(index)
+    return [
+        BatchConflict(date=slot_date, type=slot_type, items=items)
+        for (slot_date, slot_type), items in sorted(claims.items(), key=lambda kv: (kv[0][0], kv[0][1].value))
+        if len(items) > 1
+    ]
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
 class SchedulerService:
@@ -116,6 +166,7 @@ class SchedulerService:
                 parsed_at=parsed_at,
                 validated_at=validated_at,
                 rejected_at=validated_at if status == RequestStatus.rejected else None,
+                parse_path=extraction.parse_path.value,
             )
         )
         session.add(
@@ -125,6 +176,7 @@ class SchedulerService:
                     "request_id": str(schedule_request.id),
                     "status": status.value,
                     "provider": extraction.provider_name,
+                    "parse_path": extraction.parse_path.value,
                     "correlation_id": correlation_id,
                 },
             )
@@ -134,7 +186,7 @@ class SchedulerService:
             approval_id = str(schedule_request.id)
             await redis_client.set(f"approval:{approval_id}", approval_id, ex=900)
         await session.commit()
-        return ScheduleRequestOut(
+        result = ScheduleRequestOut(
             requestId=schedule_request.id,
             status=status.value,
             extractionVersion=extraction.extraction_version,
@@ -145,6 +197,9 @@ class SchedulerService:
             idempotentHit=False,
             summary=self._build_summary(parsed_dict, rule_result),
         )
+        if status == RequestStatus.pending_partner:
+            await self._propose_swap_cycles(schedule_request.id)
+        return result
 
     async def preview_structured(
         self,
@@ -152,20 +207,7 @@ class SchedulerService:
         payload: StructuredRequestIn,
     ):
         """Validate a structured request without creating a ScheduleRequest."""
-        parsed = ParsedExtraction(
-            employee_first_name=payload.employee_first_name,
-            employee_last_name=payload.employee_last_name,
-            current_shift_date=payload.current_shift_date,
-            current_shift_type=payload.current_shift_type,
-            target_date=payload.target_date,
-            target_shift_type=payload.target_shift_type,
-            requested_action=payload.requested_action,
-            reason=payload.reason,
-            partner_employee_first_name=payload.partner_employee_first_name,
-            partner_employee_last_name=payload.partner_employee_last_name,
-            partner_shift_date=payload.partner_shift_date,
-            partner_shift_type=payload.partner_shift_type,
-        )
+        parsed = self._parsed_from_structured(payload)
         validated = self.extraction_service._apply_defaults(parsed)
         rule_result = await self.rule_engine.validate_request(session, validated)
         return {
@@ -178,6 +220,7 @@ class SchedulerService:
         session: AsyncSession,
         payload: PreviewRequestIn,
         current_user: Employee | None = None,
+        on_progress: ProgressCallback | None = None,
     ) -> PreviewResponse:
         """Unified preview: accept text or structured; return parsed, validation, summary."""
         if payload.text and payload.text.strip():
@@ -192,6 +235,7 @@ class SchedulerService:
                 session=session,
                 text=payload.text.strip(),
                 current_user=current_user,
+                on_progress=on_progress,
             )
             parsed_dict = parsed.model_dump(mode="json")
             if needs:
@@ -207,29 +251,157 @@ class SchedulerService:
 
             validated = self.extraction_service._apply_defaults(parsed)
             validated_dict = validated.model_dump(mode="json")
+            if on_progress is not None:
+                await on_progress("validating", {"parsed": validated_dict})
             rule_result = await self.rule_engine.validate_request(session, validated)
         else:
             st = payload.structured
-            parsed = ParsedExtraction(
-                employee_first_name=st.employee_first_name,
-                employee_last_name=st.employee_last_name,
-                current_shift_date=st.current_shift_date,
-                current_shift_type=st.current_shift_type,
-                target_date=st.target_date,
-                target_shift_type=st.target_shift_type,
-                requested_action=st.requested_action,
-                reason=st.reason,
-                partner_employee_first_name=st.partner_employee_first_name,
-                partner_employee_last_name=st.partner_employee_last_name,
-                partner_shift_date=st.partner_shift_date,
-                partner_shift_type=st.partner_shift_type,
-            )
+            parsed = self._parsed_from_structured(st)
             validated = self.extraction_service._apply_defaults(parsed)
             validated_dict = validated.model_dump(mode="json")
             rule_result = await self.rule_engine.validate_request(session, validated)
         summary = self._build_summary(validated_dict, rule_result)
         return PreviewResponse(parsed=validated_dict, validation=rule_result, summary=summary, needsInput=[])
 
+    async def preview_stream(
+        self,
+        payload: PreviewRequestIn,
+        current_user: Employee,
+        correlation_id: str,
+    ) -> AsyncIterator[str]:
+        """
+        preview_unified as server-sent events: queued, parsing, partial (fields as the model
+        emits them), validating, then result (a PreviewResponse) or error (the AppError body).
+        Opens its own session: the body outlives the request's dependency scope.
+        """
+        events: asyncio.Queue[tuple[str, dict[str, Any]] | None] = asyncio.Queue()
+
+        async def emit(event: str, data: dict[str, Any]) -> None:
+            await events.put((event, data))
+
+        async def run() -> None:
+            try:
+                async with SessionLocal() as session:
+                    result = await self.preview_unified(session, payload, current_user, on_progress=emit)
+                await emit("result", result.model_dump(mode="json"))
+            except AppError as exc:
+                await emit(
+                    "error",
+                    {
+                        "errorCode": exc.error_code.value,
+                        "userMessage": exc.user_message,
+                        "developerMessage": exc.developer_message,
+                        "correlationId": correlation_id,
+                    },
+                )
+            except Exception as exc:
+                logger.exception("preview stream %s failed", correlation_id)
+                await emit(
+                    "error",
+                    {
+                        "errorCode": ErrorCode.db_error.value,
+                        "userMessage": "The request could not be processed. Please try again.",
+                        "developerMessage": f"{type(exc).__name__}: {str(exc)[:500]}",
+                        "correlationId": correlation_id,
+                    },
+                )
+            finally:
+                await events.put(None)
+
+        yield _sse("queued", {"correlationId": correlation_id})
+        task = asyncio.create_task(run())
+        try:
+            while (item := await events.get()) is not None:
+                yield _sse(*item)
+        finally:
+            # Client went away: stop the model call rather than finishing it for nobody.
+            task.cancel()
+
+    async def preview_batch(
+        self,
+        session: AsyncSession,
+        payload: BatchPreviewIn,
+        current_user: Employee | None = None,
+    ) -> BatchPreviewResponse:
+        """
+        Validate many requests against one shared RosterSnapshot.
+
+        Free-text requests are parsed together (ExtractionService.parse_many_lenient); a text
+        that fails to parse or needs more input is reported invalid on its own without failing
+        the batch. Each ready item is checked against the current roster on its own; items that
+        claim the same shift slot as each other are reported in conflicts / conflictsWith.
+        """
+        if payload.texts and current_user is None:
+            raise AppError(
+                ErrorCode.validation_error,
+                "Authentication is required for preview.",
+                "current_user was null in preview_batch(texts).",
+                401,
+            )
+        ready: list[tuple[int, ValidatedExtraction]] = [
+            (index, self.extraction_service._apply_defaults(self._parsed_from_structured(item)))
+            for index, item in enumerate(payload.items)
+        ]
+        not_ready: dict[int, BatchPreviewItem] = {}
+        if payload.texts:
+            drafts = await self.extraction_service.parse_many_lenient(
+                session, [text.strip() for text in payload.texts], current_user
+            )
+            for offset, draft in enumerate(drafts):
+                index = len(payload.items) + offset
+                if isinstance(draft, AppError):
+                    rule_result = RuleEngineResult(
+                        valid=False, errorCodes=[draft.error_code], reason=draft.user_message
+                    )
+                    not_ready[index] = BatchPreviewItem(
+                        index=index, parsed={}, validation=rule_result, summary=draft.user_message
+                    )
+                    continue
+                parsed, needs = draft
+                if needs:
+                    parsed_dict = parsed.model_dump(mode="json")
+                    rule_result = RuleEngineResult(
+                        valid=False,
+                        errorCodes=[ErrorCode.validation_error],
+                        reason="Additional information required to preview this request.",
+                        suggestions=[],
+                        validationDetails={"needsInput": [n.model_dump() for n in needs]},
+                    )
+                    not_ready[index] = BatchPreviewItem(
+                        index=index,
+                        parsed=parsed_dict,
+                        validation=rule_result,
+                        summary=self._build_summary(parsed_dict, rule_result),
+                    )
+                    continue
+                ready.append((index, self.extraction_service._apply_defaults(parsed)))
+
+        validated = [extraction for _, extraction in ready]
+        snapshot = await RosterSnapshot.load(session, validated)
+        conflicts = find_batch_conflicts(validated)
+        for conflict in conflicts:
+            conflict.items = [ready[i][0] for i in conflict.items]
+        conflicts_by_item: dict[int, set[int]] = {}
+        for conflict in conflicts:
+            for index in conflict.items:
+                conflicts_by_item.setdefault(index, set()).update(i for i in conflict.items if i != index)
+
+        results: list[BatchPreviewItem] = list(not_ready.values())
+        for index, extraction in ready:
+            rule_result = await self.rule_engine.validate_request(session, extraction, snapshot=snapshot)
+            parsed_dict = extraction.model_dump(mode="json")
+            results.append(
+                BatchPreviewItem(
+                    index=index,
+                    parsed=parsed_dict,
+                    validation=rule_result,
+                    summary=self._build_summary(parsed_dict, rule_result),
+                    conflictsWith=sorted(conflicts_by_item.get(index, ())),
+                )
+            )
+        results.sort(key=lambda item: item.index)
+        return BatchPreviewResponse(results=results, conflicts=conflicts)
+
     async def process_structured_request(
         self,
         session: AsyncSession,
@@ -237,20 +409,7 @@ class SchedulerService:
         correlation_id: str,
         current_user: Employee,
     ) -> ScheduleRequestOut:
-        parsed = ParsedExtraction(
-            employee_first_name=payload.employee_first_name,
-            employee_last_name=payload.employee_last_name,
-            current_shift_date=payload.current_shift_date,
-            current_shift_type=payload.current_shift_type,
-            target_date=payload.target_date,
-            target_shift_type=payload.target_shift_type,
-            requested_action=payload.requested_action,
-            reason=payload.reason,
-            partner_employee_first_name=payload.partner_employee_first_name,
-            partner_employee_last_name=payload.partner_employee_last_name,
-            partner_shift_date=payload.partner_shift_date,
-            partner_shift_type=payload.partner_shift_type,
-        )
+        parsed = self._parsed_from_structured(payload)
         validated = self.extraction_service._apply_defaults(parsed)
         parsed_dict = validated.model_dump(mode="json")
         fingerprint = self._fingerprint(parsed_dict)
@@ -327,6 +486,7 @@ class SchedulerService:
                 parsed_at=parsed_at,
                 validated_at=validated_at,
                 rejected_at=validated_at if status == RequestStatus.rejected else None,
+                parse_path=ParsePathEnum.structured.value,
             )
         )
 
@@ -348,7 +508,7 @@ class SchedulerService:
             await redis_client.set(f"approval:{approval_id}", approval_id, ex=900)
 
         await session.commit()
-        return ScheduleRequestOut(
+        result = ScheduleRequestOut(
             requestId=schedule_request.id,
             status=status.value,
             extractionVersion=self.extraction_service.provider.extraction_version,
@@ -359,6 +519,20 @@ class SchedulerService:
             idempotentHit=False,
             summary=self._build_summary(parsed_dict, rule_result),
         )
+        if status == RequestStatus.pending_partner:
+            await self._propose_swap_cycles(schedule_request.id)
+        return result
+
+    async def _propose_swap_cycles(self, request_id: uuid.UUID) -> None:
+        """
+        Feed a committed swap request to the rotation solver. It runs on its own session so a
+        failure here cannot roll back or expire anything the caller still reads.
+        """
+        try:
+            async with SessionLocal() as session:
+                await swap_cycle_solver.submitted(session, request_id)
+        except Exception:
+            logger.exception("swap cycle check for request %s failed", request_id)
 
     async def request_unified(
         self,
@@ -432,29 +606,16 @@ class SchedulerService:
         shift = await session.get(Shift, shift_id)
         if not shift:
             return []
-        pairs = await self.rule_engine.get_eligible_candidates_for_shift(session, shift)
-        week_start = shift.date - timedelta(days=shift.date.weekday())
-        week_end = week_start + timedelta(days=6)
-        out: list[ShiftCandidateOut] = []
-        for emp, reason in pairs:
-            count_stmt = select(Shift).where(
-                and_(
-                    Shift.date >= week_start,
-                    Shift.date <= week_end,
-                    Shift.assigned_employee_id == emp.id,
-                )
-            )
-            count_result = await session.execute(count_stmt)
-            shifts_this_week = len(count_result.scalars().all())
-            out.append(
-                ShiftCandidateOut(
-                    employee_id=emp.id,
-                    full_name=emp.full_name,
-                    reason=reason,
-                    shifts_this_week=shifts_this_week,
-                )
+        rows = await self.rule_engine.get_eligible_candidates_with_workload(session, shift)
+        return [
+            ShiftCandidateOut(
+                employee_id=emp.id,
+                full_name=emp.full_name,
+                reason="Eligible",
+                shifts_this_week=shifts_this_week,
             )
-        return out
+            for emp, shifts_this_week in rows
+        ]
 
     async def assign_shift(
         self,
@@ -471,6 +632,7 @@ class SchedulerService:
                 f"Shift {shift_id} not found.",
                 404,
             )
+        await record_assignment_change(session, shift.date, shift.type, shift.assigned_employee_id, employee_id)
         shift.assigned_employee_id = employee_id
         stmt = select(ScheduleRequest).where(
             ScheduleRequest.coverage_shift_id == shift_id,
@@ -499,7 +661,6 @@ class SchedulerService:
         rows = result.scalars().all()
         unresolved = {RequestStatus.pending_partner, RequestStatus.pending_admin, RequestStatus.pending_fill, RequestStatus.pending}
         now = org_now()
-        cutoff = now + timedelta(hours=48)
         items = []
         for req in rows:
             requester = await session.get(Employee, req.requester_employee_id) if getattr(req, "requester_employee_id", None) else None
@@ -523,8 +684,7 @@ class SchedulerService:
                             shift_date = d if isinstance(d, date) else date.fromisoformat(str(d))
                             break
                 if shift_date is not None:
-                    shift_start = datetime.combine(shift_date, datetime.min.time(), tzinfo=org_tz())
-                    urgent = shift_start <= cutoff
+                    urgent = is_urgent_shift_date(shift_date, now)
             items.append(
                 ScheduleRequestListItem(
                     requestId=req.id,
@@ -618,6 +778,23 @@ class SchedulerService:
             stmt = stmt.where(Shift.assigned_employee_id == assigned_employee_id)
         return await session.scalar(stmt)
 
+    @staticmethod
+    def _parsed_from_structured(payload: StructuredRequestIn) -> ParsedExtraction:
+        return ParsedExtraction(
+            employee_first_name=payload.employee_first_name,
+            employee_last_name=payload.employee_last_name,
+            current_shift_date=payload.current_shift_date,
+            current_shift_type=payload.current_shift_type,
+            target_date=payload.target_date,
+            target_shift_type=payload.target_shift_type,
+            requested_action=payload.requested_action,
+            reason=payload.reason,
+            partner_employee_first_name=payload.partner_employee_first_name,
+            partner_employee_last_name=payload.partner_employee_last_name,
+            partner_shift_date=payload.partner_shift_date,
+            partner_shift_type=payload.partner_shift_type,
+        )
+
     @staticmethod
     def _build_summary(parsed: dict, validation: RuleEngineResult) -> str:
         """Human-readable one-line summary for UI."""
@@ -0,0 +1,170 @@
+from dataclasses import dataclass
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Employee, RequestStatus, ScheduleRequest, Shift
+from backend.schemas import (
+    ConflictGraphNode,
+    ConflictGraphResponse,
+    RequestConflict,
+    ShiftTypeEnum,
+)
+from backend.services.rule_engine import RuleEngine
+
+UNRESOLVED_STATUSES = (
+    RequestStatus.pending,
+    RequestStatus.pending_admin,
+    RequestStatus.pending_partner,
+    RequestStatus.pending_fill,
+)
+
+Slot = tuple[date, ShiftTypeEnum]
+
+
+@dataclass(frozen=True)
+class Placement:
+    """One hypothetical assignment a request would make if approved."""
+
+    request_id: UUID
+    employee_id: UUID | None
+    slot: Slot
+
+
+def _as_date(value) -> date | None:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def _slot(ext: dict, date_key: str, type_key: str) -> Slot | None:
+    slot_date = _as_date(ext.get(date_key))
+    slot_type = ext.get(type_key)
+    if slot_date is None or not slot_type:
+        return None
+    return slot_date, ShiftTypeEnum(slot_type)
+
+
+def placements_for(request: ScheduleRequest) -> list[Placement]:
+    """
+    Assignments a request would make: a move places the requester on the target slot, a swap
+    places each side on the other's slot. Covers only release a slot, so they place no one.
+    """
+    ext = request.validated_extraction or {}
+    action = ext.get("requested_action") or "move"
+    if action == "cover":
+        return []
+    if action == "swap":
+        out = []
+        partner_slot = _slot(ext, "partner_shift_date", "partner_shift_type") or _slot(ext, "target_date", "target_shift_type")
+        if partner_slot:
+            out.append(Placement(request.id, request.requester_employee_id, partner_slot))
+        current_slot = _slot(ext, "current_shift_date", "current_shift_type")
+        if current_slot:
+            out.append(Placement(request.id, request.partner_employee_id, current_slot))
+        return out
+    target = _slot(ext, "target_date", "target_shift_type")
+    return [Placement(request.id, request.requester_employee_id, target)] if target else []
+
+
+def build_conflict_graph(
+    requests: list[ScheduleRequest],
+    employees: dict[UUID, Employee],
+    shifts: list[Shift],
+) -> ConflictGraphResponse:
+    """
+    Apply every request's placements in memory and connect requests that cannot all be approved.
+
+    Placements are bucketed by slot and by (employee, date), so the pass is linear in the number
+    of placements; only requests that actually share a bucket are linked.
+    """
+    shifts_by_slot: dict[Slot, Shift] = {}
+    for shift in shifts:
+        shifts_by_slot.setdefault((shift.date, ShiftTypeEnum(shift.type.value)), shift)
+
+    by_slot: dict[Slot, list[Placement]] = {}
+    by_employee_day: dict[tuple[UUID, date], list[Placement]] = {}
+    for request in requests:
+        for placement in placements_for(request):
+            by_slot.setdefault(placement.slot, []).append(placement)
+            if placement.employee_id is not None:
+                by_employee_day.setdefault((placement.employee_id, placement.slot[0]), []).append(placement)
+
+    rule_engine = RuleEngine()
+
+    def skill_ok(placement: Placement) -> bool:
+        """Would this placement pass the skill and certification rules on its own?"""
+        employee = employees.get(placement.employee_id) if placement.employee_id else None
+        if employee is None:
+            return False
+        return rule_engine.qualifies_for(employee, shifts_by_slot.get(placement.slot))
+
+    conflicts: list[RequestConflict] = []
+    for (slot_date, slot_type), placements in sorted(by_slot.items(), key=lambda kv: (kv[0][0], kv[0][1].value)):
+        request_ids = list(dict.fromkeys(p.request_id for p in placements))
+        if len(request_ids) < 2:
+            continue
+        conflicts.append(
+            RequestConflict(
+                kind="slot_contention",
+                date=slot_date,
+                type=slot_type,
+                requestIds=request_ids,
+                skillEligibleRequestIds=list(dict.fromkeys(p.request_id for p in placements if skill_ok(p))),
+            )
+        )
+    for (employee_id, day), placements in sorted(by_employee_day.items(), key=lambda kv: (kv[0][1], str(kv[0][0]))):
+        request_ids = list(dict.fromkeys(p.request_id for p in placements))
+        if len(request_ids) < 2:
+            continue
+        conflicts.append(
+            RequestConflict(kind="employee_double_booked", date=day, employee_id=employee_id, requestIds=request_ids)
+        )
+
+    neighbours: dict[UUID, set[UUID]] = {}
+    for conflict in conflicts:
+        for request_id in conflict.requestIds:
+            neighbours.setdefault(request_id, set()).update(r for r in conflict.requestIds if r != request_id)
+
+    nodes = [
+        ConflictGraphNode(
+            requestId=request.id,
+            status=request.status.value,
+            requested_action=(request.validated_extraction or {}).get("requested_action"),
+            conflictsWith=sorted(neighbours.get(request.id, ()), key=str),
+        )
+        for request in requests
+    ]
+    return ConflictGraphResponse(requests=nodes, conflicts=conflicts)
+
+
+class SimulationService:
+    async def conflict_graph(self, session: AsyncSession) -> ConflictGraphResponse:
+        """Conflict graph over every unresolved request, loaded in three queries regardless of count."""
+        requests = list(
+            (
+                await session.execute(
+                    select(ScheduleRequest)
+                    .where(ScheduleRequest.status.in_(UNRESOLVED_STATUSES))
+                    .order_by(ScheduleRequest.created_at)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        placements = [p for request in requests for p in placements_for(request)]
+        employee_ids = {p.employee_id for p in placements if p.employee_id is not None}
+        dates = {p.slot[0] for p in placements}
+
+        employees: dict[UUID, Employee] = {}
+        if employee_ids:
+            result = await session.execute(select(Employee).where(Employee.id.in_(employee_ids)))
+            employees = {e.id: e for e in result.scalars().all()}
+        shifts: list[Shift] = []
+        if dates:
+            result = await session.execute(select(Shift).where(Shift.date.in_(dates)))
+            shifts = list(result.scalars().all())
+        return build_conflict_graph(requests, employees, shifts)
+
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from backend.config import get_settings
+from backend.db import redis_client
+from backend.deadline import MIN_ATTEMPT_SECONDS, deadline_exceeded, remaining
+from backend.errors import AppError
+from backend.schemas import ErrorCode, ParsedExtraction
+
+LOCK_PREFIX = "singleflight:lock:"
+RESULT_PREFIX = "singleflight:result:"
+RESULT_TTL_SECONDS = 30
+POLL_SECONDS = 0.1
+
+# Delete the lock only if we still own it (it may have expired and been taken by another replica).
+_RELEASE = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+
+
+def _encode_error(exc: AppError) -> dict:
+    return {
+        "error_code": exc.error_code.value,
+        "user_message": exc.user_message,
+        "developer_message": exc.developer_message,
+        "status_code": exc.status_code,
+        "headers": exc.headers,
+    }
+
+
+def _decode_error(data: dict) -> AppError:
+    return AppError(
+        ErrorCode(data["error_code"]),
+        data["user_message"],
+        data["developer_message"],
+        data["status_code"],
+        headers=data.get("headers"),
+    )
+
+
+class SingleFlight:
+    """
+    Coalesce identical in-flight parses so one provider call serves every concurrent caller.
+
+    Within a process, callers with the same key await one future. Across replicas the leader
+    holds a Redis lock (SET NX PX) and hands its outcome, a ParsedExtraction or an AppError,
+    to other replicas' waiters through a short-lived result key they poll. A waiter that sees
+    the lock vanish without a result (leader crashed), or waits past SINGLE_FLIGHT_WAIT_SECONDS,
+    runs the parse itself. Waiting and the lock lease never outlast the request deadline; a
+    waiter whose deadline runs out fails with the deadline error instead of parsing. Redis
+    failures degrade to per-process coalescing.
+    """
+
+    def __init__(self, redis: Redis | None = None, wait_seconds: float | None = None) -> None:
+        settings = get_settings()
+        self.redis = redis or redis_client
+        self.wait_seconds = settings.single_flight_wait_seconds if wait_seconds is None else wait_seconds
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[ParsedExtraction]]) -> tuple[ParsedExtraction, bool]:
+        """Return (result, led): led is False when the result came from another caller's call."""
+        future = self._inflight.get(key)
+        if future is not None:
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader's caller went away; this caller still wants the result.
+                return await self.do(key, fn)
+            self.coalesced += 1
+            return result.model_copy(), False
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result, led = await self._across_replicas(key, fn)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; mark it retrieved so an unwaited future does not log a warning.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result.model_copy(), led
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _across_replicas(
+        self, key: str, fn: Callable[[], Awaitable[ParsedExtraction]]
+    ) -> tuple[ParsedExtraction, bool]:
+        token = uuid.uuid4().hex
+        wait = self.wait_seconds
+        left = remaining()
+        if left is not None:
+            wait = max(0.0, min(wait, left))
+        lock_ms = max(1, int(wait * 1000))
+        try:
+            acquired = await self.redis.set(LOCK_PREFIX + key, token, nx=True, px=lock_ms)
+        except RedisError:
+            return await fn(), True
+        if acquired:
+            try:
+                await self.redis.delete(RESULT_PREFIX + key)  # an earlier flight's outcome
+            except RedisError:
+                pass
+            return await self._lead(key, token, fn), True
+
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_SECONDS)
+            try:
+                raw = await self.redis.get(RESULT_PREFIX + key)
+                if raw is None and not await self.redis.exists(LOCK_PREFIX + key):
+                    raw = await self.redis.get(RESULT_PREFIX + key)
+                    if raw is None:
+                        break
+            except RedisError:
+                break
+            if raw is not None:
+                outcome = json.loads(raw)
+                if "error" in outcome:
+                    raise _decode_error(outcome["error"])
+                self.coalesced += 1
+                return ParsedExtraction.model_validate(outcome["parsed"]), False
+        left = remaining()
+        if left is not None and left < MIN_ATTEMPT_SECONDS:
+            raise deadline_exceeded(f"Request deadline reached ({left:.2f}s left) waiting on a coalesced parse.")
+        return await fn(), True
+
+    async def _lead(self, key: str, token: str, fn: Callable[[], Awaitable[ParsedExtraction]]) -> ParsedExtraction:
+        try:
+            result = await fn()
+        except AppError as exc:
+            await self._publish(key, token, {"error": _encode_error(exc)})
+            raise
+        except BaseException:
+            # Unexpected failures are not shared: waiters find no result and parse themselves.
+            await self._release(key, token)
+            raise
+        await self._publish(key, token, {"parsed": result.model_dump(mode="json")})
+        return result
+
+    async def _publish(self, key: str, token: str, outcome: dict) -> None:
+        try:
+            await self.redis.set(RESULT_PREFIX + key, json.dumps(outcome), ex=RESULT_TTL_SECONDS)
+        except RedisError:
+            pass
+        await self._release(key, token)
+
+    async def _release(self, key: str, token: str) -> None:
+        try:
+            await self.redis.eval(_RELEASE, 1, LOCK_PREFIX + key, token)
+        except RedisError:
+            pass
+
+
+parse_single_flight = SingleFlight()
@@ -0,0 +1,299 @@
+import asyncio
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import get_settings
+from backend.models import AuditLog, Employee, RequestStatus, ScheduleRequest, Shift
+from backend.schemas import SwapCycleOut, SwapCycleStep
+from backend.services.rule_engine import RuleEngine
+
+
+@dataclass(frozen=True)
+class SwapNode:
+    """An open swap request: the requester gives up offered_shift_id and wants wanted_shift_id."""
+
+    request_id: UUID
+    requester_id: UUID
+    offered_shift_id: UUID
+    wanted_shift_id: UUID
+    created_at: datetime
+
+
+_CYCLE_NAMESPACE = uuid.UUID("5f0c4d6e-8a53-4a36-9a1e-2b7f0d6c9e41")
+
+
+def canonical_cycle(cycle: list[UUID]) -> tuple[UUID, ...]:
+    """Rotate a cycle so it starts at its smallest request id; one key per cycle whatever the entry point."""
+    start = min(range(len(cycle)), key=lambda i: str(cycle[i]))
+    return tuple(cycle[start:] + cycle[:start])
+
+
+def cycle_id(key: tuple[UUID, ...]) -> UUID:
+    """The swap_cycle_id linking a cycle's requests; derived from its key so every worker agrees."""
+    return uuid.uuid5(_CYCLE_NAMESPACE, ",".join(str(rid) for rid in key))
+
+
+class SwapCycleSolver:
+    """
+    Directed "wants the shift offered by" graph over pending_partner swap requests.
+
+    Edge r -> s means r's requester wants the shift s's requester is offering, so a cycle
+    r1 -> ... -> rk -> r1 lets every requester take the shift they asked for. Nodes are added
+    incrementally: only cycles through the new node can be new, so each add runs one DFS
+    bounded by max_length instead of re-scanning the whole graph.
+
+    The submitting worker adds a request once it is committed (`submitted`); `refresh` picks up
+    requests other workers created since its watermark, and re-checks requesters who did not
+    yet qualify for the shift they want. A new cycle is linked by writing its cycle_id to every
+    member's swap_cycle_id, which also makes the proposal audit once-only across workers and
+    restarts.
+    """
+
+    def __init__(self, max_length: int | None = None) -> None:
+        self.max_length = max_length or get_settings().swap_cycle_max_length
+        self.nodes: dict[UUID, SwapNode] = {}
+        self.cycles: dict[tuple[UUID, ...], list[UUID]] = {}
+        self._offered_by: dict[UUID, set[UUID]] = {}
+        self._seen: set[UUID] = set()
+        self._unqualified: set[UUID] = set()
+        self._watermark: datetime | None = None
+        self._linked: set[tuple[UUID, ...]] = set()
+        self._lock = asyncio.Lock()
+
+    def add(self, node: SwapNode) -> list[list[UUID]]:
+        """Insert a node and return the cycles it closes."""
+        self.nodes[node.request_id] = node
+        self._offered_by.setdefault(node.offered_shift_id, set()).add(node.request_id)
+        found = []
+        for cycle in self._cycles_through(node):
+            key = canonical_cycle(cycle)
+            if key not in self.cycles:
+                self.cycles[key] = list(key)
+                found.append(list(key))
+        return found
+
+    def remove(self, request_id: UUID) -> None:
+        node = self.nodes.pop(request_id, None)
+        if node is None:
+            return
+        offered = self._offered_by.get(node.offered_shift_id)
+        if offered is not None:
+            offered.discard(request_id)
+            if not offered:
+                del self._offered_by[node.offered_shift_id]
+        for key in [k for k in self.cycles if request_id in k]:
+            del self.cycles[key]
+
+    def _cycles_through(self, start: SwapNode) -> list[list[UUID]]:
+        cycles: list[list[UUID]] = []
+        path = [start.request_id]
+        employees = {start.requester_id}
+
+        def visit(node: SwapNode) -> None:
+            for next_id in self._offered_by.get(node.wanted_shift_id, ()):
+                if next_id == start.request_id:
+                    if len(path) >= 2:
+                        cycles.append(list(path))
+                    continue
+                nxt = self.nodes[next_id]
+                if next_id in path or nxt.requester_id in employees or len(path) >= self.max_length:
+                    continue
+                path.append(next_id)
+                employees.add(nxt.requester_id)
+                visit(nxt)
+                employees.discard(nxt.requester_id)
+                path.pop()
+
+        visit(start)
+        return cycles
+
+    async def submitted(self, session: AsyncSession, request_id: UUID) -> None:
+        """Add a just-created pending_partner swap request and link the cycles it closes."""
+        request = await session.get(ScheduleRequest, request_id)
+        if (
+            request is None
+            or request.status != RequestStatus.pending_partner
+            or request.requester_shift_id is None
+            or request.partner_shift_id is None
+        ):
+            return
+        async with self._lock:
+            await self._ingest(session, [request])
+            await self._link_new(session)
+
+    async def refresh(self, session: AsyncSession) -> list[list[UUID]]:
+        """
+        Load swap requests created since the last refresh, plus still-open ones whose requester
+        did not qualify before, and return the cycles they close.
+        """
+        stmt = select(ScheduleRequest).where(
+            ScheduleRequest.status == RequestStatus.pending_partner,
+            ScheduleRequest.requester_shift_id.is_not(None),
+            ScheduleRequest.partner_shift_id.is_not(None),
+        )
+        if self._watermark is not None:
+            # >= so rows sharing the watermark timestamp are not lost; _seen skips the ones already loaded.
+            stmt = stmt.where(
+                or_(ScheduleRequest.created_at >= self._watermark, ScheduleRequest.id.in_(self._unqualified))
+            )
+        rows = list((await session.execute(stmt.order_by(ScheduleRequest.created_at))).scalars().all())
+        # Unqualified requests that are no longer open drop out here.
+        self._unqualified &= {r.id for r in rows}
+        for request in rows:
+            self._watermark = max(self._watermark or request.created_at, request.created_at)
+        return await self._ingest(session, rows)
+
+    async def _ingest(self, session: AsyncSession, rows: list[ScheduleRequest]) -> list[list[UUID]]:
+        rows = [r for r in rows if r.id not in self._seen]
+        if not rows:
+            return []
+        shift_ids = {r.partner_shift_id for r in rows}
+        employee_ids = {r.requester_employee_id for r in rows}
+        shifts = {
+            s.id: s for s in (await session.execute(select(Shift).where(Shift.id.in_(shift_ids)))).scalars().all()
+        }
+        employees = {
+            e.id: e
+            for e in (await session.execute(select(Employee).where(Employee.id.in_(employee_ids)))).scalars().all()
+        }
+
+        rule_engine = RuleEngine()
+        found: list[list[UUID]] = []
+        for request in rows:
+            requester = employees.get(request.requester_employee_id)
+            wanted = shifts.get(request.partner_shift_id)
+            if requester is None or wanted is None or not rule_engine.qualifies_for(requester, wanted):
+                # Skills or certifications may change; refresh looks at it again while it is open.
+                self._unqualified.add(request.id)
+                continue
+            self._unqualified.discard(request.id)
+            self._seen.add(request.id)
+            found.extend(
+                self.add(
+                    SwapNode(
+                        request_id=request.id,
+                        requester_id=request.requester_employee_id,
+                        offered_shift_id=request.requester_shift_id,
+                        wanted_shift_id=request.partner_shift_id,
+                        created_at=request.created_at,
+                    )
+                )
+            )
+        return found
+
+    async def _link_new(self, session: AsyncSession) -> None:
+        """
+        Write cycle_id to the members of every cycle not yet linked and audit it once. A cycle is
+        linked only when all its members are still open and unlinked (the UPDATE matches every
+        row). A rotation another worker already linked is only recorded as linked; one overlapping
+        a linked rotation is left alone.
+        """
+        linked = []
+        for key in [k for k in self.cycles if k not in self._linked]:
+            current = (
+                await session.execute(select(ScheduleRequest.swap_cycle_id).where(ScheduleRequest.id.in_(key)))
+            ).scalars().all()
+            if len(current) == len(key) and all(c == cycle_id(key) for c in current):
+                linked.append(key)  # linked earlier, by this worker before a restart or by another one
+                continue
+            savepoint = await session.begin_nested()
+            result = await session.execute(
+                update(ScheduleRequest)
+                .where(
+                    ScheduleRequest.id.in_(key),
+                    ScheduleRequest.status == RequestStatus.pending_partner,
+                    ScheduleRequest.swap_cycle_id.is_(None),
+                )
+                .values(swap_cycle_id=cycle_id(key))
+            )
+            if result.rowcount != len(key):
+                await savepoint.rollback()
+                continue
+            await savepoint.commit()
+            session.add(
+                AuditLog(
+                    action="swap.cycle.proposed",
+                    meta={
+                        "cycle_id": str(cycle_id(key)),
+                        "request_ids": [str(rid) for rid in key],
+                        "length": len(key),
+                    },
+                )
+            )
+            linked.append(key)
+        self._linked.update(linked)
+        await session.commit()
+
+    async def proposals(self, session: AsyncSession) -> list[SwapCycleOut]:
+        """
+        Refresh, then re-check every cached cycle against the live roster before proposing it.
+
+        Members that left pending_partner, or whose requester no longer holds the offered shift,
+        are pruned here rather than on every refresh; the remaining members of a pruned cycle are
+        unlinked so they can join another. New cycles are linked and audited once.
+        """
+        async with self._lock:
+            await self.refresh(session)
+            member_ids = {rid for cycle in self.cycles.values() for rid in cycle}
+            if not member_ids:
+                return []
+            still_open = set(
+                (
+                    await session.execute(
+                        select(ScheduleRequest.id).where(
+                            ScheduleRequest.id.in_(member_ids),
+                            ScheduleRequest.status == RequestStatus.pending_partner,
+                        )
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            offered = {self.nodes[rid].offered_shift_id for rid in member_ids if rid in self.nodes}
+            holders = dict(
+                (await session.execute(select(Shift.id, Shift.assigned_employee_id).where(Shift.id.in_(offered)))).all()
+            )
+            before = set(self.cycles)
+            for rid in member_ids:
+                node = self.nodes.get(rid)
+                if rid not in still_open or node is None or holders.get(node.offered_shift_id) != node.requester_id:
+                    self.remove(rid)
+            broken = before - set(self.cycles)
+            if broken:
+                await session.execute(
+                    update(ScheduleRequest)
+                    .where(
+                        ScheduleRequest.swap_cycle_id.in_([cycle_id(key) for key in broken]),
+                        ScheduleRequest.status == RequestStatus.pending_partner,
+                    )
+                    .values(swap_cycle_id=None)
+                )
+                self._linked -= broken
+            await self._link_new(session)
+            return [self._to_out(cycle) for cycle in self.cycles.values()]
+
+    def _to_out(self, cycle: list[UUID]) -> SwapCycleOut:
+        steps = [
+            SwapCycleStep(
+                requestId=rid,
+                employee_id=self.nodes[rid].requester_id,
+                gives_shift_id=self.nodes[rid].offered_shift_id,
+                takes_shift_id=self.nodes[rid].wanted_shift_id,
+            )
+            for rid in cycle
+        ]
+        key = tuple(cycle)
+        return SwapCycleOut(
+            cycleId=cycle_id(key),
+            linked=key in self._linked,
+            requestIds=list(cycle),
+            steps=steps,
+        )
+
+
+swap_cycle_solver = SwapCycleSolver()
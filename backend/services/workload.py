@@ -0,0 +1,126 @@
+from collections.abc import Iterable
+from datetime import date, timedelta
+from uuid import UUID
+
+from sqlalchemy import Date, and_, cast, delete, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import EmployeeWorkload, Shift, ShiftType, WorkloadPeriod
+
+# (shift date, shift type, previous assignee, new assignee)
+AssignmentChange = tuple[date, ShiftType, UUID | None, UUID | None]
+
+
+def period_starts(d: date) -> dict[WorkloadPeriod, date]:
+    return {
+        WorkloadPeriod.week: d - timedelta(days=d.weekday()),
+        WorkloadPeriod.month: d.replace(day=1),
+    }
+
+
+def workload_deltas(changes: Iterable[AssignmentChange]) -> list[dict]:
+    """Net counter deltas per (employee, period, period_start); changes that cancel out are dropped."""
+    deltas: dict[tuple[UUID, WorkloadPeriod, date], list[int]] = {}
+    for shift_date, shift_type, old_id, new_id in changes:
+        if old_id == new_id:
+            continue
+        kind = ShiftType(shift_type)
+        for employee_id, sign in ((old_id, -1), (new_id, 1)):
+            if employee_id is None:
+                continue
+            for period, start in period_starts(shift_date).items():
+                row = deltas.setdefault((employee_id, period, start), [0, 0, 0])
+                row[0] += sign
+                row[1 if kind == ShiftType.morning else 2] += sign
+    return [
+        {"employee_id": e, "period": p, "period_start": s, "total": t, "morning": m, "night": n}
+        for (e, p, s), (t, m, n) in deltas.items()
+        if (t, m, n) != (0, 0, 0)
+    ]
+
+
+async def record_assignment_changes(session: AsyncSession, changes: Iterable[AssignmentChange]) -> None:
+    """
+    Apply assignment changes to employee_workload in the caller's transaction (one upsert).
+
+    Call next to every write of Shift.assigned_employee_id, before the caller commits.
+    """
+    rows = workload_deltas(changes)
+    if not rows:
+        return
+    stmt = insert(EmployeeWorkload).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EmployeeWorkload.employee_id, EmployeeWorkload.period, EmployeeWorkload.period_start],
+        set_={
+            "total": EmployeeWorkload.total + stmt.excluded.total,
+            "morning": EmployeeWorkload.morning + stmt.excluded.morning,
+            "night": EmployeeWorkload.night + stmt.excluded.night,
+        },
+    )
+    await session.execute(stmt)
+
+
+async def record_assignment_change(
+    session: AsyncSession,
+    shift_date: date,
+    shift_type: ShiftType,
+    old_employee_id: UUID | None,
+    new_employee_id: UUID | None,
+) -> None:
+    await record_assignment_changes(session, [(shift_date, shift_type, old_employee_id, new_employee_id)])
+
+
+async def weekly_totals(session: AsyncSession, employee_id: UUID, week_starts: Iterable[date]) -> dict[date, int]:
+    """One employee's shift count per ISO week (keyed by Monday) in a single primary-key lookup."""
+    starts = set(week_starts)
+    if not starts:
+        return {}
+    result = await session.execute(
+        select(EmployeeWorkload.period_start, EmployeeWorkload.total).where(
+            EmployeeWorkload.employee_id == employee_id,
+            EmployeeWorkload.period == WorkloadPeriod.week,
+            EmployeeWorkload.period_start.in_(starts),
+        )
+    )
+    totals = dict.fromkeys(starts, 0)
+    totals.update(dict(result.all()))
+    return totals
+
+
+def weekly_total_for(employee_column, week_start: date):
+    """Correlated scalar subquery: the outer employee's shift count for the ISO week starting week_start."""
+    return func.coalesce(
+        select(EmployeeWorkload.total)
+        .where(
+            and_(
+                EmployeeWorkload.employee_id == employee_column,
+                EmployeeWorkload.period == WorkloadPeriod.week,
+                EmployeeWorkload.period_start == week_start,
+            )
+        )
+        .scalar_subquery(),
+        0,
+    )
+
+
+async def rebuild_workload(session: AsyncSession) -> None:
+    """Recompute every counter from shifts (backfill, bulk imports, repair). Runs in the caller's transaction."""
+    await session.execute(delete(EmployeeWorkload))
+    for period in WorkloadPeriod:
+        start = cast(func.date_trunc(literal_column(f"'{period.value}'"), Shift.date), Date)
+        await session.execute(
+            insert(EmployeeWorkload).from_select(
+                ["employee_id", "period", "period_start", "total", "morning", "night"],
+                select(
+                    Shift.assigned_employee_id,
+                    literal(period, EmployeeWorkload.__table__.c.period.type),
+                    start,
+                    func.count(),
+                    func.count().filter(Shift.type == ShiftType.morning),
+                    func.count().filter(Shift.type == ShiftType.night),
+                )
+                .where(Shift.assigned_employee_id.is_not(None))
+                .group_by(Shift.assigned_employee_id, start),
+            )
+        )
@@ -1,5 +1,5 @@
 """Integration tests: approval flow (list pending with urgent order, approve, reject, double approve/reject 409, admin-only).
-Stories A1–A4, A8.
+Stories A1–A4, A8, A9b (conflict graph).
 """
 from datetime import date, timedelta
 
@@ -138,3 +138,38 @@ async def test_non_admin_reject_returns_403(
 
     r_reject = await http_client.post(f"/approval/{request_id}/reject", headers=alex_headers)
     assert r_reject.status_code == 403, r_reject.text
+
+
+@pytest.mark.integration
+async def test_conflict_graph_links_moves_onto_same_slot(
+    http_client, john_headers, alex_headers, admin_headers
+):
+    """A9b: Two pending moves onto the same slot -> GET /approval/conflicts links them; pending items carry conflictsWith."""
+    target = (date.today() + timedelta(days=8)).isoformat()
+    request_ids = []
+    for first, last, headers in (("John", "Doe", john_headers), ("Alex", "Johnson", alex_headers)):
+        payload = {
+            "employee_first_name": first,
+            "employee_last_name": last,
+            "target_date": target,
+            "target_shift_type": "morning",
+            "requested_action": "move",
+        }
+        r = await http_client.post("/schedule/request/structured", json=payload, headers=headers)
+        assert r.status_code == 200, r.text
+        request_ids.append(r.json()["requestId"])
+
+    r = await http_client.get("/approval/conflicts", headers=john_headers)
+    assert r.status_code == 403
+
+    r = await http_client.get("/approval/conflicts", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    contention = [
+        c for c in r.json()["conflicts"]
+        if c["kind"] == "slot_contention" and c["date"] == target and c["type"] == "morning"
+    ]
+    assert len(contention) == 1
+    assert set(request_ids) <= set(contention[0]["requestIds"])
+
+    pending = {i["requestId"]: i for i in (await http_client.get("/approval/pending", headers=admin_headers)).json()}
+    assert request_ids[1] in pending[request_ids[0]]["conflictsWith"]
@@ -58,11 +58,43 @@ async def test_metrics_returns_structure_admin_only(
     assert "parse_time_avg" in data
     assert "validation_time_avg" in data
     assert "approval_latency_avg" in data
+    assert isinstance(data["parse_path_counts"], dict)
+    assert set(data["parse_time_avg_by_path"]) == set(data["parse_path_counts"])
 
     r_non_admin = await http_client.get("/metrics", headers=john_headers)
     assert r_non_admin.status_code == 403, r_non_admin.text
 
 
+@pytest.mark.integration
+async def test_llm_metrics_reports_extraction_cache_admin_only(
+    http_client, admin_headers, john_headers
+):
+    """O3b: GET /metrics/llm -> extraction cache and near-duplicate bypass counters; admin only."""
+    r = await http_client.get("/metrics/llm", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    data = r.json()
+    for field in ("cache_enabled", "cache_hits", "cache_misses", "cache_hit_rate", "cache_entries", "cache_evictions"):
+        assert field in data
+    for field in (
+        "near_duplicate_enabled",
+        "near_duplicate_lookups",
+        "near_duplicate_hits",
+        "near_duplicate_bypass_rate",
+        "single_flight_coalesced",
+        "llm_http_pool",
+        "admission",
+        "failover",
+        "prompt_usage",
+        "json_repair",
+    ):
+        assert field in data
+    assert 0.0 <= data["cache_hit_rate"] <= 1.0
+    assert 0.0 <= data["near_duplicate_bypass_rate"] <= 1.0
+
+    r_non_admin = await http_client.get("/metrics/llm", headers=john_headers)
+    assert r_non_admin.status_code == 403, r_non_admin.text
+
+
 @pytest.mark.integration
 async def test_api_error_has_structured_body(
     http_client, john_headers
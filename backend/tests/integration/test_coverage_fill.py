@@ -1,5 +1,5 @@
 """Integration tests: coverage fill (candidates eligibility, assign, request approved; admin-only).
-Stories A5–A7, A8.
+Stories A5–A7, A8, A10 (auto-fill), A11 (roster optimizer).
 """
 from datetime import date, timedelta
 
@@ -174,3 +174,89 @@ async def test_non_admin_assign_returns_403(
         headers=alex_headers,
     )
     assert r.status_code == 403, r.text
+
+
+@pytest.mark.integration
+async def test_admin_coverage_overview_ranks_by_eligible_count(http_client, admin_headers, alex_headers):
+    """A9: Admin calls GET /schedule/coverage -> per-shift eligible counts, fewest eligible ranked first; 403 if not admin."""
+    r = await http_client.get("/schedule/coverage", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["employee_count"] >= 1
+    shifts = body["shifts"]
+    assert shifts, "Seed shifts expected in the default 30-day window"
+    counts = [s["eligible_count"] for s in shifts]
+    assert counts == sorted(counts)
+    assert [s["risk_rank"] for s in shifts] == list(range(1, len(shifts) + 1))
+
+    # Counts agree with the per-shift candidates endpoint.
+    sample = shifts[-1]
+    r_candidates = await http_client.get(f"/schedule/shifts/{sample['shift_id']}/candidates", headers=admin_headers)
+    assert r_candidates.status_code == 200, r_candidates.text
+    assert len(r_candidates.json()) == sample["eligible_count"]
+
+    r_forbidden = await http_client.get("/schedule/coverage", headers=alex_headers)
+    assert r_forbidden.status_code == 403, r_forbidden.text
+
+
+@pytest.mark.integration
+async def test_admin_auto_fill_previews_then_applies_matching(
+    http_client, alex_headers, admin_headers
+):
+    """A10: POST /schedule/coverage/auto-fill previews a min-cost assignment; apply=true assigns and approves pending_fill."""
+    today = date.today()
+    # Seed: day5 night (basic) is held by Alex.
+    cover_payload = {
+        "employee_first_name": "Alex",
+        "employee_last_name": "Johnson",
+        "current_shift_date": (today + timedelta(days=5)).isoformat(),
+        "current_shift_type": "night",
+        "target_date": (today + timedelta(days=5)).isoformat(),
+        "target_shift_type": "night",
+        "requested_action": "cover",
+    }
+    r_req = await http_client.post("/schedule/request/structured", json=cover_payload, headers=alex_headers)
+    assert r_req.status_code == 200, r_req.text
+    request_id = r_req.json()["requestId"]
+
+    r = await http_client.post("/schedule/coverage/auto-fill", headers=alex_headers)
+    assert r.status_code == 403
+
+    r_preview = await http_client.post("/schedule/coverage/auto-fill", headers=admin_headers)
+    assert r_preview.status_code == 200, r_preview.text
+    preview = r_preview.json()
+    assert preview["applied"] is False
+    planned = next((a for a in preview["assignments"] if a["request_id"] == request_id), None)
+    assert planned is not None, preview
+    assert planned["full_name"] not in ("Alex Johnson", "ExpiredCert Doe", "Michael Johnson")
+
+    r_apply = await http_client.post("/schedule/coverage/auto-fill?apply=true", headers=admin_headers)
+    assert r_apply.status_code == 200, r_apply.text
+    assert r_apply.json()["applied"] is True
+
+    r_requests = await http_client.get("/schedule/requests", headers=admin_headers)
+    status = next(i["status"] for i in r_requests.json() if i["requestId"] == request_id)
+    assert status == "approved"
+
+
+@pytest.mark.integration
+async def test_admin_roster_optimize_previews_open_slots(http_client, admin_headers):
+    """A11: POST /schedule/roster/optimize plans every open slot in the horizon without writing; bad horizon -> 400."""
+    today = date.today()
+    body = {"from_date": today.isoformat(), "to_date": (today + timedelta(days=10)).isoformat()}
+    r = await http_client.post("/schedule/roster/optimize", json=body, headers=admin_headers)
+    assert r.status_code == 200, r.text
+    plan = r.json()
+    assert plan["applied"] is False
+    assert plan["slots"] == len(plan["assignments"])
+    assert 0.0 <= plan["coverage"] <= 1.0
+    # Seed: day4 morning requires advanced and is open; only Priya has advanced.
+    day4 = next(a for a in plan["assignments"] if a["date"] == (today + timedelta(days=4)).isoformat() and a["type"] == "morning")
+    assert day4["full_name"] in (None, "Priya Smith")
+
+    r_bad = await http_client.post(
+        "/schedule/roster/optimize",
+        json={"from_date": body["to_date"], "to_date": body["from_date"]},
+        headers=admin_headers,
+    )
+    assert r_bad.status_code == 400
@@ -97,6 +97,19 @@ async def test_patch_employee_duplicate_name_returns_409(
     assert r.json().get("errorCode") == "EMPLOYEE_DUPLICATE_NAME"
 
 
+@pytest.mark.integration
+async def test_patch_employee_duplicate_name_is_case_insensitive(
+    http_client, admin_headers, employee_ids
+):
+    """CRUD5b: Duplicate-name check matches case-insensitively ("john doe" collides with John Doe)."""
+    alex_id = employee_ids.get("Alex Johnson")
+    assert alex_id
+    payload = {"first_name": "john", "last_name": "DOE"}
+    r = await http_client.patch(f"/employees/{alex_id}", json=payload, headers=admin_headers)
+    assert r.status_code == 409, r.text
+    assert r.json().get("errorCode") == "EMPLOYEE_DUPLICATE_NAME"
+
+
 @pytest.mark.integration
 async def test_non_admin_post_employees_returns_403(
     http_client, john_headers
@@ -1,6 +1,8 @@
 """Integration tests: schedule preview, request (text/structured), idempotency, date normalization, payload sanitization.
-Stories E1–E7, E12, E13.
+Stories E1–E7, E12, E13, E14, E15.
 """
+import asyncio
+import json
 from datetime import date, timedelta
 
 import pytest
@@ -135,6 +137,76 @@ async def test_duplicate_submit_returns_existing_request_idempotent(
     assert second["idempotentHit"] is True
 
 
+@pytest.mark.integration
+async def test_preview_stream_emits_queued_then_result(http_client, john_headers, shift_date_range):
+    """E15: POST /schedule/preview/stream -> text/event-stream with queued first and a PreviewResponse result last."""
+    today = date.today()
+    payload = {
+        "structured": {
+            "employee_first_name": "John",
+            "employee_last_name": "Doe",
+            "current_shift_date": (today + timedelta(days=1)).isoformat(),
+            "current_shift_type": "night",
+            "target_date": (today + timedelta(days=2)).isoformat(),
+            "target_shift_type": "morning",
+            "requested_action": "move",
+        }
+    }
+    r = await http_client.post("/schedule/preview/stream", json=payload, headers=john_headers)
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = [
+        (block.split("\n")[0].removeprefix("event: "), json.loads(block.split("\n")[1].removeprefix("data: ")))
+        for block in r.text.strip().split("\n\n")
+    ]
+    assert events[0][0] == "queued"
+    name, data = events[-1]
+    assert name == "result", events
+    assert "parsed" in data and "validation" in data and "summary" in data
+
+
+@pytest.mark.integration
+async def test_async_submit_returns_202_and_job_completes(
+    http_client, john_headers, alex_headers, shift_date_range
+):
+    """E14: POST /schedule/request/async -> 202 + jobId; polling GET /schedule/jobs/{id} yields the request; resubmit reuses the job."""
+    today = date.today()
+    payload = {
+        "structured": {
+            "employee_first_name": "John",
+            "employee_last_name": "Doe",
+            "current_shift_date": (today + timedelta(days=1)).isoformat(),
+            "current_shift_type": "night",
+            "target_date": (today + timedelta(days=9)).isoformat(),
+            "target_shift_type": "morning",
+            "requested_action": "move",
+        }
+    }
+    r = await http_client.post("/schedule/request/async", json=payload, headers=john_headers)
+    assert r.status_code == 202, r.text
+    job_id = r.json()["jobId"]
+
+    again = await http_client.post("/schedule/request/async", json=payload, headers=john_headers)
+    assert again.status_code == 202, again.text
+    assert again.json()["jobId"] == job_id
+    assert again.json()["duplicate"] is True
+
+    job = None
+    for _ in range(60):
+        r_job = await http_client.get(f"/schedule/jobs/{job_id}", headers=john_headers)
+        assert r_job.status_code == 200, r_job.text
+        job = r_job.json()
+        if job["status"] in ("succeeded", "failed"):
+            break
+        await asyncio.sleep(0.5)
+    assert job["status"] == "succeeded", job
+    assert job["result"]["requestId"]
+    assert job["result"]["summary"]
+
+    r_other = await http_client.get(f"/schedule/jobs/{job_id}", headers=alex_headers)
+    assert r_other.status_code == 404, r_other.text
+
+
 @pytest.mark.integration
 async def test_preview_structured_with_tomorrow_date_normalized(
     http_client, john_headers, shift_date_range
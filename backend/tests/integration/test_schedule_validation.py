@@ -1,5 +1,5 @@
 """Integration tests: schedule validation rules (employee not found, conflict, skill mismatch, cert expired).
-Stories E8–E11.
+Stories E8–E11 (E9c: batch preview).
 """
 from datetime import date, timedelta
 
@@ -47,6 +47,36 @@ async def test_shift_conflict_returns_rule_error(
     assert "RULE_CONFLICT" in data.get("validation", {}).get("errorCodes", [])
 
 
+@pytest.mark.integration
+async def test_conflict_suggestions_are_rule_eligible_and_ranked(
+    http_client, john_headers
+):
+    """E9b: Conflict suggestions only include employees with the slot's skills and valid certs, ranked by weekly load."""
+    today = date.today()
+    # Seed: day2 morning requires basic and is held by Priya.
+    payload = {
+        "structured": {
+            "employee_first_name": "John",
+            "employee_last_name": "Doe",
+            "target_date": (today + timedelta(days=2)).isoformat(),
+            "target_shift_type": "morning",
+            "requested_action": "move",
+        }
+    }
+    r = await http_client.post("/schedule/preview", json=payload, headers=john_headers)
+    assert r.status_code == 200, r.text
+    validation = r.json()["validation"]
+    assert "RULE_CONFLICT" in validation["errorCodes"]
+    suggestions = validation["suggestions"]
+    assert 1 <= len(suggestions) <= 3
+    names = {(s["employee_first_name"], s["employee_last_name"]) for s in suggestions}
+    assert ("Priya", "Smith") not in names  # already holds the slot
+    assert ("ExpiredCert", "Doe") not in names  # expired certification
+    assert ("Michael", "Johnson") not in names  # lacks "basic"
+    loads = [s["shifts_this_week"] for s in suggestions]
+    assert loads == sorted(loads)
+
+
 @pytest.mark.integration
 async def test_skill_mismatch_returns_rule_error(
     http_client, employee_ids
@@ -92,3 +122,48 @@ async def test_cert_expired_returns_rule_error(
     data = r.json()
     assert data.get("status") == "rejected"
     assert "RULE_CERT_EXPIRED" in data.get("validation", {}).get("errorCodes", [])
+
+
+@pytest.mark.integration
+async def test_batch_preview_validates_items_and_flags_shared_slot(
+    http_client, john_headers
+):
+    """E9c: Batch preview returns one validation per item and flags items claiming the same slot."""
+    today = date.today()
+    target = (today + timedelta(days=2)).isoformat()
+    items = [
+        {"employee_first_name": "John", "employee_last_name": "Doe", "target_date": target, "target_shift_type": "morning", "requested_action": "move"},
+        {"employee_first_name": "Alex", "employee_last_name": "Johnson", "target_date": target, "target_shift_type": "morning", "requested_action": "move"},
+        {"employee_first_name": "Nobody", "employee_last_name": "Here", "target_date": target, "target_shift_type": "night", "requested_action": "move"},
+    ]
+    r = await http_client.post("/schedule/preview/batch", json={"items": items}, headers=john_headers)
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert [item["index"] for item in data["results"]] == [0, 1, 2]
+    assert "RULE_EMPLOYEE_NOT_FOUND" in data["results"][2]["validation"]["errorCodes"]
+    assert data["results"][0]["conflictsWith"] == [1]
+    assert data["results"][2]["conflictsWith"] == []
+    assert data["conflicts"] == [{"date": target, "type": "morning", "items": [0, 1]}]
+
+
+@pytest.mark.integration
+async def test_batch_preview_accepts_free_text_alongside_structured_items(
+    http_client, john_headers
+):
+    """E9d: Batch preview parses free-text requests together; results index structured items first, then texts."""
+    target = (date.today() + timedelta(days=2)).isoformat()
+    items = [
+        {"employee_first_name": "Alex", "employee_last_name": "Johnson", "target_date": target, "target_shift_type": "night", "requested_action": "move"},
+    ]
+    texts = ["Move me to night tomorrow", "   "]
+    r = await http_client.post("/schedule/preview/batch", json={"items": items, "texts": texts}, headers=john_headers)
+    assert r.status_code == 422, r.text
+
+    r = await http_client.post(
+        "/schedule/preview/batch", json={"items": items, "texts": texts[:1]}, headers=john_headers
+    )
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert [item["index"] for item in data["results"]] == [0, 1]
+    assert data["results"][1]["parsed"]["employee_first_name"] == "John"
+    assert data["results"][1]["parsed"]["target_shift_type"] == "night"
@@ -0,0 +1,122 @@
+"""Unit tests: priority-aware admission control in front of provider calls."""
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from backend.errors import AppError
+from backend.schemas import ErrorCode
+from backend.services.admission import AdmissionController, Priority, request_priority
+from backend.time_utils import org_today
+
+
+def _controller(limit: int, max_queue: int = 8, max_wait: float = 5.0, reserve: int = 0) -> AdmissionController:
+    controller = AdmissionController(local_limit=limit, cluster_limit=0)
+    controller.max_queue = max_queue
+    controller.max_wait = max_wait
+    controller.reserve = reserve
+    return controller
+
+
+async def _hold(controller: AdmissionController, priority: Priority, order: list, release: asyncio.Event) -> None:
+    async with controller.slot(priority):
+        order.append(priority)
+        await release.wait()
+
+
+@pytest.mark.unit
+async def test_waiters_are_admitted_by_priority_then_arrival():
+    controller = _controller(limit=1)
+    order: list[Priority] = []
+    release = asyncio.Event()
+    release.set()
+    gate = asyncio.Event()
+    first = asyncio.create_task(_hold(controller, Priority.preview, order, gate))
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.create_task(_hold(controller, p, order, release))
+        for p in (Priority.preview, Priority.submit, Priority.urgent)
+    ]
+    await asyncio.sleep(0)
+    assert controller.stats()["queued"] == 3
+
+    gate.set()
+    await asyncio.gather(first, *waiters)
+    assert order == [Priority.preview, Priority.urgent, Priority.submit, Priority.preview]
+    assert controller.stats()["active"] == 0
+
+
+@pytest.mark.unit
+async def test_full_queue_sheds_with_retry_after_and_urgent_displaces_a_preview():
+    controller = _controller(limit=1, max_queue=1)
+    gate = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, Priority.submit, [], gate))
+    await asyncio.sleep(0)
+    queued_preview = asyncio.create_task(_hold(controller, Priority.preview, [], gate))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AppError) as rejected:
+        async with controller.slot(Priority.preview):
+            pass
+    assert rejected.value.status_code == 429
+    assert rejected.value.error_code == ErrorCode.llm_overloaded
+    assert int(rejected.value.headers["Retry-After"]) >= 1
+
+    urgent = asyncio.create_task(_hold(controller, Priority.urgent, [], gate))
+    await asyncio.sleep(0)
+    with pytest.raises(AppError) as displaced:
+        await queued_preview
+    assert displaced.value.status_code == 429
+
+    gate.set()
+    await asyncio.gather(holder, urgent)
+    assert controller.stats()["shed"] == 2
+
+
+@pytest.mark.unit
+async def test_waiting_past_the_deadline_fails_with_503():
+    controller = _controller(limit=1, max_wait=0.05)
+    gate = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, Priority.submit, [], gate))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AppError) as timed_out:
+        async with controller.slot(Priority.urgent):
+            pass
+    assert timed_out.value.status_code == 503
+    assert "Retry-After" in timed_out.value.headers
+    assert controller.stats()["queued"] == 0
+
+    gate.set()
+    await holder
+    assert controller.stats()["active"] == 0
+
+
+@pytest.mark.unit
+async def test_previews_leave_the_reserved_slot_to_submits():
+    controller = _controller(limit=2, reserve=1)
+    gate = asyncio.Event()
+    order: list[Priority] = []
+    preview = asyncio.create_task(_hold(controller, Priority.preview, order, gate))
+    await asyncio.sleep(0)
+    second_preview = asyncio.create_task(_hold(controller, Priority.preview, order, gate))
+    await asyncio.sleep(0)
+    assert controller.stats()["queued"] == 1
+
+    # The waiting preview cannot use the reserved slot; a submit takes it straight away.
+    submit = asyncio.create_task(_hold(controller, Priority.submit, order, gate))
+    await asyncio.sleep(0)
+    assert order == [Priority.preview, Priority.submit]
+
+    gate.set()
+    await asyncio.gather(preview, second_preview, submit)
+    assert sorted(order) == [Priority.submit, Priority.preview, Priority.preview]
+
+
+@pytest.mark.unit
+def test_request_priority_uses_the_48h_urgent_window():
+    today = org_today()
+    far = (today + timedelta(days=10)).isoformat()
+    assert request_priority("Can someone cover my shift tomorrow?", today, submit=False) is Priority.urgent
+    assert request_priority(f"Move me to nights on {far}", today, submit=True) is Priority.submit
+    assert request_priority(f"Move me to nights on {far}", today, submit=False) is Priority.preview
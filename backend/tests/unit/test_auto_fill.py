@@ -0,0 +1,89 @@
+"""Unit tests: min-cost bipartite coverage auto-fill (Hungarian solver + per-day planning)."""
+import itertools
+import time
+import uuid
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from backend.schemas import ShiftTypeEnum
+from backend.services.coverage_service import (
+    OpenShift,
+    PoolEmployee,
+    min_cost_assignment,
+    plan_auto_fill,
+)
+
+MONDAY = date(2026, 3, 2)
+
+
+def _employee(skills=("basic",), cert_ok=True, unavailable=(), preferred=()) -> PoolEmployee:
+    return PoolEmployee(uuid.uuid4(), tuple(skills), cert_ok, frozenset(unavailable), frozenset(preferred))
+
+
+def _open(d: date, t: ShiftTypeEnum = ShiftTypeEnum.morning, skills=("basic",)) -> OpenShift:
+    return OpenShift(uuid.uuid4(), uuid.uuid4(), d, t, tuple(skills))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("shape", [(3, 3), (2, 5), (5, 2), (4, 6)])
+def test_min_cost_assignment_matches_brute_force(shape):
+    rng = np.random.default_rng(sum(shape))
+    cost = rng.integers(0, 20, size=shape).astype(float)
+    pairs = min_cost_assignment(cost)
+    n, m = shape
+    assert len(pairs) == min(n, m)
+    assert len({r for r, _ in pairs}) == len({c for _, c in pairs}) == len(pairs)
+    if n <= m:
+        best = min(sum(cost[r, c] for r, c in enumerate(cols)) for cols in itertools.permutations(range(m), n))
+    else:
+        best = min(sum(cost[r, c] for c, r in enumerate(rows)) for rows in itertools.permutations(range(n), m))
+    assert sum(cost[r, c] for r, c in pairs) == best
+
+
+@pytest.mark.unit
+def test_plan_respects_eligibility_and_spreads_workload():
+    busy = _employee()
+    idle = _employee()
+    fresh = _employee()
+    no_skill = _employee(skills=())
+    expired = _employee(cert_ok=False)
+    away = _employee(unavailable=[MONDAY + timedelta(days=1)])
+    pool = [busy, idle, fresh, no_skill, expired, away]
+    # busy already works twice this week; away is off on Tuesday.
+    roster = [(MONDAY, ShiftTypeEnum.morning, busy.employee_id), (MONDAY + timedelta(days=2), ShiftTypeEnum.night, busy.employee_id)]
+    shifts = [_open(MONDAY + timedelta(days=1)), _open(MONDAY + timedelta(days=1), ShiftTypeEnum.night)]
+
+    plan = plan_auto_fill(shifts, pool, roster)
+
+    assigned = {pool[k].employee_id for _, k, _ in plan}
+    assert len(plan) == 2
+    # Skill, cert and availability exclusions leave busy/idle/fresh; busy already has two shifts this week.
+    assert assigned == {idle.employee_id, fresh.employee_id}
+    assert {i for i, _, _ in plan} == {0, 1}
+
+
+@pytest.mark.unit
+def test_plan_leaves_shift_unfilled_when_nobody_qualifies():
+    plan = plan_auto_fill([_open(MONDAY, skills=("advanced",))], [_employee()], [])
+    assert plan == []
+
+
+@pytest.mark.unit
+def test_plan_hundreds_of_shifts_in_seconds():
+    rng = np.random.default_rng(3)
+    skills = ["basic", "safety", "advanced", "forklift"]
+    pool = [_employee(skills=tuple(rng.choice(skills, size=2, replace=False))) for _ in range(500)]
+    shifts = [
+        _open(MONDAY + timedelta(days=int(i % 28)), ShiftTypeEnum.night if i % 2 else ShiftTypeEnum.morning, (skills[i % 4],))
+        for i in range(300)
+    ]
+    started = time.perf_counter()
+    plan = plan_auto_fill(shifts, pool, [])
+    assert time.perf_counter() - started < 5.0
+    assert len(plan) == 300
+    per_day = {}
+    for i, k, _ in plan:
+        per_day.setdefault(shifts[i].date, []).append(k)
+    assert all(len(ks) == len(set(ks)) for ks in per_day.values())
@@ -0,0 +1,85 @@
+"""Unit tests: batch preview shares one roster load and flags items claiming the same slot."""
+import uuid
+from datetime import date
+
+import pytest
+
+from backend.models import Employee, Shift, ShiftType
+from backend.schemas import (
+    BatchPreviewIn,
+    RequestedActionEnum,
+    ShiftTypeEnum,
+    StructuredRequestIn,
+    ValidatedExtraction,
+)
+from backend.services import scheduler_service
+from backend.services.roster_snapshot import RosterSnapshot
+from backend.services.scheduler_service import SchedulerService, find_batch_conflicts
+
+DAY1 = date(2026, 3, 2)
+DAY2 = date(2026, 3, 3)
+
+
+def _extraction(first: str, action: RequestedActionEnum, target: date, target_type: ShiftTypeEnum, **extra):
+    return ValidatedExtraction(
+        employee_first_name=first,
+        employee_last_name="Doe",
+        target_date=target,
+        target_shift_type=target_type,
+        requested_action=action,
+        **extra,
+    )
+
+
+@pytest.mark.unit
+def test_find_batch_conflicts_groups_items_by_claimed_slot():
+    items = [
+        _extraction("A", RequestedActionEnum.move, DAY2, ShiftTypeEnum.night),
+        _extraction("B", RequestedActionEnum.move, DAY2, ShiftTypeEnum.night),
+        # The swap partner would take C's DAY1 morning slot, which item 3 also moves into.
+        _extraction(
+            "C",
+            RequestedActionEnum.swap,
+            DAY2,
+            ShiftTypeEnum.morning,
+            current_shift_date=DAY1,
+            current_shift_type=ShiftTypeEnum.morning,
+        ),
+        _extraction("D", RequestedActionEnum.move, DAY1, ShiftTypeEnum.morning),
+        # Covers release a slot rather than claim one.
+        _extraction("E", RequestedActionEnum.cover, DAY2, ShiftTypeEnum.night),
+    ]
+
+    conflicts = find_batch_conflicts(items)
+
+    assert [(c.date, c.type, c.items) for c in conflicts] == [
+        (DAY1, ShiftTypeEnum.morning, [2, 3]),
+        (DAY2, ShiftTypeEnum.night, [0, 1]),
+    ]
+
+
+@pytest.mark.unit
+async def test_preview_batch_loads_roster_once(monkeypatch):
+    alex = Employee(id=uuid.uuid4(), first_name="Alex", last_name="Doe", skills={"skills": ["basic"]}, certifications={}, availability={})
+    sam = Employee(id=uuid.uuid4(), first_name="Sam", last_name="Doe", skills={"skills": ["basic"]}, certifications={}, availability={})
+    shift = Shift(id=uuid.uuid4(), date=DAY2, type=ShiftType.night, required_skills={"skills": ["basic"]}, assigned_employee_id=None)
+    loads = []
+
+    async def fake_load(session, extractions):
+        loads.append(list(extractions))
+        return RosterSnapshot([alex, sam], [shift])
+
+    monkeypatch.setattr(scheduler_service.RosterSnapshot, "load", fake_load)
+    payload = BatchPreviewIn(
+        items=[
+            StructuredRequestIn(employee_first_name=name, employee_last_name="Doe", target_date=DAY2, target_shift_type=ShiftTypeEnum.night, requested_action=RequestedActionEnum.move)
+            for name in ("Alex", "Sam")
+        ]
+    )
+
+    response = await SchedulerService().preview_batch(None, payload)
+
+    assert len(loads) == 1 and len(loads[0]) == 2
+    assert [r.validation.valid for r in response.results] == [True, True]
+    assert [r.conflictsWith for r in response.results] == [[1], [0]]
+    assert response.conflicts[0].items == [0, 1]
@@ -0,0 +1,58 @@
+"""Unit tests: vectorized employee x shift eligibility (bitmask skills, cert + slot arrays)."""
+import time
+
+import numpy as np
+import pytest
+
+from backend.services.coverage_service import compute_eligibility, encode_skill_masks
+
+
+@pytest.mark.unit
+def test_encode_skill_masks_spills_into_extra_words():
+    vocabulary = {f"s{i}": i for i in range(70)}
+    masks = encode_skill_masks([["s0", "s69"], ["unknown"]], vocabulary)
+    assert masks.shape == (2, 2)
+    assert masks[0, 0] == 1
+    assert masks[0, 1] == 1 << 5
+    assert not masks[1].any()
+
+
+@pytest.mark.unit
+def test_eligibility_matches_candidate_rules():
+    vocabulary = {"basic": 0, "advanced": 1}
+    employees = encode_skill_masks([["basic"], ["basic", "advanced"], ["basic"], []], vocabulary)
+    shifts = encode_skill_masks([["basic"], ["advanced"], []], vocabulary)
+    cert_ok = np.array([True, True, False, True])
+    # Shift 0 held by employee 0; shift 1 held by employee 3; shift 2 open.
+    slot_taken = np.array([True, True, False])
+    holds = np.zeros((4, 3), dtype=bool)
+    holds[0, 0] = True
+    holds[3, 1] = True
+
+    eligible = compute_eligibility(employees, cert_ok, shifts, slot_taken, holds)
+
+    assert eligible[:, 0].tolist() == [False, True, False, False]  # holder, expired cert, no skills excluded
+    assert eligible[:, 1].tolist() == [False, True, False, False]  # only employee 1 has "advanced"
+    assert not eligible[:, 2].any()  # open slots have no candidates, as in list_candidates
+
+
+@pytest.mark.unit
+def test_eligibility_5k_by_60_is_sub_second():
+    rng = np.random.default_rng(7)
+    vocabulary = {f"skill{i}": i for i in range(12)}
+    names = list(vocabulary)
+    employees = encode_skill_masks(
+        [list(rng.choice(names, size=4, replace=False)) for _ in range(5000)], vocabulary
+    )
+    shifts = encode_skill_masks([list(rng.choice(names, size=2, replace=False)) for _ in range(60)], vocabulary)
+    cert_ok = rng.random(5000) > 0.05
+    slot_taken = np.ones(60, dtype=bool)
+    holds = np.zeros((5000, 60), dtype=bool)
+    holds[rng.integers(0, 5000, size=60), np.arange(60)] = True
+
+    started = time.perf_counter()
+    eligible = compute_eligibility(employees, cert_ok, shifts, slot_taken, holds)
+    elapsed = time.perf_counter() - started
+
+    assert eligible.shape == (5000, 60)
+    assert elapsed < 1.0
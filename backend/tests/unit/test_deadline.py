@@ -0,0 +1,80 @@
+"""Unit tests: request deadline propagation, per-attempt timeouts and jittered backoff."""
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend import deadline
+from backend.config import get_settings
+from backend.deadline import attempt_timeout, backoff, deadline_scope, remaining
+from backend.errors import AppError
+from backend.llm.ollama_provider import OllamaProvider
+from backend.schemas import ErrorCode
+
+
+@pytest.mark.unit
+def test_scopes_nest_to_the_earliest_deadline():
+    assert remaining() is None
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert 9 < remaining() <= 10
+        with deadline_scope(1):
+            assert remaining() <= 1
+        assert 9 < remaining() <= 10
+    assert remaining() is None
+
+
+@pytest.mark.unit
+def test_attempt_timeout_is_shortened_to_the_budget_then_refused():
+    assert attempt_timeout(60) == 60
+    with deadline_scope(5):
+        assert 4 < attempt_timeout(60) <= 5
+        assert attempt_timeout(2) == 2
+    with deadline_scope(deadline.MIN_ATTEMPT_SECONDS / 2), pytest.raises(AppError) as exc:
+        attempt_timeout(60)
+    assert exc.value.error_code == ErrorCode.llm_timeout
+    assert exc.value.status_code == 504
+
+
+@pytest.mark.unit
+async def test_backoff_is_decorrelated_jitter_within_base_and_cap(monkeypatch):
+    sleeps: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(deadline.asyncio, "sleep", fake_sleep)
+    settings = get_settings()
+    delay = settings.llm_backoff_base_seconds
+    for _ in range(20):
+        previous, delay = delay, await backoff(delay)
+        assert settings.llm_backoff_base_seconds <= delay <= min(settings.llm_backoff_cap_seconds, previous * 3)
+    assert sleeps and max(sleeps) <= settings.llm_backoff_cap_seconds
+
+    with deadline_scope(deadline.MIN_ATTEMPT_SECONDS + settings.llm_backoff_base_seconds / 2), pytest.raises(AppError):
+        await backoff(settings.llm_backoff_cap_seconds)
+
+
+@pytest.mark.unit
+async def test_provider_retries_stay_within_the_request_deadline():
+    app = FastAPI()
+    attempts: list[float] = []
+
+    @app.post("/api/generate")
+    async def generate() -> dict:
+        attempts.append(time.monotonic())
+        await asyncio.sleep(30)
+        return {"response": "{}"}
+
+    provider = OllamaProvider()
+    provider.max_retries = 5
+    provider._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), timeout=60)
+
+    started = time.monotonic()
+    with deadline_scope(1.5), pytest.raises(AppError) as exc:
+        await provider.parse("cover my shift tomorrow")
+    assert time.monotonic() - started < 2.0
+    assert exc.value.error_code == ErrorCode.llm_timeout
+    assert 1 <= len(attempts) <= 3
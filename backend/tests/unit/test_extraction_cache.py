@@ -0,0 +1,36 @@
+"""Unit tests: extraction cache keys (normalization, date and requester scoping)."""
+from datetime import date
+
+import pytest
+
+from backend.services.extraction_cache import cache_key, normalize_text
+
+TODAY = date(2026, 3, 2)
+CONTEXT = "The requester is John Doe. Interpret 'my shift', 'I', and 'me' as this person."
+
+
+@pytest.mark.unit
+def test_normalize_ignores_case_whitespace_and_trailing_punctuation():
+    assert normalize_text("  Cover my   shift\ttomorrow! ") == "cover my shift tomorrow"
+    assert normalize_text("Cover my shift tomorrow.") == normalize_text("cover MY shift tomorrow")
+
+
+@pytest.mark.unit
+def test_key_is_stable_for_equivalent_text():
+    assert cache_key("Cover my shift tomorrow", CONTEXT, TODAY, "v1") == cache_key(
+        "cover my  shift tomorrow.", CONTEXT, TODAY, "v1"
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "other",
+    [
+        ("cover my shift on friday", CONTEXT, TODAY, "v1"),
+        ("cover my shift tomorrow", "The requester is Alex Kim.", TODAY, "v1"),
+        ("cover my shift tomorrow", CONTEXT, date(2026, 3, 3), "v1"),
+        ("cover my shift tomorrow", CONTEXT, TODAY, "v2"),
+    ],
+)
+def test_key_changes_with_text_requester_reference_date_and_version(other):
+    assert cache_key("cover my shift tomorrow", CONTEXT, TODAY, "v1") != cache_key(*other)
@@ -0,0 +1,140 @@
+"""Unit tests: failover chain, circuit breakers and hedging against local stub Ollama servers."""
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from backend.config import get_settings
+from backend.errors import AppError
+from backend.llm import factory
+from backend.llm.failover import BreakerState, CircuitBreaker, FailoverProvider
+from backend.llm.ollama_provider import OllamaProvider
+from backend.schemas import ErrorCode
+
+
+def _stub_ollama(first_name: str, delay: float = 0.0, status_code: int = 200) -> tuple[FastAPI, list[int]]:
+    """A minimal Ollama /api/generate that answers with one extraction; hits counts the calls."""
+    app = FastAPI()
+    hits: list[int] = []
+
+    @app.post("/api/generate")
+    async def generate() -> JSONResponse:
+        hits.append(1)
+        await asyncio.sleep(delay)
+        if status_code != 200:
+            return JSONResponse({"error": "overloaded"}, status_code=status_code)
+        return JSONResponse({"response": json.dumps({"employee_first_name": first_name}), "done": True})
+
+    return app, hits
+
+
+def _member(app: FastAPI, timeout: float = 0.2) -> OllamaProvider:
+    provider = OllamaProvider()
+    provider.timeout = timeout
+    provider.max_retries = 0
+    provider._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), timeout=5)
+    return provider
+
+
+def _chain(*members: OllamaProvider, min_calls: int = 2) -> FailoverProvider:
+    chain = FailoverProvider(list(members))
+    chain.hedge_min_delay = 0.05
+    for breaker in chain.breakers:
+        breaker.min_calls = min_calls
+    return chain
+
+
+@pytest.mark.unit
+async def test_hedge_to_the_next_member_wins_when_the_primary_is_slow():
+    slow_app, slow_hits = _stub_ollama("Slow", delay=2.0)
+    fast_app, _ = _stub_ollama("Fast")
+    chain = _chain(_member(slow_app), _member(fast_app))
+
+    parsed = await chain.parse("cover my shift")
+
+    assert parsed.employee_first_name == "Fast"
+    assert slow_hits == [1]
+    stats = chain.chain_stats()
+    assert stats["hedges_fired"] == 1 and stats["hedge_wins"] == 1
+    assert [m["wins"] for m in stats["members"]] == [0, 1]
+
+
+@pytest.mark.unit
+async def test_no_hedge_when_the_primary_answers_first():
+    fast_app, _ = _stub_ollama("Primary")
+    backup_app, backup_hits = _stub_ollama("Backup")
+    chain = _chain(_member(fast_app), _member(backup_app))
+
+    assert (await chain.parse("cover my shift")).employee_first_name == "Primary"
+    assert backup_hits == []
+    assert chain.chain_stats()["hedges_fired"] == 0
+
+
+@pytest.mark.unit
+async def test_failing_member_fails_over_then_its_breaker_opens():
+    down_app, down_hits = _stub_ollama("Down", status_code=500)
+    up_app, _ = _stub_ollama("Up")
+    chain = _chain(_member(down_app), _member(up_app))
+
+    for _ in range(2):
+        assert (await chain.parse("cover my shift")).employee_first_name == "Up"
+    assert chain.breakers[0].state is BreakerState.open
+
+    assert (await chain.parse("cover my shift")).employee_first_name == "Up"
+    assert len(down_hits) == 2  # skipped while open
+    assert chain.chain_stats()["members"][0]["breaker_state"] == "open"
+
+
+@pytest.mark.unit
+async def test_every_circuit_open_fails_fast_with_503():
+    app, _ = _stub_ollama("Unused")
+    chain = _chain(_member(app), _member(app))
+    for breaker in chain.breakers:
+        breaker._open()
+
+    with pytest.raises(AppError) as exc:
+        await chain.parse("cover my shift")
+    assert exc.value.status_code == 503
+    assert exc.value.error_code == ErrorCode.llm_provider_error
+
+
+@pytest.mark.unit
+def test_breaker_counts_slow_calls_and_recovers_through_one_half_open_trial():
+    breaker = CircuitBreaker()
+    breaker.min_calls = 2
+    breaker.slow_call_seconds = 1.0
+    breaker.open_seconds = 0.0
+    breaker.record(True, 5.0)
+    breaker.record(True, 5.0)
+    assert breaker.state is BreakerState.open
+
+    assert breaker.allow() is True
+    assert breaker.state is BreakerState.half_open
+    assert breaker.allow() is False  # one trial at a time
+    breaker.record(True, 0.1)
+    assert breaker.state is BreakerState.closed
+    assert breaker.allow() is True
+
+
+@pytest.mark.unit
+def test_factory_honours_a_single_entry_chain_and_names_the_bad_setting(monkeypatch):
+    settings = get_settings().model_copy(update={"llm_failover_chain": "local", "llm_provider": "hosted"})
+    monkeypatch.setattr(factory, "get_settings", lambda: settings)
+    factory.get_llm_provider.cache_clear()
+    try:
+        assert isinstance(factory.get_llm_provider(), OllamaProvider)
+        factory.get_llm_provider.cache_clear()
+
+        settings.llm_failover_chain = "local,remote"
+        with pytest.raises(AppError, match="in LLM_FAILOVER_CHAIN"):
+            factory.get_llm_provider()
+
+        settings.llm_failover_chain = ""
+        settings.llm_provider = "remote"
+        with pytest.raises(AppError, match="in LLM_PROVIDER"):
+            factory.get_llm_provider()
+    finally:
+        factory.get_llm_provider.cache_clear()
@@ -0,0 +1,81 @@
+"""Unit tests: submission dedupe on the Redis job queue."""
+import uuid
+
+import pytest
+
+from backend.models import Employee
+from backend.schemas import JobStatusEnum, PreviewRequestIn
+from backend.services.job_queue import JOB_KEY, JobQueue
+
+
+class _Pipeline:
+    def __init__(self, redis: "_MemoryRedis") -> None:
+        self.redis = redis
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    def hset(self, key, mapping):
+        self.redis.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    def expire(self, key, seconds):
+        pass
+
+    def xadd(self, stream, fields):
+        self.redis.stream.append(fields)
+
+    async def execute(self) -> None:
+        return None
+
+
+class _MemoryRedis:
+    """Just the commands enqueue uses, applied immediately."""
+
+    def __init__(self) -> None:
+        self.strings: dict[str, str] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.stream: list[dict] = []
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def pipeline(self, transaction=True) -> _Pipeline:
+        return _Pipeline(self)
+
+
+def _employee() -> Employee:
+    return Employee(id=uuid.uuid4(), first_name="Alex", last_name="Doe", skills={}, certifications={}, availability={})
+
+
+@pytest.mark.unit
+async def test_retry_returns_the_live_job_but_a_failed_one_can_be_resubmitted():
+    redis = _MemoryRedis()
+    queue = JobQueue(redis=redis)
+    alex = _employee()
+    payload = PreviewRequestIn(text="cover my shift tomorrow")
+
+    first = await queue.enqueue(payload, alex, "c1")
+    retry = await queue.enqueue(PreviewRequestIn(text="Cover my shift  tomorrow"), alex, "c2")
+    assert retry.jobId == first.jobId and retry.duplicate
+    assert len(redis.stream) == 1
+
+    redis.hashes[JOB_KEY + first.jobId]["status"] = JobStatusEnum.failed.value
+    resubmitted = await queue.enqueue(payload, alex, "c3")
+    assert resubmitted.jobId != first.jobId
+    assert resubmitted.status is JobStatusEnum.queued and not resubmitted.duplicate
+    assert [entry["job_id"] for entry in redis.stream] == [first.jobId, resubmitted.jobId]
+
+    again = await queue.enqueue(payload, alex, "c4")
+    assert again.jobId == resubmitted.jobId and again.duplicate
@@ -0,0 +1,127 @@
+"""Unit tests: local repair of near-valid model JSON and the targeted re-ask."""
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from backend.errors import AppError
+from backend.llm import repair
+from backend.llm.repair import (
+    RepairStats,
+    coerce_fields,
+    loads_tolerant,
+    repair_extraction,
+)
+from backend.schemas import ErrorCode
+
+
+@pytest.fixture
+def stats(monkeypatch) -> RepairStats:
+    fresh = RepairStats()
+    monkeypatch.setattr(repair, "repair_stats", fresh)
+    return fresh
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "content",
+    [
+        'Here you go: {"employee_first_name": "Ann", "reason": null,}',
+        "```json\n{'employee_first_name': 'Ann', 'reason': None}\n```",
+        '{"employee_first_name": "Ann"\n"reason": null}',
+        '{“employee_first_name”: “Ann”, “reason”: null}',
+        '{"employee_first_name": "Ann", "reason": null, "target_da',
+    ],
+)
+def test_loads_tolerant_fixes_common_json_defects(content):
+    data, fixed = loads_tolerant(content)
+    assert fixed
+    assert data["employee_first_name"] == "Ann"
+    assert data.get("reason") is None
+
+
+@pytest.mark.unit
+def test_loads_tolerant_keeps_truncated_string_value_and_rejects_non_objects():
+    data, _ = loads_tolerant('{"employee_first_name": "Ann", "reason": "family emerg')
+    assert data["reason"] == "family emerg"
+    assert loads_tolerant('{"employee_first_name": "Ann"}') == ({"employee_first_name": "Ann"}, False)
+    with pytest.raises(json.JSONDecodeError):
+        loads_tolerant("I could not find a request in that text.")
+
+
+@pytest.mark.unit
+def test_coerce_fields_maps_near_miss_values():
+    data, fixes = coerce_fields(
+        {
+            "employee_first_name": "Ann",
+            "current_shift_type": "Night",
+            "target_shift_type": "evening",
+            "requested_action": "Switch",
+            "target_date": "2026-03-04T00:00:00",
+            "partner_shift_date": "2026/3/5",
+            "reason": "N/A",
+        }
+    )
+    assert data["current_shift_type"] == "night" and data["target_shift_type"] == "night"
+    assert data["requested_action"] == "swap"
+    assert data["target_date"] == "2026-03-04" and data["partner_shift_date"] == "2026-03-05"
+    assert data["reason"] is None
+    assert fixes == {"enum_value": 3, "date_value": 2, "null_literal": 1}
+
+
+@pytest.mark.unit
+async def test_local_repair_avoids_a_round_trip(stats):
+    async def complete(prompt: str, max_tokens: int) -> str:
+        raise AssertionError("no re-ask expected")
+
+    parsed = await repair_extraction('{"employee_first_name": "Ann", "target_shift_type": "Nights",}', complete)
+
+    assert parsed.target_shift_type.value == "night"
+    assert stats.stats()["outcomes"]["repaired_locally"] == 1
+    assert stats.stats()["fixes"]["json_syntax"] == 1 and stats.stats()["fixes"]["enum_value"] == 1
+    assert stats.stats()["round_trips_avoided"] == 1
+
+
+@pytest.mark.unit
+async def test_reask_requests_only_invalid_fields(stats):
+    prompts: list[str] = []
+
+    async def complete(prompt: str, max_tokens: int) -> str:
+        prompts.append(prompt)
+        return '{"target_shift_type": "morning", "employee_first_name": "Bob"}'
+
+    original = "Today's date is 2026-03-01.\n\nUser request: swap my brunch shift tomorrow"
+    parsed = await repair_extraction('{"employee_first_name": "Ann", "target_shift_type": "brunch"}', complete, original)
+
+    assert parsed.employee_first_name == "Ann"
+    assert parsed.target_shift_type.value == "morning"
+    assert prompts[0].startswith(original)
+    assert prompts[0].rstrip().endswith("target_shift_type")
+    assert '"brunch"' in prompts[0]
+    assert stats.stats()["outcomes"]["reask_fixed"] == 1
+
+
+@pytest.mark.unit
+async def test_invalid_requester_is_cleared_not_reasked(stats):
+    async def complete(prompt: str, max_tokens: int) -> str:
+        assert "employee_first_name" not in prompt.rsplit("\n", 1)[-1]
+        return '{"target_shift_type": "night", "employee_first_name": "Bob"}'
+
+    parsed = await repair_extraction('{"employee_last_name": "Doe", "target_shift_type": "brunch"}', complete)
+
+    assert parsed.employee_first_name == "" and parsed.employee_last_name is None
+    assert parsed.target_shift_type.value == "night"
+    assert stats.stats()["fixes"]["requester_cleared"] == 1
+
+
+@pytest.mark.unit
+async def test_failed_reask_raises_original_validation_error(stats):
+    async def complete(prompt: str, max_tokens: int) -> str:
+        raise AppError(ErrorCode.llm_timeout, "timed out", "timeout", 504)
+
+    with pytest.raises(ValidationError):
+        await repair_extraction('{"employee_first_name": "Ann", "target_shift_type": "brunch"}', complete)
+    with pytest.raises(json.JSONDecodeError):
+        await repair_extraction("no json here", complete)
+    assert stats.stats()["outcomes"]["reask_failed"] == 1
+    assert stats.stats()["outcomes"]["unrepairable"] == 1
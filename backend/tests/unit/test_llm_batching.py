@@ -0,0 +1,135 @@
+"""Unit tests: batched multi-request extraction (planning, response mapping, per-item retry)."""
+import asyncio
+import json
+from datetime import date
+
+import pytest
+
+from backend.errors import AppError
+from backend.llm.base import LLMProvider
+from backend.llm.batching import (
+    OUTPUT_TOKENS_PER_ITEM,
+    PROMPT_OVERHEAD_TOKENS,
+    build_batch_prompt,
+    plan_batches,
+    split_batch_response,
+)
+from backend.schemas import ErrorCode, HealthStatus, ParsedExtraction
+
+
+class _FakeProvider(LLMProvider):
+    provider_name = "fake"
+    model_name = "fake"
+    extraction_version = "fake-v1"
+    timeout = 1.0
+
+    def __init__(self, batch_reply) -> None:
+        self.batch_reply = batch_reply
+        self.batch_calls: list[str] = []
+        self.single_calls: list[str] = []
+
+    async def _complete_batch(self, prompt: str, max_tokens: int) -> str:
+        self.batch_calls.append(prompt)
+        if isinstance(self.batch_reply, Exception):
+            raise self.batch_reply
+        return self.batch_reply
+
+    async def parse(self, text, requester_context=None, reference_date=None) -> ParsedExtraction:
+        self.single_calls.append(text)
+        if text == "gibberish":
+            raise AppError(ErrorCode.extraction_invalid_schema, "Could not understand.", "bad", 400)
+        return ParsedExtraction(employee_first_name=f"single:{text}")
+
+    async def health_check(self) -> HealthStatus:
+        return HealthStatus(status="ok")
+
+
+@pytest.mark.unit
+def test_plan_batches_respects_item_output_and_context_limits():
+    texts = ["cover my shift tomorrow"] * 7
+    assert plan_batches(texts, 100_000, 100_000, 3) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert plan_batches(texts, 100_000, 2 * OUTPUT_TOKENS_PER_ITEM, 10) == [[0, 1], [2, 3], [4, 5], [6]]
+
+    long_text = "x" * 4000
+    context = PROMPT_OVERHEAD_TOKENS + 2 * (1001 + OUTPUT_TOKENS_PER_ITEM)
+    assert plan_batches([long_text] * 3, context, 100_000, 10) == [[0, 1], [2]]
+    # Larger than the context on its own: still planned, alone.
+    assert plan_batches(["short", "y" * 100_000, "short"], 2000, 100_000, 10) == [[0], [1], [2]]
+
+
+@pytest.mark.unit
+def test_batch_prompt_numbers_each_request():
+    prompt = build_batch_prompt(["move me\nto nights", "cover {friday}"], "The requester is Ann.", date(2026, 3, 2))
+    assert "[0] move me to nights\n[1] cover {friday}" in prompt
+    assert "Today's date is 2026-03-02." in prompt
+    assert "Requester context: The requester is Ann." in prompt
+
+
+@pytest.mark.unit
+def test_split_batch_response_maps_by_index_and_drops_bad_elements():
+    content = "```json\n" + json.dumps(
+        [
+            {"index": 2, "employee_first_name": "C"},
+            {"index": 0, "employee_first_name": "A"},
+            {"index": 0, "employee_first_name": "dup"},
+            {"index": 1, "employee_first_name": None},
+            {"index": 9, "employee_first_name": "out of range"},
+        ]
+    ) + "\n```"
+    results = split_batch_response(content, 4)
+    assert [r.employee_first_name if r else None for r in results] == ["A", None, "C", None]
+
+    with pytest.raises(json.JSONDecodeError):
+        split_batch_response("sorry, I can't", 2)
+
+
+@pytest.mark.unit
+async def test_parse_many_retries_only_failed_items():
+    reply = json.dumps([{"index": 0, "employee_first_name": "A"}, {"index": 2, "employee_first_name": "C"}])
+    provider = _FakeProvider(reply)
+
+    results = await provider.parse_many(["a", "gibberish", "c"], reference_date=date(2026, 3, 2))
+
+    assert len(provider.batch_calls) == 1
+    assert provider.single_calls == ["gibberish"]
+    assert results[0].employee_first_name == "A"
+    assert isinstance(results[1], AppError)
+    assert results[2].employee_first_name == "C"
+
+
+@pytest.mark.unit
+async def test_parse_many_unparseable_batch_falls_back_to_single_parses():
+    provider = _FakeProvider("not json")
+    results = await provider.parse_many(["a", "b"])
+    assert provider.single_calls == ["a", "b"]
+    assert [r.employee_first_name for r in results] == ["single:a", "single:b"]
+
+
+@pytest.mark.unit
+async def test_parse_many_provider_failure_is_reported_per_item_without_retry():
+    outage = AppError(ErrorCode.llm_timeout, "Timed out.", "timeout", 504)
+    provider = _FakeProvider(outage)
+    results = await provider.parse_many(["a", "b"])
+    assert provider.single_calls == []
+    assert results == [outage, outage]
+
+
+@pytest.mark.unit
+async def test_parse_many_retries_one_item_at_a_time():
+    active = peak = 0
+
+    class _SlowProvider(_FakeProvider):
+        async def parse(self, text, requester_context=None, reference_date=None) -> ParsedExtraction:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+            return await super().parse(text, requester_context, reference_date)
+
+    provider = _SlowProvider("not json")
+    results = await provider.parse_many([f"t{i}" for i in range(5)])
+
+    assert peak == 1
+    assert provider.single_calls == [f"t{i}" for i in range(5)]
+    assert all(isinstance(r, ParsedExtraction) for r in results)
@@ -0,0 +1,46 @@
+"""Unit tests: one provider and one pooled HTTP client per process."""
+import httpx
+import pytest
+
+from backend.config import get_settings
+from backend.llm.factory import close_llm_provider, get_llm_provider
+from backend.llm.ollama_provider import OllamaProvider
+
+
+@pytest.mark.unit
+async def test_provider_is_a_process_singleton():
+    try:
+        assert get_llm_provider() is get_llm_provider()
+    finally:
+        await close_llm_provider()
+
+
+@pytest.mark.unit
+async def test_client_is_reused_until_closed():
+    provider = OllamaProvider()
+    client = provider.http_client()
+    assert provider.http_client() is client
+    assert provider.pool_stats()["open"] is True
+
+    await provider.aclose()
+    assert client.is_closed
+    assert provider.pool_stats()["open"] is False
+    reopened = provider.http_client()
+    assert reopened is not client
+    await provider.aclose()
+
+
+@pytest.mark.unit
+async def test_pool_stats_count_requests_and_connections():
+    provider = OllamaProvider()
+    client = provider.http_client()
+    # Swap the network transport for an in-memory one; event hooks still fire.
+    client._transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"models": []}))
+    await client.get(f"{provider.base_url}/api/tags")
+    await client.get(f"{provider.base_url}/api/tags")
+
+    stats = provider.pool_stats()
+    assert stats["requests_sent"] == 2
+    assert stats["max_connections"] == get_settings().llm_http_max_connections
+    assert "connections" not in stats  # no httpcore pool behind a mock transport
+    await provider.aclose()
@@ -0,0 +1,92 @@
+"""Unit tests: MinHash/LSH near-duplicate reuse of extractions."""
+from datetime import date, timedelta
+
+import pytest
+
+from backend.schemas import ParsedExtraction, RequestedActionEnum, ShiftTypeEnum
+from backend.services.near_duplicate import NearDuplicateIndex
+
+TODAY = date(2026, 3, 2)
+CONTEXT = "The requester is John Doe."
+
+
+def _cover_tomorrow(today: date = TODAY) -> ParsedExtraction:
+    return ParsedExtraction(
+        employee_first_name="John",
+        employee_last_name="Doe",
+        target_date=today + timedelta(days=1),
+        target_shift_type=ShiftTypeEnum.night,
+        requested_action=RequestedActionEnum.cover,
+    )
+
+
+def _index() -> NearDuplicateIndex:
+    index = NearDuplicateIndex(threshold=0.8, max_entries=100)
+    index.add("can someone cover my night shift tomorrow", CONTEXT, "v1", TODAY, _cover_tomorrow())
+    return index
+
+
+@pytest.mark.unit
+def test_filler_and_abbreviation_variants_reuse_the_extraction():
+    index = _index()
+    parsed = index.lookup("Can someone cover my night shift tmrw pls", CONTEXT, "v1", TODAY)
+    assert parsed == _cover_tomorrow()
+    assert (index.lookups, index.hits, index.bypass_rate) == (1, 1, 1.0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "text",
+    ["could anyone take my night shift tomorrow", "tomorrow can someone cover my night shift"],
+)
+def test_paraphrases_and_reordering_reuse_the_extraction(text):
+    assert _index().lookup(text, CONTEXT, "v1", TODAY) == _cover_tomorrow()
+
+
+@pytest.mark.unit
+def test_names_may_be_reordered_but_must_agree():
+    index = NearDuplicateIndex(threshold=0.8, max_entries=100)
+    index.add("swap my friday night with ann and bob", CONTEXT, "v1", TODAY, _cover_tomorrow())
+    assert index.lookup("switch my friday night with bob and ann", CONTEXT, "v1", TODAY) is not None
+    assert index.lookup("swap my friday night with ann and rob", CONTEXT, "v1", TODAY) is None
+
+
+@pytest.mark.unit
+def test_relative_dates_are_reanchored_to_the_new_reference_date():
+    later = TODAY + timedelta(days=3)
+    parsed = _index().lookup("someone cover my night shift tomorrow please", CONTEXT, "v1", later)
+    assert parsed is not None
+    assert parsed.target_date == later + timedelta(days=1)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "text,context,version",
+    [
+        ("can someone cover my morning shift tomorrow", CONTEXT, "v1"),
+        ("can alex cover my night shift tomorrow", CONTEXT, "v1"),
+        ("can someone cover my night shift tomorrow", "The requester is Alex Kim.", "v1"),
+        ("can someone cover my night shift tomorrow", CONTEXT, "v2"),
+    ],
+)
+def test_meaningful_differences_and_other_scopes_miss(text, context, version):
+    index = _index()
+    assert index.lookup(text, context, version, TODAY) is None
+    assert index.hits == 0
+
+
+@pytest.mark.unit
+def test_absolute_dates_are_not_reused_on_another_day():
+    index = NearDuplicateIndex(threshold=0.8, max_entries=100)
+    index.add("cover my night shift on friday", CONTEXT, "v1", TODAY, _cover_tomorrow())
+    assert index.lookup("cover my night shift on friday pls", CONTEXT, "v1", TODAY) is not None
+    assert index.lookup("cover my night shift on friday pls", CONTEXT, "v1", TODAY + timedelta(days=1)) is None
+
+
+@pytest.mark.unit
+def test_index_is_bounded_fifo():
+    index = NearDuplicateIndex(threshold=0.8, max_entries=2)
+    for text in ("cover my night shift tomorrow", "swap my morning shift with alex", "move me to nights"):
+        index.add(text, CONTEXT, "v1", TODAY, _cover_tomorrow())
+    assert index.lookup("cover my night shift tomorrow", CONTEXT, "v1", TODAY) is None
+    assert index.lookup("move me to nights", CONTEXT, "v1", TODAY) is not None
@@ -0,0 +1,59 @@
+"""Unit tests: Ollama parses are schema-constrained and capped."""
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from backend.llm import ollama_provider
+from backend.llm.ollama_provider import OllamaProvider
+
+
+def _stub_ollama(seen: list[dict], response: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/generate")
+    async def generate(request: Request) -> dict:
+        seen.append(await request.json())
+        return {"response": response, "done": True, "eval_count": 42}
+
+    return app
+
+
+def _provider(app: FastAPI, structured: bool) -> OllamaProvider:
+    provider = OllamaProvider()
+    provider.structured_output = structured
+    provider._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), timeout=5)
+    return provider
+
+
+@pytest.mark.unit
+async def test_structured_mode_sends_extraction_schema_and_limits():
+    seen: list[dict] = []
+    provider = _provider(_stub_ollama(seen, json.dumps({"employee_first_name": "Ann", "target_shift_type": "night"})), True)
+
+    parsed = await provider.parse("move me to nights")
+
+    assert parsed.target_shift_type.value == "night"
+    assert seen[0]["format"] == ollama_provider.EXTRACTION_SCHEMA
+    assert set(ollama_provider.EXTRACTION_SCHEMA["properties"]) == set(type(parsed).model_fields)
+    assert seen[0]["options"] == {"num_predict": provider.num_predict, "stop": ollama_provider.STOP_SEQUENCES}
+
+
+@pytest.mark.unit
+async def test_free_form_mode_omits_format_and_still_cleans_fenced_json():
+    seen: list[dict] = []
+    fenced = '```json\n{"employee_first_name": "Ann", "requested_action": "cover"}\n```'
+    provider = _provider(_stub_ollama(seen, fenced), False)
+
+    parsed = await provider.parse("cover my shift tomorrow")
+
+    assert "format" not in seen[0]
+    assert parsed.requested_action.value == "cover"
+
+
+@pytest.mark.unit
+def test_extraction_version_tracks_the_prompt_version():
+    provider = OllamaProvider()
+    assert provider.extraction_version == f"ollama-{provider.model_name}-v{ollama_provider.PROMPT_VERSION}"
+    assert ollama_provider.PROMPT_VERSION >= 2
@@ -0,0 +1,54 @@
+"""Unit tests: partial-field extraction from a streaming LLM response and the preview event stream."""
+import json
+
+import httpx
+import pytest
+
+from backend.llm.streaming import PartialFieldTracker
+from backend.services import scheduler_service
+
+
+@pytest.mark.unit
+def test_fields_are_reported_once_when_their_value_is_complete():
+    tracker = PartialFieldTracker()
+    chunks = [
+        '{"employee_first_name": "Jo',
+        'hn", "employee_last_name": null, "target_da',
+        'te": "2026-03-03"',
+        ', "requested_action": "cover"}',
+    ]
+    seen = [tracker.feed(chunk) for chunk in chunks]
+    assert seen[0] == {}
+    assert seen[1] == {"employee_first_name": "John"}
+    assert seen[2] == {}
+    assert seen[3] == {"target_date": "2026-03-03", "requested_action": "cover"}
+
+
+@pytest.mark.unit
+def test_escaped_quotes_and_unknown_keys():
+    tracker = PartialFieldTracker()
+    new = tracker.feed('{"reason": "said \\"urgent\\"", "confidence": "high", "target_shift_type": "night"}')
+    assert new == {"reason": 'said "urgent"', "target_shift_type": "night"}
+
+
+@pytest.mark.unit
+async def test_preview_stream_reports_unexpected_errors(monkeypatch):
+    class _Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def broken(*args, **kwargs):
+        raise httpx.ConnectError("connection refused")
+
+    monkeypatch.setattr(scheduler_service, "SessionLocal", _Session)
+    service = scheduler_service.SchedulerService.__new__(scheduler_service.SchedulerService)
+    monkeypatch.setattr(service, "preview_unified", broken)
+
+    frames = [frame async for frame in service.preview_stream(None, None, "cid")]
+
+    assert [frame.split("\n", 1)[0] for frame in frames] == ["event: queued", "event: error"]
+    error = json.loads(frames[1].split("data: ", 1)[1])
+    assert error["correlationId"] == "cid" and "ConnectError" in error["developerMessage"]
@@ -0,0 +1,114 @@
+"""Unit tests: static prompt prefix is sent separately and per-call usage is recorded."""
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+from backend.config import get_settings
+from backend.llm import hosted_provider, ollama_provider
+from backend.llm.hosted_provider import HostedProvider
+from backend.llm.ollama_provider import OllamaProvider
+
+
+def _ollama_with(app: FastAPI) -> OllamaProvider:
+    provider = OllamaProvider()
+    provider._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), timeout=5)
+    return provider
+
+
+@pytest.mark.unit
+async def test_ollama_sends_static_system_prefix_and_records_usage():
+    app = FastAPI()
+    seen: list[dict] = []
+
+    @app.post("/api/generate")
+    async def generate(request: Request) -> dict:
+        seen.append(await request.json())
+        return {
+            "response": json.dumps({"employee_first_name": "Ann"}),
+            "done": True,
+            "prompt_eval_count": 40,
+            "eval_count": 60,
+            "load_duration": 100_000_000,
+            "prompt_eval_duration": 50_000_000,
+        }
+
+    provider = _ollama_with(app)
+    await provider.parse("cover my shift tomorrow", requester_context="The requester is Ann Lee.")
+    await provider.parse("move me to nights", requester_context="The requester is Bo Chen.")
+
+    assert [body["system"] for body in seen] == [ollama_provider.SYSTEM_PROMPT] * 2
+    assert all(body["keep_alive"] == provider.keep_alive for body in seen)
+    assert "Use this exact schema" not in seen[0]["prompt"]
+    assert "cover my shift tomorrow" in seen[0]["prompt"]
+    stats = provider.usage_stats()
+    assert stats["calls"] == 2
+    assert stats["prompt_tokens_avg"] == 40 and stats["output_tokens_avg"] == 60
+    assert stats["ttft_ms_avg"] == pytest.approx(150.0)
+
+
+@pytest.mark.unit
+async def test_ollama_streaming_measures_time_to_first_token():
+    app = FastAPI()
+
+    @app.post("/api/generate")
+    async def generate() -> PlainTextResponse:
+        chunks = [
+            {"response": '{"employee_first_name": "Ann",', "done": False},
+            {"response": ' "target_shift_type": "night"}', "done": False},
+            {"response": "", "done": True, "prompt_eval_count": 12, "eval_count": 20},
+        ]
+        return PlainTextResponse("\n".join(json.dumps(c) for c in chunks))
+
+    provider = _ollama_with(app)
+    fields: list[dict] = []
+
+    async def on_fields(new: dict) -> None:
+        fields.append(new)
+
+    parsed = await provider.parse_streaming("move me to nights", on_fields=on_fields)
+
+    assert parsed.target_shift_type.value == "night"
+    stats = provider.usage_stats()
+    assert stats["prompt_tokens_avg"] == 12
+    assert stats["ttft_ms_avg"] is not None
+
+
+@pytest.mark.unit
+def test_hosted_usage_counts_cached_prefix_tokens():
+    anthropic = HostedProvider.__new__(HostedProvider)
+    anthropic.vendor, anthropic.provider_name, anthropic.model_name = "anthropic", "hosted", "m"
+    anthropic._record_usage(
+        {"input_tokens": 30, "cache_read_input_tokens": 300, "cache_creation_input_tokens": 0, "output_tokens": 80},
+        ttft_seconds=0.2,
+    )
+    assert anthropic.usage_stats()["prompt_tokens_avg"] == 330
+    assert anthropic.usage_stats()["cached_prompt_tokens_avg"] == 300
+
+    openai = HostedProvider.__new__(HostedProvider)
+    openai.vendor, openai.provider_name, openai.model_name = "openai", "hosted", "m"
+    openai._record_usage(
+        {"prompt_tokens": 1200, "prompt_tokens_details": {"cached_tokens": 1024}, "completion_tokens": 90},
+        ttft_seconds=None,
+    )
+    assert openai.usage_stats() == {
+        "calls": 1,
+        "prompt_tokens_avg": 1200.0,
+        "cached_prompt_tokens_avg": 1024.0,
+        "output_tokens_avg": 90.0,
+        "ttft_ms_avg": None,
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("vendor", ["anthropic", "openai"])
+def test_hosted_extraction_version_tracks_the_prompt_version(monkeypatch, vendor):
+    settings = get_settings().model_copy(
+        update={"hosted_llm_vendor": vendor, "anthropic_api_key": "key", "openai_api_key": "key"}
+    )
+    monkeypatch.setattr(hosted_provider, "get_settings", lambda: settings)
+    provider = HostedProvider()
+    assert provider.extraction_version == f"{vendor}-{provider.model_name}-v{hosted_provider.PROMPT_VERSION}"
+    assert hosted_provider.PROMPT_VERSION >= 2
@@ -0,0 +1,112 @@
+"""Unit tests: RuleEngine.validate_request against an in-memory RosterSnapshot (no DB round trips)."""
+import uuid
+from datetime import date
+
+import pytest
+
+from backend.models import Employee, Shift, ShiftType
+from backend.schemas import (
+    ErrorCode,
+    RequestedActionEnum,
+    ShiftTypeEnum,
+    ValidatedExtraction,
+)
+from backend.services.roster_snapshot import RosterSnapshot
+from backend.services.rule_engine import RuleEngine
+
+DAY1 = date(2026, 3, 2)
+DAY2 = date(2026, 3, 3)
+
+
+def _employee(first: str, last: str, skills: list[str], expired: bool = False) -> Employee:
+    return Employee(
+        id=uuid.uuid4(),
+        first_name=first,
+        last_name=last,
+        skills={"skills": skills},
+        certifications={"expired": expired},
+        availability={},
+    )
+
+
+def _shift(d: date, t: ShiftType, required: list[str], assignee: Employee | None) -> Shift:
+    return Shift(
+        id=uuid.uuid4(),
+        date=d,
+        type=t,
+        required_skills={"skills": required},
+        assigned_employee_id=assignee.id if assignee else None,
+    )
+
+
+@pytest.fixture
+def roster():
+    john = _employee("John", "Doe", ["basic", "safety"])
+    alex = _employee("Alex", "Johnson", ["basic"])
+    michael = _employee("Michael", "Johnson", ["safety"])
+    shifts = [
+        _shift(DAY1, ShiftType.night, ["basic"], john),
+        _shift(DAY2, ShiftType.morning, ["basic"], alex),
+        _shift(DAY2, ShiftType.night, ["safety"], None),
+    ]
+    return {"john": john, "alex": alex, "michael": michael, "shifts": shifts}
+
+
+@pytest.mark.unit
+def test_snapshot_resolves_names_case_insensitively(roster):
+    snapshot = RosterSnapshot([roster["john"], roster["alex"], roster["michael"]], roster["shifts"])
+    assert snapshot.resolve_employee("john", "DOE") == [roster["john"]]
+    assert len(snapshot.resolve_employee(None, "johnson")) == 2
+    assert snapshot.resolve_employee(" ", None) == []
+
+
+@pytest.mark.unit
+async def test_validate_move_to_open_shift_passes_without_session(roster):
+    snapshot = RosterSnapshot([roster["michael"]], roster["shifts"])
+    extraction = ValidatedExtraction(
+        employee_first_name="Michael",
+        employee_last_name="Johnson",
+        target_date=DAY2,
+        target_shift_type=ShiftTypeEnum.night,
+        requested_action=RequestedActionEnum.move,
+    )
+    result = await RuleEngine().validate_request(None, extraction, snapshot=snapshot)
+    assert result.valid, result.errorCodes
+    assert result.validationDetails["employee_id"] == str(roster["michael"].id)
+
+
+@pytest.mark.unit
+async def test_validate_swap_flags_skill_mismatch_from_snapshot(roster):
+    snapshot = RosterSnapshot([roster["john"], roster["michael"]], roster["shifts"])
+    extraction = ValidatedExtraction(
+        employee_first_name="John",
+        employee_last_name="Doe",
+        current_shift_date=DAY1,
+        current_shift_type=ShiftTypeEnum.night,
+        target_date=DAY2,
+        target_shift_type=ShiftTypeEnum.night,
+        requested_action=RequestedActionEnum.swap,
+        partner_employee_first_name="Michael",
+        partner_employee_last_name="Johnson",
+    )
+    result = await RuleEngine().validate_request(None, extraction, snapshot=snapshot)
+    # Michael lacks "basic" for John's night shift on DAY1.
+    assert ErrorCode.rule_skill_mismatch in result.errorCodes
+    assert result.validationDetails["partner_employee_id"] == str(roster["michael"].id)
+
+
+@pytest.mark.unit
+async def test_conflict_suggestions_are_memoized_per_slot(roster):
+    snapshot = RosterSnapshot([roster["michael"]], roster["shifts"])
+    cached = [{"employee_first_name": "Cached", "employee_last_name": "Person", "reason": "memo"}]
+    snapshot.suggestions[(DAY2, ShiftType.morning)] = cached
+    extraction = ValidatedExtraction(
+        employee_first_name="Michael",
+        employee_last_name="Johnson",
+        target_date=DAY2,
+        target_shift_type=ShiftTypeEnum.morning,
+        requested_action=RequestedActionEnum.move,
+    )
+    result = await RuleEngine().validate_request(None, extraction, snapshot=snapshot)
+    assert ErrorCode.rule_conflict in result.errorCodes
+    assert result.suggestions == cached
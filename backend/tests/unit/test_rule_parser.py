@@ -0,0 +1,65 @@
+"""Unit tests: deterministic fast-path parser for common request templates."""
+from datetime import date, timedelta
+
+import pytest
+
+from backend.schemas import RequestedActionEnum, ShiftTypeEnum
+from backend.services.rule_parser import parse_deterministic, resolve_date
+
+MONDAY = date(2026, 3, 2)
+
+
+def _parse(text: str):
+    return parse_deterministic(text, "John", "Doe", MONDAY)
+
+
+@pytest.mark.unit
+def test_resolves_relative_dates_against_reference_date():
+    assert resolve_date("tomorrow", MONDAY) == MONDAY + timedelta(days=1)
+    assert resolve_date("on Friday", MONDAY) == date(2026, 3, 6)
+    assert resolve_date("2026-03-10", MONDAY) == date(2026, 3, 10)
+    # "Monday" said on a Monday could mean today or next week: not confident.
+    assert resolve_date("monday", MONDAY) is None
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("text", ["cover my shift tomorrow", "Can someone cover my night shift tomorrow?"])
+def test_cover_template(text):
+    parsed = _parse(text)
+    assert parsed is not None
+    assert parsed.requested_action == RequestedActionEnum.cover
+    assert parsed.employee_first_name == "John" and parsed.employee_last_name == "Doe"
+    assert parsed.target_date == parsed.current_shift_date == MONDAY + timedelta(days=1)
+
+
+@pytest.mark.unit
+def test_move_template():
+    parsed = _parse("Move me to night on Friday")
+    assert parsed is not None
+    assert parsed.requested_action == RequestedActionEnum.move
+    assert (parsed.target_date, parsed.target_shift_type) == (date(2026, 3, 6), ShiftTypeEnum.night)
+
+
+@pytest.mark.unit
+def test_swap_template_follows_provider_contract():
+    parsed = _parse("swap my tomorrow morning shift with Alex Kim's friday night shift")
+    assert parsed is not None
+    assert parsed.requested_action == RequestedActionEnum.swap
+    assert (parsed.current_shift_date, parsed.current_shift_type) == (date(2026, 3, 3), ShiftTypeEnum.morning)
+    assert (parsed.partner_employee_first_name, parsed.partner_employee_last_name) == ("Alex", "Kim")
+    assert parsed.partner_shift_date == parsed.target_date == date(2026, 3, 6)
+    assert parsed.partner_shift_type == parsed.target_shift_type == ShiftTypeEnum.night
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "text",
+    [
+        "cover my shift on monday",
+        "cover my shift tomorrow because I have a doctor appointment",
+        "swap my tomorrow morning with my friday night",
+        "I'd like to move to nights sometime next week",
+    ],
+)
+def test_unconfident_text_falls_back(text):
+    assert _parse(text) is None
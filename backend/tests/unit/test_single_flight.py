@@ -0,0 +1,130 @@
+"""Unit tests: single-flight coalescing of identical parses."""
+import asyncio
+import json
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from backend.deadline import deadline_scope
+from backend.errors import AppError
+from backend.schemas import ErrorCode, ParsedExtraction
+from backend.services.single_flight import SingleFlight, _decode_error, _encode_error
+
+
+class _RedisDown:
+    """Every call fails, so SingleFlight runs in its per-process mode."""
+
+    def __getattr__(self, name):
+        async def fail(*args, **kwargs):
+            raise RedisConnectionError("redis unavailable")
+
+        return fail
+
+
+def _flight() -> SingleFlight:
+    return SingleFlight(redis=_RedisDown(), wait_seconds=5)
+
+
+@pytest.mark.unit
+async def test_concurrent_callers_share_one_call():
+    flight = _flight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def parse() -> ParsedExtraction:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return ParsedExtraction(employee_first_name="John")
+
+    tasks = [asyncio.create_task(flight.do("k", parse)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+    assert calls == 1
+    assert sorted(led for _, led in results) == [False, False, False, False, True]
+    assert flight.coalesced == 4
+    # Each caller gets its own copy to mutate.
+    assert len({id(parsed) for parsed, _ in results}) == 5
+
+
+@pytest.mark.unit
+async def test_errors_reach_every_waiter_and_key_is_freed():
+    flight = _flight()
+
+    async def fail() -> ParsedExtraction:
+        await asyncio.sleep(0.01)
+        raise AppError(ErrorCode.llm_timeout, "timed out", "timeout", 504)
+
+    results = await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, AppError) and r.error_code == ErrorCode.llm_timeout for r in results)
+
+    async def ok() -> ParsedExtraction:
+        return ParsedExtraction(employee_first_name="Alex")
+
+    parsed, led = await flight.do("k", ok)
+    assert led and parsed.employee_first_name == "Alex"
+
+
+@pytest.mark.unit
+async def test_waiter_takes_over_when_leader_is_cancelled():
+    flight = _flight()
+    started = asyncio.Event()
+
+    async def slow() -> ParsedExtraction:
+        started.set()
+        await asyncio.sleep(10)
+        return ParsedExtraction(employee_first_name="Never")
+
+    async def fast() -> ParsedExtraction:
+        return ParsedExtraction(employee_first_name="John")
+
+    leader = asyncio.create_task(flight.do("k", slow))
+    await started.wait()
+    waiter = asyncio.create_task(flight.do("k", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+    parsed, led = await waiter
+    assert led and parsed.employee_first_name == "John"
+
+
+class _LockHeldElsewhere:
+    """Another replica holds the lock and never publishes a result."""
+
+    def __init__(self) -> None:
+        self.lock_px: int | None = None
+
+    async def set(self, key, value, nx=False, px=None, ex=None):
+        self.lock_px = px
+        return False
+
+    async def get(self, key):
+        return None
+
+    async def exists(self, key):
+        return 1
+
+
+@pytest.mark.unit
+async def test_waiter_gives_up_at_the_request_deadline():
+    redis = _LockHeldElsewhere()
+    flight = SingleFlight(redis=redis, wait_seconds=200)
+    calls = 0
+
+    async def parse() -> ParsedExtraction:
+        nonlocal calls
+        calls += 1
+        return ParsedExtraction(employee_first_name="John")
+
+    with deadline_scope(0.6), pytest.raises(AppError) as caught:
+        await flight.do("k", parse)
+    assert caught.value.error_code == ErrorCode.llm_timeout
+    assert calls == 0
+    assert redis.lock_px <= 600
+
+
+@pytest.mark.unit
+def test_shared_errors_keep_their_headers():
+    exc = AppError(ErrorCode.llm_overloaded, "busy", "shed", 429, headers={"Retry-After": "7"})
+    restored = _decode_error(json.loads(json.dumps(_encode_error(exc))))
+    assert restored.status_code == 429 and restored.headers == {"Retry-After": "7"}
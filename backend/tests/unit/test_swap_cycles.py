@@ -0,0 +1,160 @@
+"""Unit tests: incremental multi-way swap cycle detection over open swap requests."""
+import uuid
+from datetime import UTC, date, datetime
+
+import pytest
+
+from backend.models import Employee, RequestStatus, ScheduleRequest
+from backend.schemas import (
+    RequestedActionEnum,
+    RuleEngineResult,
+    ShiftTypeEnum,
+    StructuredRequestIn,
+)
+from backend.services import scheduler_service
+from backend.services.swap_cycle_service import (
+    SwapCycleSolver,
+    SwapNode,
+    canonical_cycle,
+    cycle_id,
+)
+
+
+def _node(employee: uuid.UUID, offers: uuid.UUID, wants: uuid.UUID) -> SwapNode:
+    return SwapNode(uuid.uuid4(), employee, offers, wants, datetime.now(UTC))
+
+
+@pytest.mark.unit
+def test_three_way_cycle_found_when_last_request_arrives():
+    a, b, c = (uuid.uuid4() for _ in range(3))
+    shift_a, shift_b, shift_c = (uuid.uuid4() for _ in range(3))
+    solver = SwapCycleSolver(max_length=4)
+    # A wants B's shift, B wants C's, C wants A's: no pair agrees, the rotation does.
+    r1 = _node(a, shift_a, shift_b)
+    r2 = _node(b, shift_b, shift_c)
+    assert solver.add(r1) == []
+    assert solver.add(r2) == []
+
+    r3 = _node(c, shift_c, shift_a)
+    found = solver.add(r3)
+
+    assert found == [list(canonical_cycle([r3.request_id, r1.request_id, r2.request_id]))]
+    assert len(solver.cycles) == 1
+
+
+@pytest.mark.unit
+def test_cycles_longer_than_cap_or_reusing_an_employee_are_skipped():
+    employees = [uuid.uuid4() for _ in range(5)]
+    shifts = [uuid.uuid4() for _ in range(5)]
+    solver = SwapCycleSolver(max_length=4)
+    for i in range(4):
+        solver.add(_node(employees[i], shifts[i], shifts[i + 1]))
+    assert solver.add(_node(employees[4], shifts[4], shifts[0])) == []  # 5-way exceeds the cap
+
+    repeat = SwapCycleSolver(max_length=4)
+    repeat.add(_node(employees[0], shifts[0], shifts[1]))
+    repeat.add(_node(employees[1], shifts[1], shifts[2]))
+    # Same employee as the first request closing the loop would hand a shift to themselves.
+    assert repeat.add(_node(employees[0], shifts[2], shifts[0])) == []
+
+
+@pytest.mark.unit
+def test_removing_a_member_drops_its_cycles():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    shift_a, shift_b = uuid.uuid4(), uuid.uuid4()
+    solver = SwapCycleSolver(max_length=4)
+    r1 = _node(a, shift_a, shift_b)
+    solver.add(r1)
+    assert len(solver.add(_node(b, shift_b, shift_a))) == 1  # mirrored two-person swap
+
+    solver.remove(r1.request_id)
+
+    assert solver.cycles == {}
+    assert r1.request_id not in solver.nodes
+
+
+@pytest.mark.unit
+def test_cycle_id_is_the_same_from_every_entry_point():
+    r1, r2, r3 = (uuid.uuid4() for _ in range(3))
+    ids = {cycle_id(canonical_cycle(rotation)) for rotation in ([r1, r2, r3], [r2, r3, r1], [r3, r1, r2])}
+    assert len(ids) == 1
+    assert cycle_id(canonical_cycle([r1, r3, r2])) not in ids
+
+
+class _CallerSession:
+    """The request handler's session: after commit it must not be rolled back or refreshed."""
+
+    def __init__(self) -> None:
+        self.committed = False
+
+    async def scalar(self, stmt):
+        return None
+
+    def add(self, obj) -> None:
+        if isinstance(obj, ScheduleRequest):
+            obj.id = uuid.uuid4()
+
+    async def flush(self) -> None:
+        pass
+
+    async def commit(self) -> None:
+        self.committed = True
+
+    async def rollback(self) -> None:
+        raise AssertionError("caller session rolled back")
+
+    async def refresh(self, *args, **kwargs) -> None:
+        raise AssertionError("caller session refreshed")
+
+
+class _SolverSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.mark.unit
+async def test_failing_cycle_check_does_not_touch_the_committed_request(monkeypatch):
+    service = scheduler_service.SchedulerService()
+    shift_ids = (uuid.uuid4(), uuid.uuid4())
+    seen: list[uuid.UUID] = []
+
+    async def validate(*args, **kwargs) -> RuleEngineResult:
+        return RuleEngineResult(valid=True)
+
+    async def resolve(*args, **kwargs):
+        return RequestStatus.pending_partner, uuid.uuid4(), *shift_ids, None
+
+    async def ensure_version(session) -> None:
+        pass
+
+    async def broken(session, request_id):
+        assert isinstance(session, _SolverSession)
+        seen.append(request_id)
+        raise RuntimeError("solver down")
+
+    monkeypatch.setattr(service.rule_engine, "validate_request", validate)
+    monkeypatch.setattr(service, "_resolve_normalized_ids_and_status", resolve)
+    monkeypatch.setattr(service, "_enforce_requester_matches_current_user", lambda *args: None)
+    monkeypatch.setattr(service.extraction_service, "_ensure_version", ensure_version)
+    monkeypatch.setattr(scheduler_service, "SessionLocal", _SolverSession)
+    monkeypatch.setattr(scheduler_service.swap_cycle_solver, "submitted", broken)
+    session = _CallerSession()
+    payload = StructuredRequestIn(
+        employee_first_name="Alex",
+        current_shift_date=date(2026, 10, 20),
+        current_shift_type=ShiftTypeEnum.morning,
+        requested_action=RequestedActionEnum.swap,
+        partner_employee_first_name="Sam",
+        partner_shift_date=date(2026, 10, 21),
+        partner_shift_type=ShiftTypeEnum.night,
+    )
+
+    alex = Employee(id=uuid.uuid4(), first_name="Alex", last_name="Doe", skills={}, certifications={}, availability={})
+    result = await service.process_structured_request(session, payload, "cid", alex)
+
+    assert session.committed
+    assert result.status == RequestStatus.pending_partner.value
+    assert seen == [result.requestId]
@@ -0,0 +1,44 @@
+"""Unit tests: per-employee workload counter deltas."""
+import uuid
+from datetime import date
+
+import pytest
+
+from backend.models import ShiftType, WorkloadPeriod
+from backend.services.workload import period_starts, workload_deltas
+
+SUNDAY = date(2026, 3, 1)
+
+
+def _by_key(rows: list[dict]) -> dict:
+    return {(r["employee_id"], r["period"], r["period_start"]): (r["total"], r["morning"], r["night"]) for r in rows}
+
+
+@pytest.mark.unit
+def test_period_starts_use_iso_week_and_calendar_month():
+    starts = period_starts(SUNDAY)
+    assert starts[WorkloadPeriod.week] == date(2026, 2, 23)
+    assert starts[WorkloadPeriod.month] == date(2026, 3, 1)
+
+
+@pytest.mark.unit
+def test_swap_moves_one_shift_between_employees_per_period():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    rows = _by_key(
+        workload_deltas([(SUNDAY, ShiftType.night, a, b), (date(2026, 3, 2), ShiftType.morning, b, a)])
+    )
+    assert rows[(a, WorkloadPeriod.week, date(2026, 2, 23))] == (-1, 0, -1)
+    assert rows[(a, WorkloadPeriod.week, date(2026, 3, 2))] == (1, 1, 0)
+    assert rows[(b, WorkloadPeriod.week, date(2026, 2, 23))] == (1, 0, 1)
+    # Both shifts fall in March: totals net out, only the morning/night split changes.
+    assert rows[(a, WorkloadPeriod.month, date(2026, 3, 1))] == (0, 1, -1)
+    assert rows[(b, WorkloadPeriod.month, date(2026, 3, 1))] == (0, -1, 1)
+
+
+@pytest.mark.unit
+def test_no_op_and_cancelling_changes_produce_no_rows():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    assert workload_deltas([(SUNDAY, ShiftType.morning, a, a)]) == []
+    assert workload_deltas([(SUNDAY, ShiftType.morning, a, b), (SUNDAY, ShiftType.morning, b, a)]) == []
+    rows = _by_key(workload_deltas([(SUNDAY, ShiftType.morning, None, a)]))
+    assert set(rows.values()) == {(1, 1, 0)}
@@ -1,5 +1,5 @@
 """Org timezone helpers: all date-only and 'today/tomorrow' logic uses org time (e.g. America/Toronto)."""
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from backend.config import get_settings
@@ -18,3 +18,12 @@ def org_now() -> datetime:
 def org_today() -> date:
     """Current calendar date in org timezone (for 'today' / 'tomorrow' semantics)."""
     return org_now().date()
+
+
+URGENT_WITHIN = timedelta(hours=48)
+
+
+def is_urgent_shift_date(shift_date: date, now: datetime | None = None) -> bool:
+    """A shift is urgent when it starts (org midnight of its date) within the next 48 hours."""
+    shift_start = datetime.combine(shift_date, datetime.min.time(), tzinfo=org_tz())
+    return shift_start <= (now or org_now()) + URGENT_WITHIN
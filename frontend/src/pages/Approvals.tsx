@@ -37,6 +37,17 @@ export default function Approvals() {
               <div style={{ marginBottom: 8 }}>
                 <strong>{summary}</strong>
               </div>
+              {!!item.conflictsWith?.length && (
+                <div style={{ fontSize: 12, color: "#a60", marginBottom: 8 }}>
+                  Conflicts with {item.conflictsWith.length} other pending request
+                  {item.conflictsWith.length === 1 ? "" : "s"}:{" "}
+                  {item.conflictsWith.map((id) => (
+                    <code key={id} style={{ marginRight: 4 }}>
+                      {id.slice(0, 8)}
+                    </code>
+                  ))}
+                </div>
+              )}
               <div style={{ fontSize: 12, color: "#555", marginBottom: 8 }}>
                 <div>
                   <strong>Request ID:</strong> <code>{item.requestId}</code>
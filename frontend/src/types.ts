@@ -52,6 +52,7 @@ export interface PendingApprovalItem {
   partner_shift_type?: string | null;
   result_summary?: string | null;
   urgent?: boolean;
+  conflictsWith?: string[];
 }
 
 export interface MetricsOut {